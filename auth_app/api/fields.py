@@ -0,0 +1,96 @@
+from django.contrib.auth.models import User
+from django.db.models import Exists, OuterRef
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+
+from auth_app.users import user_summaries, user_summary_memo
+
+DOES_NOT_EXIST = 'Invalid pk "{pk_value}" - object does not exist.'
+
+
+def users_by_id(ids, board=None):
+    """Map user ids to users, fetched with one ``IN`` query.
+
+    With ``board`` each user also gets ``is_board_member`` (owner or
+    member), computed in the same query.
+    """
+    users = User.objects.filter(pk__in=ids)
+    if board is not None:
+        memberships = board.members.through.objects.filter(
+            board_id=board.pk, user_id=OuterRef("pk")
+        )
+        users = users.annotate(is_board_member=Exists(memberships))
+    found = {user.pk: user for user in users}
+    if board is not None:
+        for user in found.values():
+            user.is_board_member |= user.pk == board.created_by_id
+    return found
+
+
+class UserIdField(serializers.IntegerField):
+    """Write-only user id, resolved by the serializer with ``users_by_id``.
+
+    Unlike ``PrimaryKeyRelatedField`` it does not query on its own, so a
+    serializer with several user fields looks them all up at once.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("min_value", 1)
+        kwargs.setdefault("write_only", True)
+        super().__init__(**kwargs)
+
+
+class UserIdListField(serializers.ListField):
+    """List of existing user ids, checked with one query for all of them.
+
+    Duplicates are dropped; the validated value is the list of ids.
+    """
+
+    child = serializers.IntegerField(min_value=1)
+    default_error_messages = {"does_not_exist": DOES_NOT_EXIST}
+
+    def to_internal_value(self, data):
+        ids = list(dict.fromkeys(super().to_internal_value(data)))
+        found = set(
+            User.objects.filter(pk__in=ids).values_list("pk", flat=True)
+        )
+        for pk in ids:
+            if pk not in found:
+                self.fail("does_not_exist", pk_value=pk)
+        return ids
+
+
+class UserSummaryField(serializers.Field):
+    """Read-only nested user (``id``, ``email``, ``fullname``).
+
+    ``source`` is the foreign key id (e.g. ``assignee_id``), so the user
+    row is never joined; the representation comes from ``user_summaries``.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return user_summaries([value]).get(value)
+
+
+class UserSummaryListSerializer(serializers.ListSerializer):
+    """Looks up the users of all items' ``UserSummaryField``s at once.
+
+    Set it as ``Meta.list_serializer_class`` of serializers using the
+    field, so a list costs at most one cache and one database round trip
+    for its users instead of one per item.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, BaseManager) else data)
+        fields = [
+            field for field in self.child.fields.values()
+            if isinstance(field, UserSummaryField)
+        ]
+        with user_summary_memo():
+            user_summaries(
+                field.get_attribute(item) for item in items for field in fields
+            )
+            return super().to_representation(items)
@@ -1,6 +1,8 @@
-from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
-from rest_framework import serializers
+from rest_framework import exceptions, serializers
+
+from auth_app.emails import normalize_email, users_by_email
+from auth_app.passwords import LoginCapacityExceeded, verify_credentials
 
 
 class UserDetailsSerializer(serializers.ModelSerializer):
@@ -32,8 +34,9 @@ class RegistrationSerializer(serializers.ModelSerializer):
         }
 
     def validate_email(self, value):
-        """Ensure email is unique."""
-        if User.objects.filter(email=value).exists():
+        """Ensure email is unique, ignoring case."""
+        value = normalize_email(value)
+        if users_by_email(value).exists():
             raise serializers.ValidationError("Email already exists.")
         return value
 
@@ -64,9 +67,12 @@ class LoginSerializer(serializers.Serializer):
 
     def validate(self, attrs):
         """Authenticate user with email and password."""
-        user = authenticate(
-            username=attrs["email"], password=attrs["password"]
-        )
+        try:
+            user = verify_credentials(attrs["email"], attrs["password"])
+        except LoginCapacityExceeded:
+            raise exceptions.Throttled(
+                wait=1, detail="Login is busy, please retry shortly."
+            )
         if not user:
             raise serializers.ValidationError(
                 "Invalid email or password."
@@ -1,10 +1,20 @@
 from django.urls import path
 
-from .views import EmailCheckView, LoginView, RegistrationView
+from .views import (
+    EmailCheckView,
+    EmailSearchView,
+    LoginView,
+    LogoutView,
+    RegistrationView,
+    TokenRefreshView,
+)
 
 
 urlpatterns = [
     path('registration/', RegistrationView.as_view(), name='registration'),
     path('login/', LoginView.as_view(), name='login'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
+    path('logout/', LogoutView.as_view(), name='logout'),
     path('email-check/', EmailCheckView.as_view(), name='email-check'),
+    path('email-search/', EmailSearchView.as_view(), name='email-search'),
 ]
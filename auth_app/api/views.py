@@ -1,10 +1,26 @@
-from django.contrib.auth.models import User
+from django.conf import settings
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt import views as jwt_views
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
+from auth_app.emails import (
+    NOT_FOUND,
+    get_cached_email_check,
+    set_cached_email_check,
+    users_by_email,
+    users_by_email_prefix,
+)
+from auth_app.throttling import (
+    GroupRateThrottle,
+    LoginEmailThrottle,
+    LoginIPThrottle,
+)
+from auth_app.tokens import deny_access_token, issue_tokens
 from .serializers import LoginSerializer, RegistrationSerializer, UserDetailsSerializer
 
 
@@ -12,14 +28,14 @@ class RegistrationView(APIView):
     """POST /api/registration/ - Create a new user account."""
 
     permission_classes = [AllowAny]
+    throttle_group = "auth"
 
     def post(self, request):
         serializer = RegistrationSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        token, _ = Token.objects.get_or_create(user=user)
         return Response({
-            "token": token.key,
+            **issue_tokens(user),
             "fullname": user.first_name,
             "email": user.email,
             "user_id": user.id,
@@ -30,20 +46,61 @@ class LoginView(APIView):
     """POST /api/login/ - Authenticate and receive a token."""
 
     permission_classes = [AllowAny]
+    throttle_classes = [
+        GroupRateThrottle, LoginIPThrottle, LoginEmailThrottle
+    ]
+    throttle_group = "auth"
 
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
-        token, _ = Token.objects.get_or_create(user=user)
         return Response({
-            "token": token.key,
+            **issue_tokens(user),
             "fullname": user.first_name,
             "email": user.email,
             "user_id": user.id,
         }, status=status.HTTP_200_OK)
 
 
+class TokenRefreshView(jwt_views.TokenRefreshView):
+    """POST /api/token/refresh/ - Exchange a refresh token."""
+
+    throttle_group = "auth"
+
+
+class LogoutView(APIView):
+    """POST /api/logout/ - Revoke the credentials used for this request.
+
+    DRF tokens are deleted. For JWTs the access token is denylisted and
+    the refresh token from the body (if given) is blacklisted.
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_group = "auth"
+
+    def post(self, request):
+        if isinstance(request.auth, Token):
+            request.auth.delete()
+        elif isinstance(request.auth, AccessToken):
+            if not isinstance(request.data, dict):
+                return Response(
+                    {"detail": "Expected a JSON object."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            deny_access_token(request.auth)
+            refresh = request.data.get("refresh")
+            if refresh:
+                try:
+                    RefreshToken(refresh).blacklist()
+                except TokenError:
+                    return Response(
+                        {"refresh": "Token is invalid or expired."},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class EmailCheckView(APIView):
     """GET /api/email-check/?email=max@example.com"""
 
@@ -56,11 +113,32 @@ class EmailCheckView(APIView):
                 {"email": "This query parameter is required."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        user = User.objects.filter(email=email).first()
-        if not user:
+        data = get_cached_email_check(email)
+        if data is None:
+            user = users_by_email(email).order_by("pk").first()
+            data = dict(UserDetailsSerializer(user).data) if user else None
+            set_cached_email_check(email, data)
+        if data is None or data == NOT_FOUND:
             return Response(
                 {"detail": "User not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        serializer = UserDetailsSerializer(user)
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class EmailSearchView(APIView):
+    """GET /api/email-search/?q=max - Email prefix search for invites."""
+
+    permission_classes = [IsAuthenticated]
+    min_length = 2
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if len(query) < self.min_length:
+            return Response(
+                {"q": f"At least {self.min_length} characters are required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        users = users_by_email_prefix(query, settings.EMAIL_SEARCH_LIMIT)
+        serializer = UserDetailsSerializer(users, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
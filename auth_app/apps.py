@@ -7,3 +7,4 @@ class AuthAppConfig(AppConfig):
     def ready(self):
         from django.contrib.auth import apps as auth_apps
         auth_apps.AuthConfig.verbose_name = 'Users'
+        from auth_app import signals  # noqa: F401
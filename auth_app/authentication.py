@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from auth_app.tokens import is_access_token_denied
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Authenticate "Bearer" JWTs without loading the user.
+
+    The user is rebuilt from the token claims as an unsaved ``User``
+    instance with its primary key set, so ORM filters and ownership
+    comparisons keep working. Revoked tokens are rejected through the
+    denylist table, one primary key lookup per request.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                "Token contained no recognizable user identification"
+            ) from e
+        if is_access_token_denied(validated_token):
+            raise AuthenticationFailed(
+                "Token has been revoked.", code="token_revoked"
+            )
+        email = validated_token.get("email", "")
+        user = User(
+            id=User._meta.pk.to_python(user_id),
+            username=email,
+            email=email,
+            first_name=validated_token.get("fullname", ""),
+        )
+        user._state.adding = False
+        user._state.db = "default"
+        return user
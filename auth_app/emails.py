@@ -0,0 +1,60 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.functions import Lower
+
+from core.metrics import record_cache
+
+EMAIL_CHECK_KEY = "email-check:{digest}"
+NOT_FOUND = "not-found"
+
+
+def normalize_email(email):
+    return email.strip().lower()
+
+
+def users_by_email(email):
+    """Users whose email matches case-insensitively.
+
+    Filters on ``LOWER(email)`` so the functional index from
+    ``auth_app.0001`` is used instead of scanning ``auth_user``.
+    """
+    return User.objects.alias(email_lower=Lower("email")).filter(
+        email_lower=normalize_email(email)
+    )
+
+
+def users_by_email_prefix(prefix, limit):
+    """First ``limit`` users whose email starts with ``prefix``."""
+    return (
+        User.objects.alias(email_lower=Lower("email"))
+        .filter(email_lower__startswith=normalize_email(prefix))
+        .order_by("email_lower")[:limit]
+    )
+
+
+def _email_check_key(email):
+    digest = hashlib.sha256(normalize_email(email).encode()).hexdigest()
+    return EMAIL_CHECK_KEY.format(digest=digest)
+
+
+def get_cached_email_check(email):
+    """Return the cached user summary, ``NOT_FOUND`` or ``None`` (miss)."""
+    data = cache.get(_email_check_key(email))
+    record_cache("email-check", data is not None)
+    return data
+
+
+def set_cached_email_check(email, data):
+    cache.set(
+        _email_check_key(email),
+        data if data is not None else NOT_FOUND,
+        settings.EMAIL_CHECK_CACHE_TTL,
+    )
+
+
+def invalidate_email_check(email):
+    if email:
+        cache.delete(_email_check_key(email))
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    BCryptSHA256PasswordHasher,
+)
+
+
+class ConfigurableBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    """bcrypt hasher whose cost factor comes from ``BCRYPT_ROUNDS``.
+
+    Changing the setting makes stored hashes report ``must_update`` so
+    they are re-hashed with the new cost on the next successful login.
+    """
+
+    @property
+    def rounds(self):
+        return settings.BCRYPT_ROUNDS
+
+
+class ConfigurableArgon2PasswordHasher(Argon2PasswordHasher):
+    """argon2 hasher tuned by ``ARGON2_TIME_COST``/``ARGON2_MEMORY_COST``.
+
+    Requires the optional ``argon2-cffi`` package.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
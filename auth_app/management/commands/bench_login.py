@@ -0,0 +1,52 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password, verify_password
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password verification throughput (logins per second per "
+        "core) for the configured hashing profile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.LOGIN_HASH_WORKERS,
+            help="Concurrent verifications for the pool measurement.",
+        )
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        threads = options["threads"]
+        hasher = get_hasher()
+        encoded = make_password("benchmark-password")
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            verify_password("benchmark-password", encoded)
+        single = iterations / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(
+                lambda _: verify_password("benchmark-password", encoded),
+                range(iterations * threads),
+            ))
+        pooled = iterations * threads / (time.perf_counter() - start)
+
+        self.stdout.write(f"profile:            {settings.PASSWORD_HASH_PROFILE}")
+        self.stdout.write(f"hasher:             {hasher.algorithm}")
+        self.stdout.write(f"cores:              {os.cpu_count()}")
+        self.stdout.write(f"ms per login:       {1000 / single:.1f}")
+        self.stdout.write(f"logins/s per core:  {single:.1f}")
+        self.stdout.write(
+            f"logins/s ({threads} threads): {pooled:.1f} "
+            f"({pooled / min(threads, os.cpu_count() or 1):.1f} per core)"
+        )
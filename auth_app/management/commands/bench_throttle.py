@@ -0,0 +1,63 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from auth_app import throttling
+from auth_app.throttling import GroupRateThrottle
+
+
+class _UnlimitedThrottle(GroupRateThrottle):
+    """Does all the counting but never rejects."""
+
+    def get_rate(self, group):
+        return "1000000000/min"
+
+
+class _View:
+    throttle_group = "bench"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request cost of GroupRateThrottle on the Django "
+        "cache and, with THROTTLE_REDIS_URL or --redis-url, on Redis."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20_000)
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument(
+            "--redis-url", default=settings.THROTTLE_REDIS_URL
+        )
+
+    def measure(self, throttle, requests, iterations):
+        view = _View()
+        start = time.perf_counter()
+        for index in range(iterations):
+            throttle.allow_request(requests[index % len(requests)], view)
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        requests = []
+        for pk in range(1, options["users"] + 1):
+            request = Request(factory.get("/api/boards/1/"))
+            request.user = User(pk=pk)
+            requests.append(request)
+        iterations = options["iterations"]
+
+        baseline = self.measure(GroupRateThrottle(), requests, iterations)
+        self.stdout.write(f"no group (baseline): {baseline:8.1f} us/request")
+        backends = [("django cache", "")]
+        if options["redis_url"]:
+            backends.append(("redis", options["redis_url"]))
+        for name, url in backends:
+            throttling._redis_script = None
+            with override_settings(THROTTLE_REDIS_URL=url):
+                cost = self.measure(_UnlimitedThrottle(), requests, iterations)
+            self.stdout.write(f"{name + ':':20} {cost:8.1f} us/request")
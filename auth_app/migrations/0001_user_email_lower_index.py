@@ -0,0 +1,30 @@
+from django.db import migrations
+
+INDEX_NAME = "auth_user_email_lower_idx"
+
+
+def create_index(apps, schema_editor):
+    # text_pattern_ops lets PostgreSQL serve LIKE 'prefix%' lookups from
+    # the index regardless of the database collation.
+    if schema_editor.connection.vendor == "postgresql":
+        expression = "LOWER(email) text_pattern_ops"
+    else:
+        expression = "LOWER(email)"
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON auth_user ({expression})"
+    )
+
+
+def drop_index(apps, schema_editor):
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
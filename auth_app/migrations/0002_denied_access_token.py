@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-19 10:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth_app', '0001_user_email_lower_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeniedAccessToken',
+            fields=[
+                ('jti', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
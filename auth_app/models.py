@@ -1,3 +1,12 @@
 from django.db import models
 
-# Create your models here.
+
+class DeniedAccessToken(models.Model):
+    """An access token revoked by logout, kept until it would expire.
+
+    Stored in the database rather than the cache so that every worker
+    process rejects the token, not just the one that handled the logout.
+    """
+
+    jti = models.CharField(max_length=255, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
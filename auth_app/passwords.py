@@ -0,0 +1,63 @@
+import threading
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+from auth_app.emails import users_by_email
+
+_slots_lock = threading.Lock()
+_slots = None
+
+
+class LoginCapacityExceeded(Exception):
+    """Raised when all hashing slots stay taken past the timeout."""
+
+
+def _get_slots():
+    global _slots
+    if _slots is None:
+        with _slots_lock:
+            if _slots is None:
+                _slots = threading.BoundedSemaphore(
+                    settings.LOGIN_HASH_WORKERS
+                )
+    return _slots
+
+
+def run_password_hash(func, *args):
+    """Run a CPU-bound hashing call on the calling thread, bounded.
+
+    At most ``LOGIN_HASH_WORKERS`` hashes run at once per process; the
+    hashing libraries release the GIL, so other request threads keep
+    running meanwhile. Callers that cannot get a slot within
+    ``LOGIN_QUEUE_TIMEOUT`` seconds fail fast instead of queueing.
+    """
+    slots = _get_slots()
+    if not slots.acquire(timeout=settings.LOGIN_QUEUE_TIMEOUT):
+        raise LoginCapacityExceeded()
+    try:
+        return func(*args)
+    finally:
+        slots.release()
+
+
+def verify_credentials(email, password):
+    """Return the active user matching the credentials, or ``None``.
+
+    Equivalent to ``authenticate()`` with the model backend, except that
+    the password hash waits for one of the bounded hashing slots.
+    """
+    user = users_by_email(email).order_by("pk").first()
+    if user is None:
+        # Hash anyway so unknown accounts take as long as known ones.
+        run_password_hash(make_password, password)
+        return None
+    is_correct, must_update = run_password_hash(
+        verify_password, password, user.password
+    )
+    if not is_correct or not user.is_active:
+        return None
+    if must_update:
+        user.password = run_password_hash(make_password, password)
+        user.save(update_fields=["password"])
+    return user
@@ -0,0 +1,25 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from auth_app.emails import invalidate_email_check
+from auth_app.users import invalidate_user_summary
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_caches(sender, instance, **kwargs):
+    """Drop cached lookups that embed this user's data.
+
+    Dropped now and again once the transaction commits: a concurrent
+    request may cache the old row in between.
+    """
+    email, user_id = instance.email, instance.pk
+
+    def invalidate():
+        invalidate_email_check(email)
+        invalidate_user_summary(user_id)
+
+    invalidate()
+    transaction.on_commit(invalidate)
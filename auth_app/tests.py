@@ -1,6 +1,24 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.authtoken.models import Token
-from rest_framework.test import APITestCase
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from auth_app.api.serializers import UserDetailsSerializer
+from auth_app.authentication import StatelessJWTAuthentication
+from auth_app.users import (
+    USER_SUMMARY_KEY,
+    user_summaries,
+    user_summary_memo,
+)
+from board_app.models import Board
+from tasks_app.models import Task
 
 
 class RegistrationTestCase(APITestCase):
@@ -37,6 +55,22 @@ class RegistrationTestCase(APITestCase):
         response = self.client.post("/api/registration/", data)
         self.assertEqual(response.status_code, 400)
 
+    def test_registration_duplicate_email_other_case(self):
+        """Emails differing only in case count as duplicates."""
+        User.objects.create_user(
+            username="max@example.com",
+            email="max@example.com",
+            password="securepass123",
+        )
+        data = {
+            "fullname": "Max Mustermann",
+            "email": "Max@Example.com",
+            "password": "securepass123",
+            "repeated_password": "securepass123",
+        }
+        response = self.client.post("/api/registration/", data)
+        self.assertEqual(response.status_code, 400)
+
     def test_registration_password_mismatch(self):
         """Mismatched passwords return 400."""
         data = {
@@ -69,6 +103,7 @@ class LoginTestCase(APITestCase):
     """Tests for POST /api/login/"""
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(
             username="max@example.com",
             email="max@example.com",
@@ -85,6 +120,12 @@ class LoginTestCase(APITestCase):
         self.assertEqual(response.data["email"], "max@example.com")
         self.assertEqual(response.data["fullname"], "Max Mustermann")
 
+    def test_login_email_case_insensitive(self):
+        """Login accepts the email in any case."""
+        data = {"email": "MAX@example.com", "password": "securepass123"}
+        response = self.client.post("/api/login/", data)
+        self.assertEqual(response.status_code, 200)
+
     def test_login_wrong_password(self):
         """Wrong password returns 400."""
         data = {"email": "max@example.com", "password": "wrongpass"}
@@ -102,11 +143,49 @@ class LoginTestCase(APITestCase):
         response = self.client.post("/api/login/", {})
         self.assertEqual(response.status_code, 400)
 
+    def test_login_malformed_body(self):
+        """Non-object bodies and non-string emails return 400, not 500."""
+        for body in (["max@example.com"], {"email": 123}, {"email": ["a"]}):
+            response = self.client.post("/api/login/", body, format="json")
+            self.assertEqual(response.status_code, 400)
+
+    def test_login_rehashes_legacy_password(self):
+        """A PBKDF2 hash is upgraded to the configured hasher on login."""
+        self.user.password = make_password(
+            "securepass123", hasher="pbkdf2_sha256"
+        )
+        self.user.save()
+        data = {"email": "max@example.com", "password": "securepass123"}
+        response = self.client.post("/api/login/", data)
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("bcrypt_sha256$"))
+
+    @override_settings(BCRYPT_ROUNDS=5)
+    def test_login_rehashes_on_cost_change(self):
+        """Changing BCRYPT_ROUNDS re-hashes with the new cost on login."""
+        data = {"email": "max@example.com", "password": "securepass123"}
+        response = self.client.post("/api/login/", data)
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertIn("$05$", self.user.password)
+
+    @override_settings(BCRYPT_ROUNDS=4)
+    def test_login_throttled_per_email(self):
+        """Too many attempts for one email return 429 with Retry-After."""
+        data = {"email": "max@example.com", "password": "wrongpass"}
+        for _ in range(10):
+            self.client.post("/api/login/", data)
+        response = self.client.post("/api/login/", data)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
 
 class EmailCheckTestCase(APITestCase):
     """Tests for GET /api/email-check/"""
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(
             username="max@example.com",
             email="max@example.com",
@@ -147,3 +226,324 @@ class EmailCheckTestCase(APITestCase):
             "/api/email-check/", {"email": "max@example.com"}
         )
         self.assertEqual(response.status_code, 401)
+
+    def test_email_check_case_insensitive(self):
+        """Lookup ignores the case of the email."""
+        response = self.client.get(
+            "/api/email-check/", {"email": "MAX@Example.com"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["id"], self.user.id)
+
+    def test_email_check_cached(self):
+        """Repeated lookups are served from the cache."""
+        self.client.get("/api/email-check/", {"email": "max@example.com"})
+        # Only the token authentication query remains.
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                "/api/email-check/", {"email": "max@example.com"}
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_email_check_negative_cache_invalidated(self):
+        """A cached miss is dropped once the user registers."""
+        email = "new@example.com"
+        response = self.client.get("/api/email-check/", {"email": email})
+        self.assertEqual(response.status_code, 404)
+        User.objects.create_user(username=email, email=email)
+        response = self.client.get("/api/email-check/", {"email": email})
+        self.assertEqual(response.status_code, 200)
+
+
+class EmailSearchTestCase(APITestCase):
+    """Tests for GET /api/email-search/"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="owner@example.com", email="owner@example.com"
+        )
+        for i in range(12):
+            User.objects.create_user(
+                username=f"max{i}@example.com", email=f"Max{i}@example.com"
+            )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + self.token.key
+        )
+
+    def test_prefix_search_limited(self):
+        """Prefix search is case-insensitive and capped at one page."""
+        response = self.client.get("/api/email-search/", {"q": "max"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 10)
+        self.assertTrue(
+            all(u["email"].lower().startswith("max") for u in response.data)
+        )
+
+    def test_prefix_search_too_short(self):
+        """Queries shorter than two characters return 400."""
+        response = self.client.get("/api/email-search/", {"q": "m"})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(AUTH_TOKEN_MODE="jwt")
+class JWTModeTestCase(APITestCase):
+    """Tests for the stateless JWT token mode."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="max@example.com",
+            email="max@example.com",
+            password="securepass123",
+            first_name="Max Mustermann",
+        )
+        response = self.client.post(
+            "/api/login/",
+            {"email": "max@example.com", "password": "securepass123"},
+        )
+        self.access = response.data["access"]
+        self.refresh = response.data["refresh"]
+
+    def test_login_returns_token_pair(self):
+        """Login in JWT mode returns access and refresh tokens."""
+        response = self.client.post(
+            "/api/login/",
+            {"email": "max@example.com", "password": "securepass123"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.data)
+        self.assertIn("refresh", response.data)
+        self.assertNotIn("token", response.data)
+
+    def test_registration_returns_token_pair(self):
+        """Registration in JWT mode returns access and refresh tokens."""
+        data = {
+            "fullname": "Erika Musterfrau",
+            "email": "erika@example.com",
+            "password": "securepass123",
+            "repeated_password": "securepass123",
+        }
+        response = self.client.post("/api/registration/", data)
+        self.assertEqual(response.status_code, 201)
+        self.assertIn("access", response.data)
+
+    def test_authentication_needs_only_the_denylist_lookup(self):
+        """Bearer authentication does not load the user."""
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION="Bearer " + self.access
+        )
+        with self.assertNumQueries(1):
+            user, _ = StatelessJWTAuthentication().authenticate(request)
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(user.first_name, "Max Mustermann")
+
+    def test_bearer_token_grants_access(self):
+        """Access token works for authenticated endpoints."""
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access)
+        response = self.client.get("/api/boards/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_legacy_token_still_accepted(self):
+        """DB-backed tokens keep working in JWT mode."""
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+        response = self.client.get("/api/boards/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_refresh(self):
+        """Refresh endpoint issues a new access token."""
+        response = self.client.post(
+            "/api/token/refresh/", {"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.data)
+
+    def test_logout_revokes_tokens(self):
+        """Logout denylists the access token and blacklists the refresh."""
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access)
+        response = self.client.post(
+            "/api/logout/", {"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, 204)
+        response = self.client.get("/api/boards/")
+        self.assertEqual(response.status_code, 401)
+        self.client.credentials()
+        response = self.client.post(
+            "/api/token/refresh/", {"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_denial_survives_cache_loss(self):
+        """Revocations are not kept in the per-process cache."""
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access)
+        self.client.post("/api/logout/")
+        cache.clear()
+        response = self.client.get("/api/boards/")
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_rejects_non_object_body(self):
+        """A JSON list body is a 400, and the token stays valid."""
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access)
+        response = self.client.post(
+            "/api/logout/", [self.refresh], format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/boards/")
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(REST_FRAMEWORK={
+    **settings.REST_FRAMEWORK,
+    "DEFAULT_THROTTLE_RATES": {
+        **settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"],
+        "board-read": "3/min",
+        "task-write": "2/min",
+    },
+})
+class GroupRateThrottleTestCase(APITestCase):
+    """Tests for the sliding-window endpoint group throttle"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(
+            username="max@example.com", email="max@example.com"
+        )
+        self.other = User.objects.create_user(
+            username="erika@example.com", email="erika@example.com"
+        )
+        self.board = Board.objects.create(title="B", created_by=self.user)
+        self.board.members.add(self.other)
+        self.url = f"/api/boards/{self.board.pk}/"
+        self.client.force_authenticate(self.user)
+
+    def test_board_reads_limited_per_user(self):
+        """Reads past the rate get 429 with Retry-After; others go on."""
+        for _ in range(3):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+        self.assertLessEqual(int(response["Retry-After"]), 60)
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_groups_counted_separately(self):
+        """Board writes and task writes do not use the read budget."""
+        for _ in range(3):
+            self.client.get(self.url)
+        response = self.client.patch(self.url, {"title": "New"})
+        self.assertEqual(response.status_code, 200)
+        data = {"board": self.board.pk, "title": "T", "status": "to-do",
+                "priority": "low"}
+        for _ in range(2):
+            response = self.client.post("/api/tasks/", data)
+            self.assertEqual(response.status_code, 201)
+        response = self.client.post("/api/tasks/", data)
+        self.assertEqual(response.status_code, 429)
+
+    def test_previous_window_weighted(self):
+        """Half way into a window, half of the last one still counts."""
+        with mock.patch("auth_app.throttling.time.time") as now:
+            now.return_value = 6000.0
+            for _ in range(3):
+                self.client.get(self.url)
+            # 30 s into the next window: 3 * 0.5 = 1.5 requests in view.
+            now.return_value = 6090.0
+            for _ in range(2):
+                self.assertEqual(self.client.get(self.url).status_code, 200)
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 429)
+            # 1.5 + 2 >= 3 until the old share drops below 1, 10 s on.
+            self.assertEqual(response["Retry-After"], "10")
+            now.return_value = 6100.5
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+
+class UserSummaryTestCase(APITestCase):
+    """Tests for the cached nested user representations."""
+
+    def setUp(self):
+        cache.clear()
+        self.users = [
+            User.objects.create_user(
+                username=f"user{i}@test.com",
+                email=f"user{i}@test.com",
+                password="testpass123",
+                first_name=f"User {i}",
+            )
+            for i in range(3)
+        ]
+        self.ids = [user.pk for user in self.users]
+
+    def test_misses_loaded_in_one_query_then_cached(self):
+        with CaptureQueriesContext(connection) as queries:
+            summaries = user_summaries(self.ids + [None])
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            summaries[self.ids[0]], UserDetailsSerializer(self.users[0]).data
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(user_summaries(self.ids), summaries)
+        self.assertEqual(len(queries), 0)
+
+    def test_profile_change_invalidates(self):
+        user_summaries(self.ids)
+        user = self.users[0]
+        user.first_name = "Renamed"
+        user.save()
+        self.assertEqual(
+            user_summaries([user.pk])[user.pk]["fullname"], "Renamed"
+        )
+
+    def test_entry_cached_before_commit_is_dropped(self):
+        """A summary cached from the old row before the commit goes too."""
+        user = self.users[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            user.first_name = "Renamed"
+            user.save()
+            # A concurrent request still seeing the old row caches it.
+            cache.set(
+                USER_SUMMARY_KEY.format(user_id=user.pk),
+                {"id": user.pk, "email": user.email, "fullname": "User 0"},
+            )
+        self.assertEqual(
+            user_summaries([user.pk])[user.pk]["fullname"], "Renamed"
+        )
+
+    def test_memo_serves_repeated_lookups(self):
+        with user_summary_memo():
+            user_summaries(self.ids)
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                user_summaries(self.ids)
+        self.assertEqual(len(queries), 0)
+
+    def test_task_list_without_user_join(self):
+        """Assignees and reviewers of a list come from one lookup."""
+        owner = self.users[0]
+        board = Board.objects.create(title="Board", created_by=owner)
+        for reviewer in self.users:
+            Task.objects.create(
+                title="Task",
+                board=board,
+                created_by=owner,
+                assignee=owner,
+                reviewer=reviewer,
+            )
+        token = Token.objects.create(user=owner)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/tasks/assigned-to-me/")
+        user_queries = [
+            query for query in queries
+            if 'FROM "auth_user"' in query["sql"]
+        ]
+        self.assertEqual(len(user_queries), 1)
+        self.assertEqual(
+            {task["reviewer"]["fullname"] for task in response.data},
+            {"User 0", "User 1", "User 2"},
+        )
+        self.assertEqual(response.data[0]["assignee"]["id"], owner.pk)
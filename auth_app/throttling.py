@@ -0,0 +1,161 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+
+class LoginIPThrottle(SimpleRateThrottle):
+    """Limit login attempts per client IP."""
+
+    scope = "login-ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class LoginEmailThrottle(SimpleRateThrottle):
+    """Limit login attempts per target account, across all IPs."""
+
+    scope = "login-email"
+
+    def get_cache_key(self, request, view):
+        data = request.data
+        email = data.get("email") if isinstance(data, dict) else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        ident = hashlib.sha256(email.strip().lower().encode()).hexdigest()
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+# Sliding-window counter: a fixed window per period plus the previous
+# one, weighted by how much of it still overlaps the last ``period``
+# seconds. Returns {allowed, current count, previous count}.
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if previous * tonumber(ARGV[1]) + current >= tonumber(ARGV[2]) then
+    return {0, current, previous}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return {1, current, previous}
+"""
+
+_redis_script = None
+
+
+def _redis_hit(keys, weight, limit, period):
+    global _redis_script
+    import redis
+
+    if _redis_script is None:
+        client = redis.Redis.from_url(settings.THROTTLE_REDIS_URL)
+        _redis_script = client.register_script(SLIDING_WINDOW_SCRIPT)
+    try:
+        allowed, current, previous = _redis_script(
+            keys=keys, args=[weight, limit, 2 * period]
+        )
+    except redis.RedisError:
+        # Fail open: an outage of the limiter must not take the API down.
+        return True, 0, 0
+    return bool(allowed), current, previous
+
+
+def _cache_hit(keys, weight, limit, period):
+    """Fallback on the Django cache; the check and increment are two
+    steps, so concurrent requests may overshoot the limit slightly."""
+    counts = cache.get_many(keys)
+    current = counts.get(keys[0], 0)
+    previous = counts.get(keys[1], 0)
+    if previous * weight + current >= limit:
+        return False, current, previous
+    cache.add(keys[0], 0, timeout=2 * period)
+    try:
+        current = cache.incr(keys[0])
+    except ValueError:
+        # Expired between add() and incr().
+        cache.set(keys[0], 1, timeout=2 * period)
+        current = 1
+    return True, current, previous
+
+
+class GroupRateThrottle(BaseThrottle):
+    """Sliding-window rate limit per endpoint group.
+
+    Views opt in with ``throttle_group``: a group name, or a dict with
+    ``"read"`` and/or ``"write"`` groups for safe and unsafe methods.
+    Rates come from ``DEFAULT_THROTTLE_RATES`` under the group name.
+    Authenticated requests are counted per user, so new tokens cannot
+    reset a window; anonymous ones per client IP. Counters live in Redis
+    (one Lua script call per request) when ``THROTTLE_REDIS_URL`` is set
+    and in the Django cache otherwise; if Redis is unreachable requests
+    are let through.
+    """
+
+    def get_group(self, request, view):
+        group = getattr(view, "throttle_group", None)
+        if isinstance(group, dict):
+            kind = "read" if request.method in SAFE_METHODS else "write"
+            return group.get(kind)
+        return group
+
+    def get_rate(self, group):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(group)
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        group = self.get_group(request, view)
+        rate = self.get_rate(group) if group else None
+        if rate is None:
+            return True
+        limit, period = self.parse_rate(rate)
+        user = request.user
+        ident = (
+            f"user:{user.pk}" if user and user.is_authenticated
+            else f"ip:{self.get_ident(request)}"
+        )
+        now = time.time()
+        window = int(now // period)
+        elapsed = now - window * period
+        weight = 1 - elapsed / period
+        keys = [
+            f"throttle:{group}:{ident}:{window}",
+            f"throttle:{group}:{ident}:{window - 1}",
+        ]
+        hit = _redis_hit if settings.THROTTLE_REDIS_URL else _cache_hit
+        allowed, current, previous = hit(keys, weight, limit, period)
+        if not allowed:
+            self.wait_seconds = self._retry_after(
+                current, previous, limit, period, elapsed
+            )
+        return allowed
+
+    @staticmethod
+    def parse_rate(rate):
+        count, _, unit = rate.partition("/")
+        return int(count), {"s": 1, "m": 60, "h": 3600, "d": 86400}[unit[0]]
+
+    @staticmethod
+    def _retry_after(current, previous, limit, period, elapsed):
+        """Seconds until the weighted count drops below ``limit``."""
+        if current < limit:
+            # The previous window's share shrinks enough in this window.
+            needed = period * (1 - (limit - current) / previous)
+            return max(needed - elapsed, 0)
+        # After the rollover this window becomes the weighted one.
+        return period - elapsed + period * (1 - limit / current)
+
+    def wait(self):
+        # Rounded so float noise does not add a second to Retry-After.
+        if self.wait_seconds is None:
+            return None
+        return round(self.wait_seconds, 3)
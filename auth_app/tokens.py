@@ -0,0 +1,44 @@
+from django.conf import settings
+from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from auth_app.models import DeniedAccessToken
+
+
+def issue_tokens(user):
+    """Return the token payload for login/registration responses.
+
+    Depending on ``settings.AUTH_TOKEN_MODE`` this is either a DB-backed
+    DRF token or a JWT access/refresh pair carrying the user summary
+    claims needed to authenticate without touching the database.
+    """
+    if settings.AUTH_TOKEN_MODE == "jwt":
+        refresh = RefreshToken.for_user(user)
+        refresh["email"] = user.email
+        refresh["fullname"] = user.first_name
+        return {
+            "access": str(refresh.access_token),
+            "refresh": str(refresh),
+        }
+    token, _ = Token.objects.get_or_create(user=user)
+    return {"token": token.key}
+
+
+def deny_access_token(token):
+    """Revoke an access token until it would have expired anyway.
+
+    Entries of tokens that have expired since are dropped on the way.
+    """
+    expires_at = datetime_from_epoch(token["exp"])
+    DeniedAccessToken.objects.filter(
+        expires_at__lte=token.current_time
+    ).delete()
+    if expires_at > token.current_time:
+        DeniedAccessToken.objects.get_or_create(
+            jti=token["jti"], defaults={"expires_at": expires_at}
+        )
+
+
+def is_access_token_denied(token):
+    return DeniedAccessToken.objects.filter(jti=token.get("jti")).exists()
@@ -0,0 +1,83 @@
+"""Cached user summaries for nested user representations.
+
+A summary is the ``UserDetailsSerializer`` payload (``id``, ``email``,
+``fullname``). Serializers look them up by user id through
+``user_summaries``: first in the memo of the current request, then in the
+shared cache, and only the remaining ids in the database, all misses with
+one ``IN`` query. Saving or deleting a user drops its cache entry; other
+processes only see that when the cache is shared (``CACHE_REDIS_URL``),
+otherwise their copies live for the short default TTL.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from core.metrics import record_cache
+
+USER_SUMMARY_KEY = "user-summary:{user_id}"
+
+_memo = ContextVar("user_summary_memo", default=None)
+
+
+def summary_of(user):
+    return {"id": user.pk, "email": user.email, "fullname": user.first_name}
+
+
+@contextmanager
+def user_summary_memo():
+    """Share looked-up summaries within the block (e.g. one request).
+
+    Nested blocks reuse the outer memo.
+    """
+    if _memo.get() is not None:
+        yield
+        return
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def user_summaries(ids):
+    """Map user ids to summaries; unknown ids are left out."""
+    memo = _memo.get()
+    if memo is None:
+        memo = {}
+    ids = {user_id for user_id in ids if user_id is not None}
+    missing = ids - memo.keys()
+    if missing:
+        keys = {USER_SUMMARY_KEY.format(user_id=pk): pk for pk in missing}
+        cached = cache.get_many(keys)
+        for key, pk in keys.items():
+            record_cache("user-summary", key in cached)
+            if key in cached:
+                memo[pk] = cached[key]
+        missing -= memo.keys()
+    if missing:
+        loaded = {
+            user.pk: summary_of(user)
+            for user in User.objects.filter(pk__in=missing).only(
+                "id", "email", "first_name"
+            )
+        }
+        cache.set_many(
+            {
+                USER_SUMMARY_KEY.format(user_id=pk): summary
+                for pk, summary in loaded.items()
+            },
+            settings.USER_SUMMARY_CACHE_TTL,
+        )
+        memo.update(loaded)
+    return {pk: memo[pk] for pk in ids if pk in memo}
+
+
+def invalidate_user_summary(user_id):
+    cache.delete(USER_SUMMARY_KEY.format(user_id=user_id))
+    memo = _memo.get()
+    if memo is not None:
+        memo.pop(user_id, None)
@@ -0,0 +1,61 @@
+"""Recording of board activity feed entries.
+
+Views record events while handling a request; inside
+``activity_batch()`` the rows are collected and inserted with a single
+``bulk_create`` once the surrounding transaction commits.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.utils import timezone
+
+from board_app.models import BoardActivity
+
+_batch = ContextVar("activity_batch", default=None)
+
+
+@contextmanager
+def activity_batch():
+    """Collect activity recorded in the block and write it on commit.
+
+    Nothing is written if the block raises.
+    """
+    rows = []
+    token = _batch.set(rows)
+    try:
+        yield rows
+    finally:
+        _batch.reset(token)
+    if rows:
+        transaction.on_commit(
+            lambda: BoardActivity.objects.bulk_create(rows)
+        )
+
+
+def record_activity(board_id, verb, actor=None, task_id=None, **data):
+    """Add an entry to a board's activity feed."""
+    now = timezone.now()
+    row = BoardActivity(
+        board_id=board_id,
+        actor_id=actor.pk if actor is not None else None,
+        verb=verb,
+        task_id=task_id,
+        data=data,
+        created_at=now,
+        bucket=BoardActivity.bucket_for(now),
+    )
+    rows = _batch.get()
+    if rows is None:
+        transaction.on_commit(row.save)
+    else:
+        rows.append(row)
+
+
+class ActivityBatchMixin:
+    """Batch the activity a DRF view records into one insert."""
+
+    def dispatch(self, request, *args, **kwargs):
+        with activity_batch():
+            return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,194 @@
+"""Flow analytics for a board, aggregated with NumPy.
+
+Task and status-transition data are pulled once as columns
+(``values_list``) and every metric is computed with vectorised array
+operations, so the cost is two queries plus a handful of array passes
+regardless of board size.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+
+from board_app.cache import board_cache_version
+from core.metrics import record_cache
+from tasks_app.flow import (
+    cumulative_flow,
+    first_per_task,
+    last_per_task,
+    load_transitions,
+    time_in_status,
+)
+from tasks_app.models import Task
+
+ANALYTICS_KEY = "board-analytics:{board_id}:{version}"
+ANALYTICS_TTL = 60 * 60
+DAY = 24 * 60 * 60
+WEEK = 7 * DAY
+THROUGHPUT_WEEKS = 12
+# Age buckets in days: [0, 1), [1, 3), ... [30, inf).
+AGE_BINS = np.array([0, 1, 3, 7, 14, 30, np.inf])
+# Monday 1970-01-05 00:00 UTC; week numbers count from here.
+WEEK_ORIGIN = 4 * DAY
+
+
+def _load_tasks(board_id):
+    rows = list(
+        Task.objects.filter(board_id=board_id).values_list(
+            "id", "status", "priority", "assignee_id"
+        )
+    )
+    if not rows:
+        return {
+            "id": np.array([], dtype=np.int64),
+            "status": np.array([], dtype=object),
+            "priority": np.array([], dtype=object),
+            "assignee": np.array([], dtype=np.int64),
+        }
+    ids, status, priority, assignee = zip(*rows)
+    return {
+        "id": np.fromiter(ids, dtype=np.int64, count=len(rows)),
+        "status": np.array(status, dtype=object),
+        "priority": np.array(priority, dtype=object),
+        "assignee": np.fromiter(
+            (-1 if a is None else a for a in assignee),
+            dtype=np.int64,
+            count=len(rows),
+        ),
+    }
+
+
+def _summarize_history(transitions):
+    """First/last transition per task, aligned by task."""
+    task_ids, _, to_status, changed_at = transitions
+    first = first_per_task(task_ids)
+    last = last_per_task(task_ids)
+    return {
+        "task": task_ids[last],
+        "status": to_status[last],
+        "started": changed_at[first],
+        "changed": changed_at[last],
+    }
+
+
+def _distribution(seconds):
+    """Summary statistics and a day-bucket histogram of durations."""
+    if not seconds.size:
+        return {"count": 0, "mean_hours": None, "percentiles_hours": {},
+                "histogram_days": []}
+    hours = seconds / 3600
+    p50, p85, p95 = np.percentile(hours, [50, 85, 95])
+    counts, _ = np.histogram(seconds / DAY, bins=AGE_BINS)
+    return {
+        "count": int(seconds.size),
+        "mean_hours": round(float(hours.mean()), 2),
+        "percentiles_hours": {
+            "p50": round(float(p50), 2),
+            "p85": round(float(p85), 2),
+            "p95": round(float(p95), 2),
+        },
+        "histogram_days": _histogram_rows(counts),
+    }
+
+
+def _histogram_rows(counts):
+    rows = []
+    for low, high, count in zip(AGE_BINS[:-1], AGE_BINS[1:], counts):
+        rows.append({
+            "from_days": int(low),
+            "to_days": None if np.isinf(high) else int(high),
+            "count": int(count),
+        })
+    return rows
+
+
+def _cycle_times(history):
+    done = history["status"] == "done"
+    return history["changed"][done] - history["started"][done]
+
+
+def _throughput(history, now_ts):
+    done_at = history["changed"][history["status"] == "done"]
+    current_week = int((now_ts - WEEK_ORIGIN) // WEEK)
+    first_week = current_week - THROUGHPUT_WEEKS + 1
+    weeks = ((done_at - WEEK_ORIGIN) // WEEK).astype(np.int64) - first_week
+    weeks = weeks[(weeks >= 0) & (weeks < THROUGHPUT_WEEKS)]
+    counts = np.bincount(weeks, minlength=THROUGHPUT_WEEKS)
+    result = []
+    for offset, count in enumerate(counts):
+        start = WEEK_ORIGIN + (first_week + offset) * WEEK
+        week_start = datetime.fromtimestamp(start, tz=dt_timezone.utc)
+        result.append({
+            "week_start": week_start.date().isoformat(),
+            "count": int(count),
+        })
+    return result
+
+
+def _status_ages(history, tasks, now_ts):
+    live = np.isin(history["task"], tasks["id"])
+    ages = (now_ts - history["changed"][live]) / DAY
+    statuses = history["status"][live]
+    result = {}
+    for status, _ in Task.STATUS_CHOICES:
+        if status == "done":
+            continue
+        counts, _ = np.histogram(ages[statuses == status], bins=AGE_BINS)
+        result[status] = _histogram_rows(counts)
+    return result
+
+
+def _assignee_load(tasks):
+    open_tasks = tasks["status"] != "done"
+    assignees = tasks["assignee"][open_tasks]
+    urgent = tasks["priority"][open_tasks] == "urgent"
+    ids, inverse, totals = np.unique(
+        assignees, return_inverse=True, return_counts=True
+    )
+    urgent_counts = np.bincount(inverse, weights=urgent, minlength=ids.size)
+    order = np.argsort(-totals, kind="stable")
+    return [
+        {
+            "assignee_id": None if ids[i] == -1 else int(ids[i]),
+            "open_tasks": int(totals[i]),
+            "urgent_tasks": int(urgent_counts[i]),
+        }
+        for i in order
+    ]
+
+
+def compute_board_analytics(board_id, now=None):
+    """Compute the analytics payload for a board (uncached)."""
+    now = now or timezone.now()
+    now_ts = now.timestamp()
+    tasks = _load_tasks(board_id)
+    transitions = load_transitions(board_id)
+    history = _summarize_history(transitions)
+    return {
+        "task_count": int(tasks["id"].size),
+        "cycle_time": _distribution(_cycle_times(history)),
+        "throughput_per_week": _throughput(history, now_ts),
+        "status_age": _status_ages(history, tasks, now_ts),
+        "assignee_load": _assignee_load(tasks),
+        "time_in_status": time_in_status(
+            board_id, now, transitions=transitions
+        ),
+        "cumulative_flow": cumulative_flow(
+            board_id, now=now, transitions=transitions
+        ),
+    }
+
+
+def get_board_analytics(board_id):
+    """Analytics for a board, cached until the board's next write."""
+    key = ANALYTICS_KEY.format(
+        board_id=board_id, version=board_cache_version(board_id)
+    )
+    data = cache.get(key)
+    record_cache("board-analytics", data is not None)
+    if data is None:
+        data = compute_board_analytics(board_id)
+        cache.set(key, data, ANALYTICS_TTL)
+    return data
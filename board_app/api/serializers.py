@@ -1,8 +1,16 @@
-from django.contrib.auth.models import User
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
 
+from auth_app.api.fields import (
+    UserIdListField,
+    UserSummaryField,
+    UserSummaryListSerializer,
+)
 from auth_app.api.serializers import UserDetailsSerializer
-from board_app.models import Board
+from board_app.copying import TEMPLATE_TASK_FIELDS, task_rows
+from board_app.models import Board, BoardActivity, BoardTemplate
+from tasks_app.api.serializers import CommentPreviewMixin
 from tasks_app.models import Task
 
 
@@ -16,12 +24,7 @@ class BoardListSerializer(serializers.ModelSerializer):
     ticket_count = serializers.SerializerMethodField()
     tasks_to_do_count = serializers.SerializerMethodField()
     tasks_high_prio_count = serializers.SerializerMethodField()
-    members = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.all(),
-        many=True,
-        write_only=True,
-        required=False,
-    )
+    members = UserIdListField(write_only=True, required=False)
 
     class Meta:
         model = Board
@@ -33,8 +36,10 @@ class BoardListSerializer(serializers.ModelSerializer):
             "tasks_to_do_count",
             "tasks_high_prio_count",
             "owner_id",
+            "version",
             "members",
         ]
+        read_only_fields = ["version"]
 
     def get_member_count(self, obj):
         return obj.members.count()
@@ -52,19 +57,19 @@ class BoardListSerializer(serializers.ModelSerializer):
         members = validated_data.pop("members", [])
         validated_data["created_by"] = self.context["request"].user
         board = Board.objects.create(**validated_data)
-        board.members.set(members)
+        board.members.add(*members)
         return board
 
 
-class BoardTaskSerializer(serializers.ModelSerializer):
+class BoardTaskSerializer(CommentPreviewMixin, serializers.ModelSerializer):
     """Task representation nested inside board detail."""
 
-    assignee = UserDetailsSerializer(read_only=True)
-    reviewer = UserDetailsSerializer(read_only=True)
-    comments_count = serializers.SerializerMethodField()
+    assignee = UserSummaryField(source="assignee_id")
+    reviewer = UserSummaryField(source="reviewer_id")
 
     class Meta:
         model = Task
+        list_serializer_class = UserSummaryListSerializer
         fields = [
             "id",
             "title",
@@ -74,51 +79,166 @@ class BoardTaskSerializer(serializers.ModelSerializer):
             "assignee",
             "reviewer",
             "due_date",
+            "position",
             "comments_count",
+            "latest_comments",
         ]
 
-    def get_comments_count(self, obj):
-        return obj.comments.count()
 
+class MemberSampleMixin(serializers.Serializer):
+    """Member count and a capped member sample for board representations.
+
+    Uses ``member_count`` and ``member_sample`` attached by
+    ``BoardViewSet.prefetch_detail`` and falls back to two queries for
+    boards loaded without them. All members are paged at
+    ``/api/boards/{id}/members/``.
+    """
+
+    member_count = serializers.SerializerMethodField()
+
+    def get_member_count(self, obj):
+        count = getattr(obj, "member_count", None)
+        if count is None:
+            count = obj.members.count()
+        return count
+
+    def member_sample(self, obj):
+        sample = getattr(obj, "member_sample", None)
+        if sample is None:
+            sample = obj.members.order_by("id")[:settings.BOARD_MEMBER_SAMPLE]
+        return UserDetailsSerializer(sample, many=True).data
 
-class BoardDetailSerializer(serializers.ModelSerializer):
+
+class BoardDetailSerializer(MemberSampleMixin, serializers.ModelSerializer):
     """Serializer for board detail view."""
 
     owner_id = serializers.IntegerField(
         source="created_by_id", read_only=True
     )
-    members = UserDetailsSerializer(many=True, read_only=True)
+    members = serializers.SerializerMethodField()
     tasks = BoardTaskSerializer(many=True, read_only=True)
 
     class Meta:
         model = Board
-        fields = ["id", "title", "owner_id", "members", "tasks"]
+        fields = [
+            "id",
+            "title",
+            "owner_id",
+            "version",
+            "member_count",
+            "members",
+            "tasks",
+        ]
+
+    def get_members(self, obj):
+        return self.member_sample(obj)
 
 
-class BoardUpdateSerializer(serializers.ModelSerializer):
+class BoardUpdateSerializer(MemberSampleMixin, serializers.ModelSerializer):
     """Serializer for updating a board."""
 
-    owner_data = UserDetailsSerializer(
-        source="created_by", read_only=True
-    )
-    members_data = UserDetailsSerializer(
-        source="members", many=True, read_only=True
-    )
-    members = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.all(),
-        many=True,
-        write_only=True,
-        required=False,
-    )
+    owner_data = UserSummaryField(source="created_by_id")
+    members_data = serializers.SerializerMethodField()
+    members = UserIdListField(write_only=True, required=False)
 
     class Meta:
         model = Board
-        fields = ["id", "title", "owner_data", "members_data", "members"]
+        fields = [
+            "id",
+            "title",
+            "version",
+            "owner_data",
+            "member_count",
+            "members_data",
+            "members",
+        ]
+        read_only_fields = ["version"]
+
+    def get_members_data(self, obj):
+        return self.member_sample(obj)
 
     def update(self, instance, validated_data):
+        """Apply changes with one version bump; skip no-op updates.
+
+        ``expected_version`` in the serializer context makes the write
+        conditional on the board still being at that version. A new
+        member list is applied as one insert of the added and one delete
+        of the removed members.
+        """
         members = validated_data.pop("members", None)
-        instance.title = validated_data.get("title", instance.title)
-        instance.save()
+        title = validated_data.get("title", instance.title)
+        added = removed = set()
         if members is not None:
-            instance.members.set(members)
+            wanted = set(members)
+            current = set(instance.members.values_list("pk", flat=True))
+            added, removed = wanted - current, current - wanted
+        if title == instance.title and not added and not removed:
+            return instance
+        with transaction.atomic():
+            instance.title = title
+            instance.save(
+                update_fields=["title", "updated_at"],
+                expected_version=self.context.get("expected_version"),
+            )
+            if removed:
+                instance.members.remove(*removed)
+            if added:
+                instance.members.add(*added)
         return instance
+
+
+class BoardMembersSerializer(serializers.Serializer):
+    """Members to add to or remove from a board."""
+
+    members = UserIdListField(allow_empty=False)
+
+
+class BoardActivitySerializer(serializers.ModelSerializer):
+    """Entry of a board's activity feed."""
+
+    verb = serializers.CharField(source="get_verb_display")
+    actor = UserSummaryField(source="actor_id")
+
+    class Meta:
+        model = BoardActivity
+        list_serializer_class = UserSummaryListSerializer
+        fields = ["id", "verb", "actor", "task_id", "data", "created_at"]
+
+
+class BoardDuplicateSerializer(serializers.Serializer):
+    """Options for POST /api/boards/{id}/duplicate/."""
+
+    title = serializers.CharField(max_length=100, required=False)
+    include_tasks = serializers.BooleanField(default=True)
+    reset_statuses = serializers.BooleanField(default=False)
+    include_members = serializers.BooleanField(default=True)
+
+
+class BoardTemplateSerializer(serializers.ModelSerializer):
+    """Board template, created from an existing board."""
+
+    board = serializers.PrimaryKeyRelatedField(
+        queryset=Board.objects.all(), write_only=True
+    )
+    title = serializers.CharField(max_length=100, required=False)
+    task_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BoardTemplate
+        fields = ["id", "name", "title", "task_count", "board", "created_at"]
+        read_only_fields = ["id", "created_at"]
+
+    def get_task_count(self, obj):
+        return len(obj.tasks)
+
+    def create(self, validated_data):
+        board = validated_data.pop("board")
+        validated_data.setdefault("title", board.title)
+        validated_data["tasks"] = task_rows(board, TEMPLATE_TASK_FIELDS)
+        return super().create(validated_data)
+
+
+class BoardFromTemplateSerializer(serializers.Serializer):
+    """Options for POST /api/board-templates/{id}/create-board/."""
+
+    title = serializers.CharField(max_length=100, required=False)
@@ -1,10 +1,13 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from board_app.api.views import BoardViewSet
+from board_app.api.views import BoardTemplateViewSet, BoardViewSet
 
 router = DefaultRouter()
 router.register(r"boards", BoardViewSet, basename="board")
+router.register(
+    r"board-templates", BoardTemplateViewSet, basename="board-template"
+)
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -1,20 +1,57 @@
-from django.db.models import Q
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import F, Prefetch, Q, prefetch_related_objects
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from auth_app.api.serializers import UserDetailsSerializer
 from board_app.api.permissions import IsBoardOwner, IsBoardOwnerOrMember
 from board_app.api.serializers import (
+    BoardActivitySerializer,
     BoardDetailSerializer,
+    BoardDuplicateSerializer,
+    BoardFromTemplateSerializer,
     BoardListSerializer,
+    BoardMembersSerializer,
+    BoardTemplateSerializer,
     BoardUpdateSerializer,
 )
-from board_app.models import Board
+from board_app.cache import (
+    DETAIL_TTL,
+    board_detail_key,
+    bump_board_cache_version,
+)
+from board_app.copying import board_from_template, duplicate_board
+from board_app.models import Board, BoardTemplate
+from board_app.transfer import export_board
+from core.compression import add_variant
+from core.concurrency import (
+    PreconditionFailed,
+    VersionConflict,
+    check_version,
+    requested_version,
+)
+from core.metrics import record_cache
+from core.params import page_limit, positive_int
+from tasks_app.api.serializers import ArchivedTaskSerializer
+from tasks_app.models import ArchivedComment, Task
+from tasks_app.prefetch import with_comment_previews
+from tasks_app.summary import board_summary_users, invalidate_summaries
 
 
 class BoardViewSet(ModelViewSet):
     """ViewSet for board CRUD operations."""
 
     permission_classes = [IsAuthenticated]
+    throttle_group = {"read": "board-read"}
     http_method_names = ["get", "post", "patch", "delete"]
 
     def get_queryset(self):
@@ -24,6 +61,11 @@ class BoardViewSet(ModelViewSet):
             return Board.objects.filter(
                 Q(created_by=user) | Q(members=user)
             ).distinct()
+        if self.action == "restore":
+            return Board.all_objects.filter(
+                deleted_at__gte=timezone.now()
+                - settings.SOFT_DELETE_RESTORE_WINDOW
+            )
         return Board.objects.all()
 
     def get_serializer_class(self):
@@ -37,8 +79,257 @@ class BoardViewSet(ModelViewSet):
     def get_permissions(self):
         """Add object-level permissions for detail actions."""
         permissions = [IsAuthenticated()]
-        if self.action == "destroy":
+        if self.action in ["destroy", "restore"]:
             permissions.append(IsBoardOwner())
-        elif self.action in ["retrieve", "partial_update"]:
+        elif self.action in [
+            "retrieve",
+            "partial_update",
+            "analytics",
+            "activity",
+            "archive",
+            "export",
+            "duplicate",
+            "members",
+            "remove_members",
+        ]:
             permissions.append(IsBoardOwnerOrMember())
         return permissions
+
+    def retrieve(self, request, *args, **kwargs):
+        """Board detail, rendered once per board version.
+
+        The body is the same for every member, so with
+        ``BOARD_DETAIL_CACHE`` the rendered JSON is cached until the next
+        board write, and compressed variants are stored next to it the
+        first time a client accepts them.
+        """
+        board = self.get_object()
+        if (
+            request.accepted_renderer.format != "json"
+            or not settings.BOARD_DETAIL_CACHE
+        ):
+            self.prefetch_detail(board)
+            return Response(self.get_serializer(board).data)
+        key = board_detail_key(board.pk)
+        entry = cache.get(key)
+        record_cache("board-detail", entry is not None)
+        changed = entry is None
+        if entry is None:
+            self.prefetch_detail(board)
+            data = self.get_serializer(board).data
+            entry = {"body": JSONRenderer().render(data), "variants": {}}
+        if add_variant(entry["variants"], entry["body"], request):
+            changed = True
+        if changed:
+            cache.set(key, entry, DETAIL_TTL)
+        response = HttpResponse(entry["body"], content_type="application/json")
+        response.compressed_variants = entry["variants"]
+        return response
+
+    def prefetch_detail(self, board):
+        """Load tasks, the member count and a capped member sample."""
+        prefetch_related_objects(
+            [board],
+            Prefetch(
+                "tasks",
+                queryset=with_comment_previews(
+                    Task.objects.order_by("status", "position", "id")
+                ),
+            ),
+            Prefetch(
+                "members",
+                queryset=User.objects.order_by("id")[
+                    :settings.BOARD_MEMBER_SAMPLE
+                ],
+                to_attr="member_sample",
+            ),
+        )
+        board.member_count = board.members.count()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == "partial_update":
+            context["expected_version"] = requested_version(self.request)
+        return context
+
+    def perform_update(self, serializer):
+        """Reject writes based on a stale ``If-Match``/``version``."""
+        expected = serializer.context["expected_version"]
+        check_version(serializer.instance, expected)
+        try:
+            serializer.save()
+        except VersionConflict:
+            raise PreconditionFailed()
+
+    def partial_update(self, request, *args, **kwargs):
+        response = super().partial_update(request, *args, **kwargs)
+        response["ETag"] = f'"{response.data["version"]}"'
+        return response
+
+    def perform_destroy(self, instance):
+        """Soft delete; purge_deleted removes the rows later in batches."""
+        Board.objects.filter(pk=instance.pk).soft_delete()
+        bump_board_cache_version(instance.pk)
+        invalidate_summaries(board_summary_users(instance))
+
+    @action(detail=True, methods=["post"])
+    def restore(self, request, pk=None):
+        """POST /api/boards/{id}/restore/ - Undo a delete within the window."""
+        board = self.get_object()
+        Board.all_objects.filter(pk=board.pk).restore()
+        board.deleted_at = None
+        bump_board_cache_version(board.pk)
+        invalidate_summaries(board_summary_users(board))
+        serializer = BoardListSerializer(board, context={"request": request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"])
+    def analytics(self, request, pk=None):
+        """GET /api/boards/{id}/analytics/ - Flow metrics for the board."""
+        # Imported on first use: NumPy adds ~50 ms to every worker boot.
+        from board_app.analytics import get_board_analytics
+
+        board = self.get_object()
+        return Response(get_board_analytics(board.pk))
+
+    @action(detail=True, methods=["get"])
+    def activity(self, request, pk=None):
+        """GET /api/boards/{id}/activity/ - Newest activity first.
+
+        Pass the last seen entry id as ``before`` to get the next page.
+        """
+        board = self.get_object()
+        params = request.query_params
+        limit = page_limit(
+            params, settings.ACTIVITY_PAGE_SIZE, settings.ACTIVITY_PAGE_MAX
+        )
+        entries = board.activity.order_by("-id")
+        before = positive_int(params, "before")
+        if before:
+            entries = entries.filter(id__lt=before)
+        serializer = BoardActivitySerializer(entries[:limit], many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=["get"])
+    def archive(self, request, pk=None):
+        """GET /api/boards/{id}/archive/ - Archived tasks, newest id first.
+
+        Pass the last seen task id as ``before`` to get the next page.
+        """
+        board = self.get_object()
+        params = request.query_params
+        limit = page_limit(
+            params, settings.ARCHIVE_PAGE_SIZE, settings.ARCHIVE_PAGE_MAX
+        )
+        tasks = board.archived_tasks.prefetch_related(
+            Prefetch(
+                "comments",
+                queryset=ArchivedComment.objects.select_related("author"),
+            )
+        ).order_by("-id")
+        before = positive_int(params, "before")
+        if before:
+            tasks = tasks.filter(id__lt=before)
+        serializer = ArchivedTaskSerializer(tasks[:limit], many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=["get", "post"])
+    def members(self, request, pk=None):
+        """GET/POST /api/boards/{id}/members/ - List or add members.
+
+        GET pages members by id; pass the last seen id as ``after``. POST
+        adds ``members`` (user ids) in one insert; existing members and
+        the owner are skipped. Changes bump the board ``version``.
+        """
+        board = self.get_object()
+        if request.method == "POST":
+            ids = self.member_ids(request)
+            ids.discard(board.created_by_id)
+            board.members.add(*ids)
+            return self.members_changed(board)
+        params = request.query_params
+        limit = page_limit(
+            params, settings.MEMBER_PAGE_SIZE, settings.MEMBER_PAGE_MAX
+        )
+        members = board.members.order_by("id")
+        after = positive_int(params, "after")
+        if after:
+            members = members.filter(id__gt=after)
+        return Response(UserDetailsSerializer(members[:limit], many=True).data)
+
+    @action(detail=True, methods=["post"], url_path="members/remove")
+    def remove_members(self, request, pk=None):
+        """POST /api/boards/{id}/members/remove/ - Remove members.
+
+        Deletes the given memberships in one statement.
+        """
+        board = self.get_object()
+        board.members.remove(*self.member_ids(request))
+        return self.members_changed(board)
+
+    def member_ids(self, request):
+        serializer = BoardMembersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return set(serializer.validated_data["members"])
+
+    def members_changed(self, board):
+        """Bump the board version so stale ``If-Match`` PATCHes fail."""
+        Board.objects.filter(pk=board.pk).update(version=F("version") + 1)
+        board.refresh_from_db(fields=["version"])
+        return Response({
+            "member_count": board.members.count(),
+            "version": board.version,
+        })
+
+    @action(detail=True, methods=["get"])
+    def export(self, request, pk=None):
+        """GET /api/boards/{id}/export/ - Stream the board as NDJSON."""
+        board = self.get_object()
+        response = StreamingHttpResponse(
+            export_board(board), content_type="application/x-ndjson"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="board-{board.pk}.ndjson"'
+        )
+        return response
+
+    @action(detail=True, methods=["post"])
+    def duplicate(self, request, pk=None):
+        """POST /api/boards/{id}/duplicate/ - Copy a board in one go."""
+        board = self.get_object()
+        options = BoardDuplicateSerializer(data=request.data)
+        options.is_valid(raise_exception=True)
+        copy = duplicate_board(board, request.user, **options.validated_data)
+        serializer = BoardListSerializer(copy, context={"request": request})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class BoardTemplateViewSet(ModelViewSet):
+    """The current user's board templates."""
+
+    serializer_class = BoardTemplateSerializer
+    permission_classes = [IsAuthenticated]
+    http_method_names = ["get", "post", "delete"]
+
+    def get_queryset(self):
+        return BoardTemplate.objects.filter(created_by=self.request.user)
+
+    def perform_create(self, serializer):
+        board = serializer.validated_data["board"]
+        if not IsBoardOwnerOrMember().has_object_permission(
+            self.request, self, board
+        ):
+            raise PermissionDenied("You must be a board member.")
+        serializer.save(created_by=self.request.user)
+
+    @action(detail=True, methods=["post"], url_path="create-board")
+    def create_board(self, request, pk=None):
+        """POST /api/board-templates/{id}/create-board/"""
+        template = self.get_object()
+        options = BoardFromTemplateSerializer(data=request.data)
+        options.is_valid(raise_exception=True)
+        board = board_from_template(
+            template, request.user, **options.validated_data
+        )
+        serializer = BoardListSerializer(board, context={"request": request})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -5,3 +5,6 @@ class BoardAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'board_app'
     verbose_name = 'Boards'
+
+    def ready(self):
+        from board_app import monitoring, signals  # noqa: F401
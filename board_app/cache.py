@@ -0,0 +1,38 @@
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY = "board-version:{board_id}"
+# Rendered board detail JSON plus its compressed variants.
+DETAIL_KEY = "board-detail:{board_id}:{version}"
+DETAIL_TTL = 10 * 60
+
+
+def _fresh_version():
+    # Time-based so a version lost to eviction never repeats an old one.
+    return int(time.time() * 1000)
+
+
+def board_cache_version(board_id):
+    """Current cache version of a board; changes on every board write."""
+    key = VERSION_KEY.format(board_id=board_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_board_cache_version(board_id):
+    """Invalidate every cached payload derived from this board."""
+    key = VERSION_KEY.format(board_id=board_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_version(), None)
+
+
+def board_detail_key(board_id):
+    return DETAIL_KEY.format(
+        board_id=board_id, version=board_cache_version(board_id)
+    )
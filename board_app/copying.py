@@ -0,0 +1,114 @@
+"""Set-based board duplication and board templates.
+
+Tasks are read with one ``values()`` query and written back with
+``bulk_create``, so copying a board costs a handful of queries however
+many tasks it has.
+"""
+
+from django.db import transaction
+
+from board_app.models import Board
+from tasks_app.models import Task, TaskStatusTransition
+from tasks_app.ranking import spaced_keys
+from tasks_app.summary import invalidate_summaries
+
+BATCH_SIZE = 500
+# Task columns carried over by a copy; templates drop the people.
+TASK_COPY_FIELDS = (
+    "title",
+    "description",
+    "status",
+    "priority",
+    "assignee_id",
+    "reviewer_id",
+    "due_date",
+    "position",
+)
+TEMPLATE_TASK_FIELDS = (
+    "title",
+    "description",
+    "status",
+    "priority",
+    "position",
+)
+
+
+def task_rows(board, fields=TASK_COPY_FIELDS):
+    """Live tasks of a board as dicts, in column order."""
+    return list(
+        Task.objects.filter(board=board)
+        .order_by("status", "position", "id")
+        .values(*fields)
+    )
+
+
+def insert_tasks(board, rows, created_by, reset_statuses=False):
+    """Bulk insert task rows into ``board`` and log their creation.
+
+    With ``reset_statuses`` every task lands in "to-do", keeping the
+    relative order of the source columns.
+    """
+    if reset_statuses:
+        keys = spaced_keys(len(rows))
+        rows = [
+            {**row, "status": "to-do", "position": key}
+            for row, key in zip(rows, keys)
+        ]
+    tasks = Task.objects.bulk_create(
+        (
+            Task(board=board, created_by=created_by, **row)
+            for row in rows
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    TaskStatusTransition.objects.bulk_create(
+        TaskStatusTransition.initial_for(tasks), batch_size=BATCH_SIZE
+    )
+    invalidate_summaries(
+        user_id
+        for task in tasks
+        for user_id in (task.assignee_id, task.reviewer_id)
+    )
+    return tasks
+
+
+def duplicate_board(
+    board,
+    owner,
+    title=None,
+    include_tasks=True,
+    reset_statuses=False,
+    include_members=True,
+):
+    """Copy ``board`` into a new board owned by ``owner``.
+
+    Without ``include_members`` the copy has no members, so assignees and
+    reviewers are cleared as well. Archived tasks stay with the original
+    board; only live tasks are copied.
+    """
+    with transaction.atomic():
+        copy = Board.objects.create(
+            title=title or f"{board.title} (copy)", created_by=owner
+        )
+        if include_members:
+            member_ids = set(board.members.values_list("id", flat=True))
+            member_ids.add(board.created_by_id)
+            member_ids.discard(owner.pk)
+            copy.members.add(*member_ids)
+        if include_tasks:
+            rows = task_rows(board)
+            if not include_members:
+                for row in rows:
+                    row["assignee_id"] = row["reviewer_id"] = None
+            insert_tasks(copy, rows, owner, reset_statuses)
+    return copy
+
+
+def board_from_template(template, owner, title=None):
+    """Create a board owned by ``owner`` from a stored template."""
+    with transaction.atomic():
+        board = Board.objects.create(
+            title=title or template.title, created_by=owner
+        )
+        insert_tasks(board, template.tasks, owner)
+    return board
@@ -0,0 +1,82 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from board_app.analytics import compute_board_analytics, get_board_analytics
+from board_app.models import Board
+from tasks_app.models import Task, TaskStatusTransition
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway board with --tasks tasks, time the analytics "
+        "computation (cold and cached) and roll everything back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=100_000)
+        parser.add_argument("--assignees", type=int, default=50)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self._run(options["tasks"], options["assignees"])
+            transaction.set_rollback(True)
+
+    def _run(self, task_count, assignee_count):
+        rng = random.Random(42)
+        owner = User.objects.create_user(username="bench-owner@example.com")
+        users = User.objects.bulk_create(
+            User(username=f"bench-{i}@example.com") for i in range(assignee_count)
+        )
+        board = Board.objects.create(title="Benchmark", created_by=owner)
+        now = timezone.now()
+        statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+        priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+
+        start = time.perf_counter()
+        tasks = []
+        for i in range(task_count):
+            tasks.append(Task(
+                title=f"Task {i}",
+                board=board,
+                created_by=owner,
+                status=rng.choice(statuses),
+                priority=rng.choice(priorities),
+                assignee=rng.choice(users + [None]),
+                position=f"{i:08d}",
+            ))
+        Task.objects.bulk_create(tasks, batch_size=2000)
+        transitions = []
+        for task in tasks:
+            created = now - timedelta(days=rng.uniform(0, 90))
+            transitions.append(TaskStatusTransition(
+                task_id=task.pk, board=board, to_status="to-do",
+                changed_at=created,
+            ))
+            if task.status != "to-do":
+                transitions.append(TaskStatusTransition(
+                    task_id=task.pk, board=board, from_status="to-do",
+                    to_status=task.status,
+                    changed_at=created + (now - created) * rng.random(),
+                ))
+        TaskStatusTransition.objects.bulk_create(transitions, batch_size=2000)
+        self.stdout.write(
+            f"seeded {task_count} tasks and {len(transitions)} transitions "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+        start = time.perf_counter()
+        compute_board_analytics(board.pk)
+        cold = time.perf_counter() - start
+        get_board_analytics(board.pk)
+        start = time.perf_counter()
+        get_board_analytics(board.pk)
+        cached = time.perf_counter() - start
+
+        self.stdout.write(f"analytics (uncached): {cold * 1000:.1f} ms")
+        self.stdout.write(f"analytics (cached):   {cached * 1000:.3f} ms")
@@ -0,0 +1,197 @@
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+
+from board_app.models import Board
+from tasks_app.models import Task
+
+LOAD_USER = "loadtest@example.com"
+# Worker classes and the module each one needs.
+PROFILES = {
+    "gthread": "gunicorn",
+    "sync": "gunicorn",
+    "uvicorn": "uvicorn_worker",
+}
+# All load comes from one user, so the endpoint group limits are lifted
+# in the server under test unless --keep-throttles is given.
+UNTHROTTLED_RATES = {
+    "AUTH_RATE": "1000000/min",
+    "BOARD_READ_RATE": "1000000/min",
+    "TASK_WRITE_RATE": "1000000/min",
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a load-test user with boards and tasks, then start gunicorn "
+        "with core.gunicorn_config once per worker profile and report "
+        "throughput and latency of a thread-pool HTTP client. Writes the "
+        "seed data to the configured database and keeps it for reuse. "
+        "Rate limits are lifted in the server unless --keep-throttles is "
+        "given; throttled requests are counted apart from errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profiles", nargs="+", choices=PROFILES, default=list(PROFILES)
+        )
+        parser.add_argument("--workers", type=int, default=None)
+        parser.add_argument("--threads", type=int, default=None)
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--duration", type=float, default=10.0)
+        parser.add_argument("--boards", type=int, default=10)
+        parser.add_argument("--tasks", type=int, default=50)
+        parser.add_argument("--keep-throttles", action="store_true")
+
+    def seed(self, board_count, task_count):
+        user, _ = User.objects.get_or_create(
+            username=LOAD_USER, defaults={"email": LOAD_USER}
+        )
+        token, _ = Token.objects.get_or_create(user=user)
+        boards = list(Board.objects.filter(created_by=user))
+        for number in range(len(boards), board_count):
+            board = Board.objects.create(
+                title=f"Load test {number}", created_by=user
+            )
+            Task.objects.bulk_create(
+                Task(
+                    title=f"Task {index}",
+                    board=board,
+                    created_by=user,
+                    assignee=user if index % 3 == 0 else None,
+                    position=f"{index:08d}",
+                )
+                for index in range(task_count)
+            )
+            boards.append(board)
+        paths = ["/api/boards/", "/api/tasks/assigned-to-me/"]
+        paths += [f"/api/boards/{board.pk}/" for board in boards[:board_count]]
+        return token.key, paths
+
+    def wait_ready(self, url, process):
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError("gunicorn exited during startup.")
+            try:
+                urllib.request.urlopen(url, timeout=1)
+                return
+            except urllib.error.HTTPError:
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError("gunicorn did not start within 30 seconds.")
+
+    def load(self, base, token, paths, concurrency, duration):
+        headers = {"Authorization": f"Token {token}"}
+        stop = time.monotonic() + duration
+
+        def client(offset):
+            latencies, errors, throttled, index = [], 0, 0, offset
+            while time.monotonic() < stop:
+                request = urllib.request.Request(
+                    base + paths[index % len(paths)], headers=headers
+                )
+                index += 1
+                start = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(request, timeout=30) as reply:
+                        reply.read()
+                except urllib.error.HTTPError as error:
+                    if error.code == 429:
+                        throttled += 1
+                    else:
+                        errors += 1
+                    continue
+                except OSError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+            return latencies, errors, throttled
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(client, range(concurrency)))
+        latencies = sorted(
+            latency for values, _, _ in results for latency in values
+        )
+        errors = sum(count for _, count, _ in results)
+        throttled = sum(count for _, _, count in results)
+        return latencies, errors, throttled
+
+    def handle(self, *args, **options):
+        token, paths = self.seed(options["boards"], options["tasks"])
+        for profile in options["profiles"]:
+            if find_spec(PROFILES[profile]) is None:
+                self.stdout.write(
+                    f"{profile}: skipped, {PROFILES[profile]} not installed"
+                )
+                continue
+            port = _free_port()
+            env = {
+                **os.environ,
+                "GUNICORN_PROFILE": profile,
+                "DJANGO_SETTINGS_MODULE": os.environ.get(
+                    "DJANGO_SETTINGS_MODULE", "core.settings"
+                ),
+            }
+            if not options["keep_throttles"]:
+                env.update(UNTHROTTLED_RATES)
+            for option, variable in (
+                ("workers", "GUNICORN_WORKERS"),
+                ("threads", "GUNICORN_THREADS"),
+            ):
+                if options[option]:
+                    env[variable] = str(options[option])
+            process = subprocess.Popen(
+                [
+                    sys.executable, "-m", "gunicorn",
+                    "-c", "python:core.gunicorn_config",
+                    "--bind", f"127.0.0.1:{port}",
+                    "--log-level", "warning",
+                ],
+                cwd=settings.BASE_DIR,
+                env=env,
+            )
+            base = f"http://127.0.0.1:{port}"
+            try:
+                self.wait_ready(base + "/api/boards/", process)
+                latencies, errors, throttled = self.load(
+                    base, token, paths,
+                    options["concurrency"], options["duration"],
+                )
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+            self.report(
+                profile, latencies, errors, throttled, options["duration"]
+            )
+
+    def report(self, profile, latencies, errors, throttled, duration):
+        if not latencies:
+            self.stdout.write(f"{profile}: no successful requests")
+            return
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f"{profile:8} {len(latencies) / duration:8.1f} req/s  "
+            f"p50 {statistics.median(latencies) * 1000:6.1f} ms  "
+            f"p99 {p99 * 1000:6.1f} ms  errors {errors}  "
+            f"throttled {throttled}"
+        )
@@ -0,0 +1,139 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter: builds the WSGI application the way a
+# gunicorn worker does, then serves one request to it.
+CHILD = """
+import json, sys, time
+from wsgiref.util import setup_testing_defaults
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+booted = time.perf_counter()
+environ = {"PATH_INFO": sys.argv[1], "REQUEST_METHOD": "GET"}
+if sys.argv[2]:
+    environ["HTTP_AUTHORIZATION"] = sys.argv[2]
+setup_testing_defaults(environ)
+statuses = []
+b"".join(application(environ, lambda status, headers: statuses.append(status)))
+done = time.perf_counter()
+print(json.dumps({
+    "boot": (booted - start) * 1000,
+    "first_request": (done - booted) * 1000,
+    "status": statuses[0],
+}))
+"""
+PROFILES = {"full": "False", "api": "True"}
+
+
+def parse_importtime(stderr):
+    """Total import time and cumulative time per top-level import, in ms."""
+    total = 0.0
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # the column header
+        total += int(own) / 1000
+        name = name[1:]
+        if not name.startswith(" "):
+            top_level[name] = int(cumulative) / 1000
+    return total, top_level
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker boot: import time, time to a ready WSGI application "
+        "and to the first response, for the full and API-only profiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument(
+            "--profile", choices=[*PROFILES, "both"], default="both"
+        )
+        parser.add_argument("--path", default="/api/boards/")
+        parser.add_argument(
+            "--authorization",
+            default="",
+            help="Authorization header for the first request.",
+        )
+        parser.add_argument("--top", type=int, default=8)
+        parser.add_argument(
+            "--target",
+            type=float,
+            default=20.0,
+            help="Expected %% reduction in time from a ready application "
+            "to the first response (api against full).",
+        )
+
+    def measure(self, profile, options):
+        env = {**os.environ, "API_ONLY": PROFILES[profile]}
+        env.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+        runs = []
+        imports = defaultdict(list)
+        for _ in range(options["runs"]):
+            start = time.perf_counter()
+            child = subprocess.run(
+                [
+                    sys.executable, "-X", "importtime", "-W", "ignore",
+                    "-c", CHILD, options["path"], options["authorization"],
+                ],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            wall = (time.perf_counter() - start) * 1000
+            result = json.loads(child.stdout.splitlines()[-1])
+            total, top_level = parse_importtime(child.stderr)
+            runs.append({**result, "wall": wall, "imports": total})
+            for name, duration in top_level.items():
+                imports[name].append(duration)
+        summary = {
+            key: statistics.median(run[key] for run in runs)
+            for key in ("imports", "boot", "first_request", "wall")
+        }
+        summary["status"] = runs[-1]["status"]
+        summary["slowest"] = sorted(
+            ((statistics.median(times), name) for name, times in imports.items()),
+            reverse=True,
+        )[:options["top"]]
+        return summary
+
+    def handle(self, *args, **options):
+        profiles = (
+            list(PROFILES) if options["profile"] == "both"
+            else [options["profile"]]
+        )
+        results = {}
+        for profile in profiles:
+            result = results[profile] = self.measure(profile, options)
+            self.stdout.write(f"profile {profile} ({result['status']}):")
+            self.stdout.write(f"  imports:          {result['imports']:.0f} ms")
+            self.stdout.write(f"  app ready:        {result['boot']:.0f} ms")
+            self.stdout.write(
+                f"  first response:   {result['first_request']:.0f} ms"
+            )
+            self.stdout.write(f"  process total:    {result['wall']:.0f} ms")
+            self.stdout.write("  slowest top-level imports:")
+            for duration, name in result["slowest"]:
+                self.stdout.write(f"    {duration:7.1f} ms  {name}")
+        if len(results) == 2:
+            full = results["full"]["first_request"]
+            api = results["api"]["first_request"]
+            reduction = 100 * (full - api) / full
+            verdict = "met" if reduction >= options["target"] else "missed"
+            self.stdout.write(
+                f"api vs full: {reduction:.0f}% faster to first response "
+                f"(target {options['target']:.0f}%: {verdict})"
+            )
@@ -0,0 +1,29 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from board_app.models import Board
+from board_app.transfer import export_board
+
+
+class Command(BaseCommand):
+    help = (
+        "Write a board with its members, tasks and comments as NDJSON. "
+        "Archived tasks and their comments are included."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("board_id", type=int)
+        parser.add_argument(
+            "--output", help="File to write (default: standard output)."
+        )
+
+    def handle(self, *args, **options):
+        board = Board.objects.filter(pk=options["board_id"]).first()
+        if board is None:
+            raise CommandError(f"Board {options['board_id']} does not exist.")
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                output.writelines(export_board(board))
+        else:
+            sys.stdout.writelines(export_board(board))
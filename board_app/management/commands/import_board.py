@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from board_app.transfer import BoardImportError, import_board
+
+
+class Command(BaseCommand):
+    help = (
+        "Create a new board from an NDJSON export. The file is streamed and "
+        "written in batches, so large boards import in bounded memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--owner", required=True, help="Email of the new board's owner."
+        )
+        parser.add_argument("--title", help="Override the exported title.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        owner = User.objects.filter(email=options["owner"]).first()
+        if owner is None:
+            raise CommandError(f"No user with email {options['owner']}.")
+        with open(options["path"], encoding="utf-8") as lines:
+            try:
+                board = import_board(
+                    lines,
+                    owner,
+                    title=options["title"],
+                    batch_size=options["batch_size"],
+                )
+            except BoardImportError as exc:
+                raise CommandError(str(exc))
+        self.stdout.write(
+            f"Imported board {board.pk} ({board.tasks.count()} tasks)."
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from board_app.purge import prune_activity
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete board activity buckets older than ACTIVITY_RETENTION_DAYS. "
+        "Meant to run periodically (e.g. daily cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        deleted = prune_activity(batch_size=options["batch_size"])
+        self.stdout.write(f"Pruned {deleted} activity entries.")
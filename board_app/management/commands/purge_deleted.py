@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from board_app.purge import purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        "Physically delete soft-deleted boards and tasks older than the "
+        "restore window. Meant to run periodically (e.g. hourly cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        counts = purge_deleted(batch_size=options["batch_size"])
+        self.stdout.write(
+            "Purged {boards} boards, {tasks} tasks, {comments} comments."
+            .format(**counts)
+        )
@@ -0,0 +1,52 @@
+import glob
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Summarize the query log: the origins and statements with the most "
+        "time spent in slow or duplicated queries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument(
+            "--path",
+            default=settings.QUERY_LOG_PATH,
+            help="Log file; rotated files next to it are read as well.",
+        )
+
+    def handle(self, *args, **options):
+        totals = defaultdict(lambda: {
+            "slow": 0, "duplicate": 0, "queries": 0, "ms": 0.0,
+            "views": set(),
+        })
+        for path in sorted(glob.glob(f"{options['path']}*")):
+            with open(path, encoding="utf-8") as log:
+                for line in log:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    entry = totals[record["origin"], record["sql"]]
+                    entry[record["kind"]] += 1
+                    entry["queries"] += record.get("count", 1)
+                    entry["ms"] += record["ms"]
+                    entry["views"].add(record["view"])
+        if not totals:
+            self.stdout.write("No slow or duplicate queries logged.")
+            return
+        ranked = sorted(
+            totals.items(), key=lambda item: item[1]["ms"], reverse=True
+        )
+        for (origin, sql), entry in ranked[:options["top"]]:
+            self.stdout.write(
+                f"{entry['ms']:10.1f} ms  {entry['queries']:6d} queries  "
+                f"slow={entry['slow']} duplicate={entry['duplicate']}  "
+                f"{origin}  [{', '.join(sorted(entry['views']))}]"
+            )
+            self.stdout.write(f"    {sql[:200]}")
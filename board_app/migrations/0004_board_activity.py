@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-19 08:47
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board_app', '0003_board_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('verb', models.PositiveSmallIntegerField(choices=[(1, 'task_created'), (2, 'task_moved'), (3, 'task_assigned'), (4, 'comment_added')])),
+                ('task_id', models.BigIntegerField(null=True)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('bucket', models.PositiveIntegerField(db_index=True)),
+                ('actor', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('board', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='activity', to='board_app.board')),
+            ],
+            options={
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['board', '-id'], name='activity_board_idx')],
+            },
+        ),
+    ]
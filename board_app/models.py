@@ -1,8 +1,12 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
+from core.concurrency import VersionedModel
+from core.managers import AllObjectsManager, SoftDeleteManager
 
-class Board(models.Model):
+
+class Board(VersionedModel):
     """Kanban board that contains tasks."""
 
     title = models.CharField(max_length=100)
@@ -18,9 +22,84 @@ class Board(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = SoftDeleteManager()
+    all_objects = AllObjectsManager()
 
     class Meta:
         ordering = ["-created_at"]
 
     def __str__(self):
         return self.title
+
+
+class BoardTemplate(models.Model):
+    """Saved board layout used to create new boards."""
+
+    name = models.CharField(max_length=100)
+    title = models.CharField(max_length=100)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="board_templates",
+    )
+    # Task stubs: title, description, status, priority and position.
+    tasks = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return self.name
+
+
+class BoardActivity(models.Model):
+    """Append-only activity feed entry for a board.
+
+    Rows stay compact (small-integer verb, bare ids, no foreign key
+    constraints) and carry the month they belong to as ``bucket``, so
+    old activity is pruned one bucket at a time.
+    """
+
+    TASK_CREATED = 1
+    TASK_MOVED = 2
+    TASK_ASSIGNED = 3
+    COMMENT_ADDED = 4
+    VERB_CHOICES = [
+        (TASK_CREATED, "task_created"),
+        (TASK_MOVED, "task_moved"),
+        (TASK_ASSIGNED, "task_assigned"),
+        (COMMENT_ADDED, "comment_added"),
+    ]
+
+    board = models.ForeignKey(
+        Board,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="activity",
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        related_name="+",
+    )
+    verb = models.PositiveSmallIntegerField(choices=VERB_CHOICES)
+    task_id = models.BigIntegerField(null=True)
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    bucket = models.PositiveIntegerField(db_index=True)
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["board", "-id"], name="activity_board_idx"),
+        ]
+
+    @staticmethod
+    def bucket_for(moment):
+        """Month bucket of a datetime, e.g. ``202610``."""
+        return moment.year * 100 + moment.month
@@ -0,0 +1,68 @@
+"""Background job lag gauges for ``/metrics``.
+
+The cleanup jobs run from cron, so their lag is read from the data: how
+long ago the oldest row they should already have removed became due.
+Each value is one indexed query at scrape time.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from board_app.models import Board, BoardActivity
+from core.metrics import REGISTRY
+from tasks_app.models import Task
+
+
+def _oldest_deleted():
+    stamps = [
+        model.all_objects.filter(deleted_at__isnull=False)
+        .order_by("deleted_at")
+        .values_list("deleted_at", flat=True)
+        .first()
+        for model in (Board, Task)
+    ]
+    stamps = [stamp for stamp in stamps if stamp is not None]
+    return min(stamps) if stamps else None
+
+
+def _lag(oldest, due_before):
+    if oldest is None or oldest >= due_before:
+        return 0
+    return (due_before - oldest).total_seconds()
+
+
+@REGISTRY.collector
+def job_lag():
+    now = timezone.now()
+    purge_due = now - settings.SOFT_DELETE_RESTORE_WINDOW
+    prune_due = now - timedelta(days=settings.ACTIVITY_RETENTION_DAYS)
+    archive_due = now - settings.TASK_ARCHIVE_AFTER
+    oldest_done = (
+        Task.objects.filter(status="done")
+        .order_by("updated_at")
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+    oldest_activity = (
+        BoardActivity.objects.order_by("id")
+        .values_list("created_at", flat=True)
+        .first()
+    )
+    if oldest_activity is not None and (
+        BoardActivity.bucket_for(oldest_activity)
+        >= BoardActivity.bucket_for(prune_due)
+    ):
+        # Buckets are pruned whole; this one is not due yet.
+        oldest_activity = None
+    return [(
+        "kanmind_job_lag_seconds",
+        "Seconds since the oldest row due for a cleanup job became due.",
+        "gauge",
+        [
+            ({"job": "purge_deleted"}, _lag(_oldest_deleted(), purge_due)),
+            ({"job": "prune_activity"}, _lag(oldest_activity, prune_due)),
+            ({"job": "archive_tasks"}, _lag(oldest_done, archive_due)),
+        ],
+    )]
@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from board_app.models import Board, BoardActivity
+from tasks_app.models import (
+    ArchivedComment,
+    ArchivedTask,
+    Comment,
+    Task,
+    TaskStatusTransition,
+)
+
+
+def _delete_in_batches(queryset, batch_size):
+    """Delete rows in short, separately committed chunks."""
+    model = queryset.model
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        model._base_manager.filter(id__in=ids).delete()
+        deleted += len(ids)
+
+
+def purge_deleted(batch_size=1000, now=None):
+    """Physically delete boards and tasks whose restore window has passed.
+
+    Comments go first, then tasks (live and archived), then the board
+    itself, each in batches of ``batch_size`` so no single statement holds
+    locks for long.
+    Returns the number of purged boards, tasks and comments.
+    """
+    cutoff = (now or timezone.now()) - settings.SOFT_DELETE_RESTORE_WINDOW
+    counts = {"boards": 0, "tasks": 0, "comments": 0}
+
+    expired_boards = Board.all_objects.filter(deleted_at__lte=cutoff)
+    for board_id in expired_boards.values_list("id", flat=True):
+        counts["comments"] += _delete_in_batches(
+            Comment.objects.filter(task__board_id=board_id), batch_size
+        )
+        _delete_in_batches(
+            TaskStatusTransition.objects.filter(board_id=board_id), batch_size
+        )
+        _delete_in_batches(
+            BoardActivity.objects.filter(board_id=board_id), batch_size
+        )
+        counts["tasks"] += _delete_in_batches(
+            Task.all_objects.filter(board_id=board_id), batch_size
+        )
+        counts["comments"] += _delete_in_batches(
+            ArchivedComment.objects.filter(task__board_id=board_id),
+            batch_size,
+        )
+        counts["tasks"] += _delete_in_batches(
+            ArchivedTask.objects.filter(board_id=board_id), batch_size
+        )
+        Board.all_objects.filter(id=board_id).delete()
+        counts["boards"] += 1
+
+    expired_tasks = Task.all_objects.filter(deleted_at__lte=cutoff)
+    counts["comments"] += _delete_in_batches(
+        Comment.objects.filter(task__in=expired_tasks), batch_size
+    )
+    _delete_in_batches(
+        TaskStatusTransition.objects.filter(task__in=expired_tasks), batch_size
+    )
+    counts["tasks"] += _delete_in_batches(expired_tasks, batch_size)
+    return counts
+
+
+def prune_activity(batch_size=1000, now=None):
+    """Drop activity buckets that lie entirely outside the retention period.
+
+    Whole months are removed, bucket by bucket, so the deletes walk the
+    bucket index instead of scanning by timestamp. Returns the number of
+    deleted entries.
+    """
+    cutoff = (now or timezone.now()) - timedelta(
+        days=settings.ACTIVITY_RETENTION_DAYS
+    )
+    oldest_kept = BoardActivity.bucket_for(cutoff)
+    expired = (
+        BoardActivity.objects.filter(bucket__lt=oldest_kept)
+        .order_by()
+        .values_list("bucket", flat=True)
+        .distinct()
+    )
+    deleted = 0
+    for bucket in list(expired):
+        deleted += _delete_in_batches(
+            BoardActivity.objects.filter(bucket=bucket), batch_size
+        )
+    return deleted
@@ -0,0 +1,62 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from board_app.cache import bump_board_cache_version
+from board_app.models import Board
+from tasks_app.models import Task
+from tasks_app.summary import invalidate_summaries
+
+# User fields rendered into board detail (user summaries, comment authors).
+RENDERED_USER_FIELDS = {"email", "first_name"}
+
+
+@receiver(post_save, sender=Board)
+def board_changed(sender, instance, created, **kwargs):
+    bump_board_cache_version(instance.pk)
+    if created:
+        invalidate_summaries([instance.created_by_id])
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def board_members_changed(sender, instance, action, pk_set, **kwargs):
+    if not isinstance(instance, Board):
+        return
+    if action == "pre_clear":
+        invalidate_summaries(instance.members.values_list("id", flat=True))
+    elif action in ("post_add", "post_remove"):
+        invalidate_summaries(pk_set)
+    if action.startswith("post_"):
+        bump_board_cache_version(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, update_fields, **kwargs):
+    """Re-render board detail of every board that shows this user."""
+    if created or (
+        update_fields is not None
+        and not RENDERED_USER_FIELDS.intersection(update_fields)
+    ):
+        return
+    board_ids = set(
+        Board.objects.filter(Q(created_by=instance) | Q(members=instance))
+        .values_list("id", flat=True)
+    )
+    board_ids.update(
+        Task.objects.filter(
+            Q(assignee=instance)
+            | Q(reviewer=instance)
+            | Q(comments__author=instance)
+        ).values_list("board_id", flat=True)
+    )
+
+    def bump():
+        for board_id in board_ids:
+            bump_board_cache_version(board_id)
+
+    # Now, and again after the commit in case a concurrent request
+    # rendered the old data in between.
+    bump()
+    transaction.on_commit(bump)
@@ -1,9 +1,27 @@
+import gzip
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 
-from board_app.models import Board
-from tasks_app.models import Task
+from auth_app.users import user_summaries
+from board_app.models import Board, BoardActivity
+from board_app.purge import prune_activity, purge_deleted
+from board_app.transfer import BoardImportError, import_board
+from tasks_app.archive import archive_done_tasks
+from tasks_app.models import Comment, Task, TaskStatusTransition
 
 
 class BoardListTestCase(APITestCase):
@@ -126,6 +144,31 @@ class BoardCreateTestCase(APITestCase):
         self.assertEqual(response.data["owner_id"], self.user.id)
         self.assertEqual(response.data["member_count"], 1)
 
+    def test_create_board_members_checked_in_one_query(self):
+        """Member ids are validated together, not one query per id."""
+        users = User.objects.bulk_create(
+            User(username=f"bulk{i}@test.com") for i in range(30)
+        )
+        counts = []
+        for members in (users[:2], users):
+            data = {"title": "Team", "members": [u.id for u in members]}
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    "/api/boards/", data, format="json"
+                )
+            self.assertEqual(response.status_code, 201)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+        board = Board.objects.get(pk=response.data["id"])
+        self.assertEqual(board.members.count(), 30)
+
+    def test_create_board_unknown_member(self):
+        """Unknown user ids return 400."""
+        data = {"title": "Team", "members": [self.member.id, 99999]}
+        response = self.client.post("/api/boards/", data, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("members", response.data)
+
     def test_create_board_without_members(self):
         """Create board without members returns 201."""
         data = {"title": "Solo Board"}
@@ -147,6 +190,7 @@ class BoardCreateTestCase(APITestCase):
         self.assertEqual(response.status_code, 401)
 
 
+@override_settings(BOARD_DETAIL_CACHE=True)
 class BoardDetailTestCase(APITestCase):
     """Tests for GET /api/boards/{id}/"""
 
@@ -188,13 +232,104 @@ class BoardDetailTestCase(APITestCase):
         """Owner can access board detail with tasks."""
         response = self.client.get(f"/api/boards/{self.board.id}/")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data["title"], "Detail Board")
-        self.assertEqual(len(response.data["members"]), 1)
-        self.assertEqual(len(response.data["tasks"]), 1)
+        self.assertEqual(response.json()["title"], "Detail Board")
+        self.assertEqual(len(response.json()["members"]), 1)
+        self.assertEqual(len(response.json()["tasks"]), 1)
         self.assertEqual(
-            response.data["tasks"][0]["title"], "Task A"
+            response.json()["tasks"][0]["title"], "Task A"
+        )
+
+    def test_user_profile_change_refreshes_cached_detail(self):
+        """Renaming a user re-renders the boards showing them."""
+        Task.objects.create(
+            title="Task B",
+            board=self.board,
+            created_by=self.owner,
+            assignee=self.member,
+        )
+        url = f"/api/boards/{self.board.id}/"
+        self.client.get(url)
+        self.member.first_name = "Renamed"
+        self.member.save()
+        tasks = self.client.get(url).json()["tasks"]
+        assigned = next(task for task in tasks if task["assignee"])
+        self.assertEqual(assigned["assignee"]["fullname"], "Renamed")
+
+    def test_detail_query_count_independent_of_tasks(self):
+        """Task comments are batched instead of queried per task."""
+        url = f"/api/boards/{self.board.id}/"
+        user_summaries([self.member.pk])
+        with CaptureQueriesContext(connection) as single:
+            self.client.get(url)
+        for i in range(5):
+            task = Task.objects.create(
+                title=f"Task {i}",
+                board=self.board,
+                created_by=self.owner,
+                assignee=self.member,
+            )
+            Comment.objects.create(
+                task=task, author=self.member, content="Hi"
+            )
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url)
+        self.assertEqual(len(many), len(single))
+        task = response.json()["tasks"][-1]
+        self.assertEqual(task["comments_count"], 1)
+        self.assertEqual(task["latest_comments"][0]["author"], "Member")
+
+    def test_detail_cached_until_board_changes(self):
+        """Repeated reads reuse the rendered body; writes invalidate it."""
+        url = f"/api/boards/{self.board.id}/"
+        first = self.client.get(url)
+        with CaptureQueriesContext(connection) as cached:
+            second = self.client.get(url)
+        self.assertEqual(second.content, first.content)
+        self.assertFalse(
+            any('"tasks_app_task"' in query["sql"] for query in cached)
+        )
+        Task.objects.create(
+            title="Task B", board=self.board, created_by=self.owner
+        )
+        response = self.client.get(url)
+        self.assertEqual(len(response.json()["tasks"]), 2)
+
+    @override_settings(BOARD_DETAIL_CACHE=False)
+    def test_detail_rendered_per_request_without_shared_cache(self):
+        """Without a shared cache every read renders the board."""
+        url = f"/api/boards/{self.board.id}/"
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as second:
+            self.client.get(url)
+        self.assertTrue(
+            any('"tasks_app_task"' in query["sql"] for query in second)
         )
 
+    @override_settings(COMPRESS_MIN_SIZE=100)
+    def test_detail_compressed_variant_reused(self):
+        """gzip is computed once per board version and then served."""
+        url = f"/api/boards/{self.board.id}/"
+        plain = self.client.get(url)
+        self.assertIn("Accept-Encoding", plain["Vary"])
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        with mock.patch(
+            "core.compression.gzip.compress", wraps=gzip.compress
+        ) as compress:
+            first = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, br")
+            second = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(first["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", first["Vary"])
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(gzip.decompress(first.content), plain.content)
+
+    def test_small_detail_not_compressed(self):
+        """Bodies under COMPRESS_MIN_SIZE are sent as they are."""
+        response = self.client.get(
+            f"/api/boards/{self.board.id}/", HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertFalse(response.has_header("Content-Encoding"))
+
     def test_detail_as_member(self):
         """Member can access board detail."""
         token = Token.objects.create(user=self.member)
@@ -268,6 +403,44 @@ class BoardUpdateTestCase(APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data["members_data"]), 1)
 
+    def test_update_bumps_version(self):
+        """Each applied update increments the version; no-ops do not."""
+        url = f"/api/boards/{self.board.id}/"
+        response = self.client.patch(url, {"title": "V2"}, format="json")
+        self.assertEqual(response.data["version"], 2)
+        self.assertEqual(response["ETag"], '"2"')
+        response = self.client.patch(
+            url, {"title": "V2", "members": [self.member.id]}, format="json"
+        )
+        self.assertEqual(response.data["version"], 2)
+
+    def test_update_with_stale_version(self):
+        """A stale version in the body or If-Match returns 412."""
+        url = f"/api/boards/{self.board.id}/"
+        self.client.patch(url, {"title": "First"}, format="json")
+        response = self.client.patch(
+            url, {"title": "Stale", "version": 1}, format="json"
+        )
+        self.assertEqual(response.status_code, 412)
+        response = self.client.patch(
+            url, {"title": "Stale"}, format="json", HTTP_IF_MATCH='"1"'
+        )
+        self.assertEqual(response.status_code, 412)
+        response = self.client.patch(
+            url, {"title": "Fresh", "version": 2}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.title, "Fresh")
+        self.assertEqual(self.board.version, 3)
+
+    def test_update_non_object_body(self):
+        """A JSON list body is rejected with 400."""
+        response = self.client.patch(
+            f"/api/boards/{self.board.id}/", [{"title": "A"}], format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
     def test_update_as_member(self):
         """Member can update board."""
         token = Token.objects.create(user=self.member)
@@ -281,6 +454,119 @@ class BoardUpdateTestCase(APITestCase):
         self.assertEqual(response.status_code, 200)
 
 
+class BoardMembersTestCase(APITestCase):
+    """Tests for /api/boards/{id}/members/ and the member sample"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner@test.com", email="owner@test.com"
+        )
+        self.users = [
+            User.objects.create_user(
+                username=f"user{i}@test.com", email=f"user{i}@test.com"
+            )
+            for i in range(5)
+        ]
+        self.board = Board.objects.create(title="Big", created_by=self.owner)
+        self.board.members.add(*self.users[:3])
+        self.url = f"/api/boards/{self.board.id}/members/"
+        self.client.force_authenticate(self.owner)
+
+    @override_settings(BOARD_MEMBER_SAMPLE=2)
+    def test_detail_has_count_and_capped_sample(self):
+        """Board detail and PATCH show the count and the first members."""
+        detail = self.client.get(f"/api/boards/{self.board.id}/").json()
+        self.assertEqual(detail["member_count"], 3)
+        self.assertEqual(
+            [member["id"] for member in detail["members"]],
+            [user.id for user in self.users[:2]],
+        )
+        response = self.client.patch(
+            f"/api/boards/{self.board.id}/", {"title": "Renamed"}
+        )
+        self.assertEqual(response.data["member_count"], 3)
+        self.assertEqual(len(response.data["members_data"]), 2)
+
+    def test_list_paged_by_id(self):
+        """Members come in id order; ``after`` continues the list."""
+        response = self.client.get(self.url, {"limit": 2})
+        ids = [member["id"] for member in response.data]
+        self.assertEqual(ids, [user.id for user in self.users[:2]])
+        response = self.client.get(self.url, {"limit": 2, "after": ids[-1]})
+        self.assertEqual(
+            [member["id"] for member in response.data], [self.users[2].id]
+        )
+
+    def test_add_members(self):
+        """New members are inserted together; owner and members skipped."""
+        ids = [self.owner.id, self.users[0].id, self.users[3].id,
+               self.users[4].id]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.url, {"members": ids}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["member_count"], 5)
+        inserts = [
+            query for query in queries
+            if query["sql"].startswith("INSERT")
+            and '"board_app_board_members"' in query["sql"]
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertFalse(
+            self.board.members.filter(pk=self.owner.pk).exists()
+        )
+
+    def test_remove_members(self):
+        """Removal deletes only the given memberships."""
+        response = self.client.post(
+            f"{self.url}remove/",
+            {"members": [self.users[0].id, self.users[1].id]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["member_count"], 1)
+        self.assertEqual(list(self.board.members.all()), [self.users[2]])
+
+    def test_member_changes_bump_version(self):
+        """A PATCH based on the version before a member change fails."""
+        stale = Board.objects.get(pk=self.board.pk).version
+        response = self.client.post(
+            self.url, {"members": [self.users[3].id]}, format="json"
+        )
+        self.assertEqual(response.data["version"], stale + 1)
+        response = self.client.post(
+            f"{self.url}remove/",
+            {"members": [self.users[0].id]},
+            format="json",
+        )
+        self.assertEqual(response.data["version"], stale + 2)
+        response = self.client.patch(
+            f"/api/boards/{self.board.id}/",
+            {"members": [self.users[1].id]},
+            format="json",
+            HTTP_IF_MATCH=f'"{stale}"',
+        )
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(self.board.members.count(), 3)
+
+    def test_unknown_user_rejected(self):
+        """Ids of users that do not exist return 400."""
+        response = self.client.post(
+            self.url, {"members": [99999]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_outsider_forbidden(self):
+        """Non-members can neither list nor change members."""
+        self.client.force_authenticate(self.users[4])
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        response = self.client.post(
+            self.url, {"members": [self.users[4].id]}, format="json"
+        )
+        self.assertEqual(response.status_code, 403)
+
+
 class BoardDeleteTestCase(APITestCase):
     """Tests for DELETE /api/boards/{id}/"""
 
@@ -324,3 +610,524 @@ class BoardDeleteTestCase(APITestCase):
         self.client.credentials()
         response = self.client.delete(f"/api/boards/{self.board.id}/")
         self.assertEqual(response.status_code, 401)
+
+
+class BoardSoftDeleteTestCase(APITestCase):
+    """Tests for soft delete, restore and purge of boards."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner@test.com",
+            email="owner@test.com",
+            password="testpass123",
+        )
+        self.board = Board.objects.create(
+            title="Soft", created_by=self.owner
+        )
+        self.task = Task.objects.create(
+            title="Task", board=self.board, created_by=self.owner,
+            assignee=self.owner,
+        )
+        Comment.objects.create(
+            task=self.task, author=self.owner, content="Hi"
+        )
+        self.token = Token.objects.create(user=self.owner)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + self.token.key
+        )
+
+    def test_delete_hides_board_and_tasks(self):
+        """Deleted boards and their tasks vanish but rows remain."""
+        response = self.client.delete(f"/api/boards/{self.board.id}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertTrue(Board.all_objects.filter(id=self.board.id).exists())
+        self.assertFalse(Task.objects.filter(id=self.task.id).exists())
+        response = self.client.get("/api/tasks/assigned-to-me/")
+        self.assertEqual(len(response.data), 0)
+        response = self.client.get(f"/api/boards/{self.board.id}/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_restore_within_window(self):
+        """Owner can restore a deleted board with its tasks."""
+        self.client.delete(f"/api/boards/{self.board.id}/")
+        response = self.client.post(f"/api/boards/{self.board.id}/restore/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Task.objects.filter(id=self.task.id).exists())
+
+    def test_restore_after_window(self):
+        """Boards past the restore window cannot be restored."""
+        Board.objects.filter(id=self.board.id).update(
+            deleted_at=timezone.now() - timedelta(days=30)
+        )
+        response = self.client.post(f"/api/boards/{self.board.id}/restore/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_purge_removes_expired_boards(self):
+        """Purge deletes expired boards with tasks and comments."""
+        self.client.delete(f"/api/boards/{self.board.id}/")
+        self.assertEqual(purge_deleted()["boards"], 0)
+        later = timezone.now() + timedelta(days=30)
+        counts = purge_deleted(batch_size=1, now=later)
+        self.assertEqual(
+            counts, {"boards": 1, "tasks": 1, "comments": 1}
+        )
+        self.assertFalse(Board.all_objects.filter(id=self.board.id).exists())
+        self.assertFalse(Comment.objects.exists())
+
+
+class BoardAnalyticsTestCase(APITestCase):
+    """Tests for GET /api/boards/{id}/analytics/"""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            username="owner@test.com",
+            email="owner@test.com",
+            password="testpass123",
+        )
+        self.outsider = User.objects.create_user(
+            username="outsider@test.com",
+            email="outsider@test.com",
+            password="testpass123",
+        )
+        self.board = Board.objects.create(
+            title="Stats", created_by=self.owner
+        )
+        for status, priority in [("to-do", "urgent"), ("to-do", "low"),
+                                 ("done", "high")]:
+            Task.objects.create(
+                title=status, board=self.board, created_by=self.owner,
+                status=status, priority=priority, assignee=self.owner,
+            )
+        self.token = Token.objects.create(user=self.owner)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + self.token.key
+        )
+        self.url = f"/api/boards/{self.board.id}/analytics/"
+
+    def test_analytics_payload(self):
+        """Analytics aggregates cycle time, throughput, ages and load."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["task_count"], 3)
+        self.assertEqual(response.data["cycle_time"]["count"], 1)
+        self.assertEqual(len(response.data["throughput_per_week"]), 12)
+        self.assertEqual(response.data["throughput_per_week"][-1]["count"], 1)
+        self.assertEqual(
+            sum(b["count"] for b in response.data["status_age"]["to-do"]), 2
+        )
+        self.assertEqual(response.data["assignee_load"], [
+            {"assignee_id": self.owner.id, "open_tasks": 2,
+             "urgent_tasks": 1},
+        ])
+
+    def test_analytics_cached_until_board_changes(self):
+        """Results are cached and refreshed after a task write."""
+        self.client.get(self.url)
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+        Task.objects.create(
+            title="New", board=self.board, created_by=self.owner
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["task_count"], 4)
+
+    def test_analytics_as_outsider(self):
+        """Non-members get 403."""
+        token = Token.objects.create(user=self.outsider)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+
+class BoardActivityTestCase(APITestCase):
+    """Tests for GET /api/boards/{id}/activity/"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner@test.com",
+            email="owner@test.com",
+            password="testpass123",
+            first_name="Owner",
+        )
+        self.member = User.objects.create_user(
+            username="member@test.com",
+            email="member@test.com",
+            password="testpass123",
+        )
+        self.board = Board.objects.create(
+            title="Feed", created_by=self.owner
+        )
+        self.board.members.add(self.member)
+        self.token = Token.objects.create(user=self.owner)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + self.token.key
+        )
+        self.url = f"/api/boards/{self.board.id}/activity/"
+
+    def create_task(self, title="Task"):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/tasks/",
+                {"board": self.board.id, "title": title},
+                format="json",
+            )
+        return response.data["id"]
+
+    def test_feed_records_task_and_comment_events(self):
+        """Create, move, assign and comment show up newest first."""
+        task_id = self.create_task()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"/api/tasks/{task_id}/",
+                {"status": "review", "assignee_id": self.member.id},
+                format="json",
+            )
+            self.client.post(
+                f"/api/tasks/{task_id}/comments/",
+                {"content": "Looks good"},
+                format="json",
+            )
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [entry["verb"] for entry in response.data],
+            ["comment_added", "task_assigned", "task_moved", "task_created"],
+        )
+        moved = response.data[2]
+        self.assertEqual(moved["data"], {"from": "to-do", "to": "review"})
+        self.assertEqual(moved["task_id"], task_id)
+        self.assertEqual(moved["actor"]["fullname"], "Owner")
+
+    def test_events_of_one_request_are_inserted_together(self):
+        """A PATCH producing two events writes them in one INSERT."""
+        task_id = self.create_task()
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.patch(
+                    f"/api/tasks/{task_id}/",
+                    {"status": "done", "assignee_id": self.member.id},
+                    format="json",
+                )
+        inserts = [
+            q["sql"] for q in queries
+            if q["sql"].startswith('INSERT INTO "board_app_boardactivity"')
+        ]
+        self.assertEqual(len(inserts), 1)
+
+    def test_keyset_pagination(self):
+        """before returns the entries older than the given id."""
+        for i in range(5):
+            self.create_task(f"Task {i}")
+        first = self.client.get(self.url, {"limit": 2}).data
+        self.assertEqual(
+            [entry["data"]["title"] for entry in first],
+            ["Task 4", "Task 3"],
+        )
+        second = self.client.get(
+            self.url, {"limit": 2, "before": first[-1]["id"]}
+        ).data
+        self.assertEqual(
+            [entry["data"]["title"] for entry in second],
+            ["Task 2", "Task 1"],
+        )
+
+    def test_activity_as_outsider(self):
+        """Non-members get 403."""
+        outsider = User.objects.create_user(
+            username="outsider@test.com",
+            email="outsider@test.com",
+            password="testpass123",
+        )
+        token = Token.objects.create(user=outsider)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_prune_drops_expired_buckets(self):
+        """Buckets older than the retention period are deleted."""
+        old = timezone.now() - timedelta(days=200)
+        for moment in [old, timezone.now()]:
+            BoardActivity.objects.create(
+                board=self.board,
+                verb=BoardActivity.TASK_CREATED,
+                created_at=moment,
+                bucket=BoardActivity.bucket_for(moment),
+            )
+        self.assertEqual(prune_activity(), 1)
+        self.assertEqual(BoardActivity.objects.count(), 1)
+
+
+class BoardTransferTestCase(APITestCase):
+    """Tests for board export (GET /api/boards/{id}/export/) and import."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner@test.com",
+            email="owner@test.com",
+            password="testpass123",
+        )
+        self.member = User.objects.create_user(
+            username="member@test.com",
+            email="member@test.com",
+            password="testpass123",
+        )
+        self.board = Board.objects.create(
+            title="Source", created_by=self.owner
+        )
+        self.board.members.add(self.member)
+        self.task = Task.objects.create(
+            title="Ship it",
+            board=self.board,
+            created_by=self.owner,
+            status="review",
+            assignee=self.member,
+        )
+        self.old_comment = Comment.objects.create(
+            task=self.task, author=self.member, content="Done?"
+        )
+        Comment.objects.filter(pk=self.old_comment.pk).update(
+            created_at=timezone.now() - timedelta(days=30)
+        )
+        self.token = Token.objects.create(user=self.owner)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + self.token.key
+        )
+
+    def export_lines(self):
+        response = self.client.get(f"/api/boards/{self.board.id}/export/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        return b"".join(response.streaming_content).decode().splitlines()
+
+    def test_export_streams_records(self):
+        """The export lists the board, members, tasks and comments."""
+        records = [json.loads(line) for line in self.export_lines()]
+        self.assertEqual(
+            [record["type"] for record in records],
+            ["board", "member", "task", "comment"],
+        )
+        self.assertEqual(records[2]["assignee"], "member@test.com")
+        self.assertEqual(records[3]["task"], self.task.id)
+
+    def test_export_as_outsider(self):
+        """Non-members cannot export a board."""
+        outsider = User.objects.create_user(
+            username="outsider@test.com",
+            email="outsider@test.com",
+            password="testpass123",
+        )
+        token = Token.objects.create(user=outsider)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+        response = self.client.get(f"/api/boards/{self.board.id}/export/")
+        self.assertEqual(response.status_code, 403)
+
+    def test_import_round_trip(self):
+        """An import recreates tasks and comments under new ids."""
+        lines = self.export_lines()
+        with CaptureQueriesContext(connection) as queries:
+            board = import_board(lines, self.member, batch_size=1)
+        self.assertFalse(
+            [q for q in queries if q["sql"].startswith("UPDATE")]
+        )
+        self.assertNotEqual(board.pk, self.board.pk)
+        self.assertEqual(board.created_by, self.member)
+        self.assertEqual(list(board.members.all()), [self.member])
+        task = board.tasks.get()
+        self.assertNotEqual(task.pk, self.task.pk)
+        self.assertEqual(task.status, "review")
+        self.assertEqual(task.assignee, self.member)
+        self.assertEqual(task.created_at, self.task.created_at)
+        comment = task.comments.get()
+        self.assertEqual(comment.content, "Done?")
+        self.assertEqual(
+            comment.created_at,
+            Comment.objects.get(pk=self.old_comment.pk).created_at,
+        )
+        self.assertEqual(task.status_transitions.count(), 1)
+
+    def test_archived_tasks_exported_and_imported(self):
+        """Archived tasks and comments travel as done tasks."""
+        self.task.status = "done"
+        self.task.save()
+        archive_done_tasks(now=timezone.now() + timedelta(days=31))
+        records = [json.loads(line) for line in self.export_lines()]
+        self.assertEqual(
+            [record["type"] for record in records],
+            ["board", "member", "task", "comment"],
+        )
+        self.assertTrue(records[2]["archived"])
+        board = import_board(
+            [json.dumps(record) for record in records], self.owner
+        )
+        task = board.tasks.get()
+        self.assertEqual(task.status, "done")
+        self.assertEqual(task.comments.get().content, "Done?")
+
+    def test_import_unknown_users_fall_back_to_owner(self):
+        """Missing users are replaced by the importing owner."""
+        lines = self.export_lines()
+        self.member.delete()
+        board = import_board(lines, self.owner)
+        task = board.tasks.get()
+        self.assertIsNone(task.assignee)
+        self.assertEqual(task.comments.get().author, self.owner)
+        self.assertEqual(board.members.count(), 0)
+
+    def test_import_rejects_other_files(self):
+        """A file that is not an export raises BoardImportError."""
+        with self.assertRaises(BoardImportError):
+            import_board(['{"type": "task"}'], self.owner)
+        with self.assertRaises(BoardImportError):
+            import_board(["not json"], self.owner)
+
+    def test_commands_round_trip(self):
+        """export_board and import_board work through a file."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "board.ndjson")
+            call_command("export_board", self.board.id, output=path)
+            call_command(
+                "import_board", path, owner="owner@test.com",
+                title="Copy", stdout=StringIO(),
+            )
+        copy = Board.objects.get(title="Copy")
+        self.assertEqual(copy.tasks.count(), 1)
+
+
+class BoardDuplicateTestCase(APITestCase):
+    """Tests for board duplication and templates."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner@test.com",
+            email="owner@test.com",
+            password="testpass123",
+        )
+        self.member = User.objects.create_user(
+            username="member@test.com",
+            email="member@test.com",
+            password="testpass123",
+        )
+        self.board = Board.objects.create(
+            title="Sprint 1", created_by=self.owner
+        )
+        self.board.members.add(self.member)
+        for i, status in enumerate(["done", "to-do", "review", "to-do"]):
+            Task.objects.create(
+                title=f"Task {i}",
+                board=self.board,
+                created_by=self.owner,
+                status=status,
+                assignee=self.member,
+            )
+        self.token = Token.objects.create(user=self.member)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + self.token.key
+        )
+        self.url = f"/api/boards/{self.board.id}/duplicate/"
+
+    def test_duplicate_copies_tasks_and_members(self):
+        """A member's copy keeps tasks, statuses and the other people."""
+        response = self.client.post(
+            self.url, {"title": "Sprint 2"}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        copy = Board.objects.get(pk=response.data["id"])
+        self.assertEqual(copy.title, "Sprint 2")
+        self.assertEqual(copy.created_by, self.member)
+        self.assertEqual(list(copy.members.all()), [self.owner])
+        self.assertEqual(
+            sorted(copy.tasks.values_list("status", flat=True)),
+            ["done", "review", "to-do", "to-do"],
+        )
+        self.assertEqual(
+            copy.tasks.filter(assignee=self.member).count(), 4
+        )
+        self.assertEqual(
+            TaskStatusTransition.objects.filter(board=copy).count(), 4
+        )
+
+    def test_duplicate_options(self):
+        """Statuses reset to to-do and members are dropped on request."""
+        response = self.client.post(
+            self.url,
+            {"reset_statuses": True, "include_members": False},
+            format="json",
+        )
+        copy = Board.objects.get(pk=response.data["id"])
+        self.assertEqual(copy.title, "Sprint 1 (copy)")
+        self.assertEqual(copy.members.count(), 0)
+        tasks = list(copy.tasks.order_by("position"))
+        self.assertEqual({task.status for task in tasks}, {"to-do"})
+        self.assertEqual(len({task.position for task in tasks}), 4)
+        self.assertIsNone(tasks[0].assignee_id)
+
+    def test_duplicate_without_tasks(self):
+        """include_tasks=false copies only the board."""
+        response = self.client.post(
+            self.url, {"include_tasks": False}, format="json"
+        )
+        self.assertEqual(response.data["ticket_count"], 0)
+
+    def test_duplicate_query_count_is_constant(self):
+        """Copying 200 tasks costs a few insert batches more than 4."""
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, format="json")
+        Task.objects.bulk_create(
+            Task(
+                title=f"Bulk {i}", board=self.board,
+                created_by=self.owner, position=f"z{i:03d}",
+            )
+            for i in range(196)
+        )
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post(self.url, format="json")
+        copy = Board.objects.get(pk=response.data["id"])
+        self.assertEqual(copy.tasks.count(), 200)
+        self.assertLessEqual(len(large), len(small) + 5)
+
+    def test_duplicate_as_outsider(self):
+        """Non-members cannot duplicate a board."""
+        outsider = User.objects.create_user(
+            username="outsider@test.com",
+            email="outsider@test.com",
+            password="testpass123",
+        )
+        token = Token.objects.create(user=outsider)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+        response = self.client.post(self.url, format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_template_round_trip(self):
+        """A template saved from a board creates boards with its tasks."""
+        response = self.client.post(
+            "/api/board-templates/",
+            {"board": self.board.id, "name": "Sprint"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["task_count"], 4)
+        template_id = response.data["id"]
+        self.assertEqual(
+            len(self.client.get("/api/board-templates/").data), 1
+        )
+        response = self.client.post(
+            f"/api/board-templates/{template_id}/create-board/",
+            {"title": "Sprint 3"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        board = Board.objects.get(pk=response.data["id"])
+        self.assertEqual(board.title, "Sprint 3")
+        self.assertEqual(board.tasks.count(), 4)
+        self.assertFalse(board.tasks.exclude(assignee=None).exists())
+
+    def test_template_from_foreign_board(self):
+        """Templates can only be made from boards the user belongs to."""
+        other = Board.objects.create(title="Other", created_by=self.owner)
+        response = self.client.post(
+            "/api/board-templates/",
+            {"board": other.id, "name": "Nope"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
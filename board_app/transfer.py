@@ -0,0 +1,267 @@
+"""Board export and import as newline-delimited JSON.
+
+An export is one JSON object per line: the board, then its members,
+tasks and comments, each tagged with ``type``. Archived tasks and their
+comments are included as done tasks marked ``"archived": true``. Users
+are referenced by email and tasks by their id in the source database,
+so a file can be imported into another installation. Both directions
+stream: the export reads rows through ``iterator()`` (server-side
+cursors where the database supports them) and the import buffers at
+most one batch, plus an old-to-new id map of the tasks.
+"""
+
+import json
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from board_app.models import Board
+from tasks_app.models import (
+    ArchivedComment,
+    ArchivedTask,
+    Comment,
+    Task,
+    TaskStatusTransition,
+)
+
+FORMAT_VERSION = 1
+CHUNK_SIZE = 2000
+
+TASK_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "status": "status",
+    "priority": "priority",
+    "created_by": "created_by__email",
+    "assignee": "assignee__email",
+    "reviewer": "reviewer__email",
+    "due_date": "due_date",
+    "position": "position",
+    "created_at": "created_at",
+}
+ARCHIVED_TASK_FIELDS = {
+    field: path for field, path in TASK_FIELDS.items()
+    if field not in ("status", "position")
+}
+COMMENT_FIELDS = {
+    "task": "task_id",
+    "author": "author__email",
+    "content": "content",
+    "created_at": "created_at",
+}
+
+
+class BoardImportError(Exception):
+    """Raised for files that are not a board export."""
+
+
+class _Encoder(DjangoJSONEncoder):
+    """Keeps full microsecond precision on timestamps."""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _line(record):
+    return json.dumps(record, cls=_Encoder) + "\n"
+
+
+def _rows(queryset, fields):
+    rows = queryset.order_by("id").values_list(*fields.values())
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield dict(zip(fields, row))
+
+
+def export_board(board):
+    """Yield the NDJSON lines of a board export."""
+    yield _line({
+        "type": "board",
+        "format": FORMAT_VERSION,
+        "title": board.title,
+        "owner": board.created_by.email,
+        "created_at": board.created_at,
+    })
+    members = board.members.order_by("id").values_list("email", flat=True)
+    for email in members.iterator():
+        yield _line({"type": "member", "email": email})
+    for row in _rows(Task.objects.filter(board=board), TASK_FIELDS):
+        yield _line({"type": "task", **row})
+    archived = ArchivedTask.objects.filter(board=board)
+    for row in _rows(archived, ARCHIVED_TASK_FIELDS):
+        yield _line({
+            "type": "task", **row,
+            "status": "done", "position": "", "archived": True,
+        })
+    comments = Comment.objects.filter(
+        task__board=board, task__deleted_at__isnull=True
+    )
+    for row in _rows(comments, COMMENT_FIELDS):
+        yield _line({"type": "comment", **row})
+    archived_comments = ArchivedComment.objects.filter(task__board=board)
+    for row in _rows(archived_comments, COMMENT_FIELDS):
+        yield _line({"type": "comment", **row})
+
+
+class _UserLookup:
+    """Email to user id, resolved lazily and cached for the import."""
+
+    def __init__(self, fallback_id):
+        self.fallback_id = fallback_id
+        self.ids = {}
+
+    def preload(self, emails):
+        missing = [email for email in emails if email not in self.ids]
+        found = dict(
+            User.objects.filter(email__in=missing).values_list("email", "id")
+        )
+        for email in missing:
+            self.ids[email] = found.get(email)
+
+    def get(self, email, required=False):
+        if email is None:
+            return self.fallback_id if required else None
+        if email not in self.ids:
+            self.preload([email])
+        user_id = self.ids[email]
+        if user_id is None and required:
+            return self.fallback_id
+        return user_id
+
+
+def _timestamp(value):
+    return (value and parse_datetime(value)) or timezone.now()
+
+
+class _Importer:
+    """Buffers export records and writes them in batches."""
+
+    def __init__(self, owner, title, batch_size):
+        self.owner = owner
+        self.title = title
+        self.batch_size = batch_size
+        self.users = _UserLookup(owner.pk)
+        self.board = None
+        self.members = []
+        self.tasks = []
+        self.comments = []
+        # Exported ids of the buffered tasks, in the same order.
+        self.old_task_ids = []
+        # Exported to new id of every task so far, for the comments: the
+        # one structure that grows with the board (~100 bytes per task).
+        self.task_ids = {}
+
+    def add(self, record):
+        kind = record["type"]
+        if self.board is None:
+            if kind != "board" or record.get("format") != FORMAT_VERSION:
+                raise BoardImportError("File does not start with a board.")
+            self.board = Board.objects.create(
+                title=self.title or record["title"], created_by=self.owner
+            )
+        elif kind == "member":
+            self.members.append(record["email"])
+        elif kind == "task":
+            self.flush_members()
+            self.add_task(record)
+        elif kind == "comment":
+            self.flush_tasks()
+            self.add_comment(record)
+
+    def add_task(self, record):
+        users = self.users
+        self.tasks.append(Task(
+            board=self.board,
+            title=record["title"],
+            description=record["description"],
+            status=record["status"],
+            priority=record["priority"],
+            created_by_id=users.get(record["created_by"], required=True),
+            assignee_id=users.get(record["assignee"]),
+            reviewer_id=users.get(record["reviewer"]),
+            due_date=record["due_date"],
+            position=record["position"],
+            created_at=_timestamp(record["created_at"]),
+        ))
+        self.old_task_ids.append(record["id"])
+        if len(self.tasks) >= self.batch_size:
+            self.flush_tasks()
+
+    def add_comment(self, record):
+        task_id = self.task_ids.get(record["task"])
+        if task_id is None:
+            return
+        self.comments.append(Comment(
+            task_id=task_id,
+            author_id=self.users.get(record["author"], required=True),
+            content=record["content"],
+            created_at=_timestamp(record["created_at"]),
+        ))
+        if len(self.comments) >= self.batch_size:
+            self.flush_comments()
+
+    def flush_members(self):
+        if self.members:
+            self.users.preload(self.members)
+            ids = [self.users.get(email) for email in self.members]
+            self.board.members.add(*[pk for pk in ids if pk is not None])
+            self.members = []
+
+    def flush_tasks(self):
+        if not self.tasks:
+            return
+        Task.objects.bulk_create(self.tasks)
+        TaskStatusTransition.objects.bulk_create(
+            TaskStatusTransition.initial_for(self.tasks)
+        )
+        for task, old_id in zip(self.tasks, self.old_task_ids):
+            self.task_ids[old_id] = task.pk
+        self.tasks, self.old_task_ids = [], []
+
+    def flush_comments(self):
+        if not self.comments:
+            return
+        Comment.objects.bulk_create(self.comments)
+        self.comments = []
+
+    def finish(self):
+        if self.board is None:
+            raise BoardImportError("File is empty.")
+        self.flush_members()
+        self.flush_tasks()
+        self.flush_comments()
+        return self.board
+
+
+def import_board(lines, owner, title=None, batch_size=1000):
+    """Create a new board owned by ``owner`` from export lines.
+
+    Tasks get new ids; comments are re-pointed through an old-to-new id
+    map. Archived tasks come back as done tasks, which ``archive_tasks``
+    archives again once they are old enough. Users that do not exist
+    here are dropped from memberships and assignments, and replaced by
+    ``owner`` as task creator or comment author. The import runs in one
+    transaction. Returns the new board.
+    """
+    importer = _Importer(owner, title, batch_size)
+    with transaction.atomic():
+        for number, raw in enumerate(lines, start=1):
+            if isinstance(raw, bytes):
+                raw = raw.decode("utf-8")
+            if not raw.strip():
+                continue
+            try:
+                record = json.loads(raw)
+                record["type"]
+            except (ValueError, KeyError, TypeError):
+                raise BoardImportError(
+                    f"Line {number} is not an export record."
+                )
+            importer.add(record)
+        return importer.finish()
@@ -0,0 +1,64 @@
+"""Compression of JSON responses.
+
+``core.middleware.CompressionMiddleware`` compresses JSON bodies of at
+least ``COMPRESS_MIN_SIZE`` bytes with the best encoding the client
+accepts: brotli when the optional ``brotli`` package is installed, else
+gzip. Views that cache their rendered body can keep compressed copies next to
+it (see ``add_variant``) and hand them over as
+``response.compressed_variants``, so cache hits skip compression too.
+"""
+
+import gzip
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# In order of preference.
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def accepted_encoding(request):
+    """Preferred encoding allowed by ``Accept-Encoding``, or ``None``."""
+    header = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip().lower())
+    for encoding in ENCODINGS:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    # mtime=0 keeps the output identical for identical bodies.
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def add_variant(variants, body, request):
+    """Add the encoding ``request`` accepts to ``variants`` if missing.
+
+    Returns whether ``variants`` changed and should be stored again.
+    """
+    encoding = accepted_encoding(request)
+    if (
+        encoding is None
+        or encoding in variants
+        or len(body) < settings.COMPRESS_MIN_SIZE
+    ):
+        return False
+    variants[encoding] = compress(body, encoding)
+    return True
+
@@ -0,0 +1,91 @@
+"""Gunicorn settings; run with ``gunicorn -c python:core.gunicorn_config``.
+
+``GUNICORN_PROFILE`` picks the worker model:
+
+- ``gthread`` (default): a few processes with a thread pool each. Best
+  fit for this I/O-bound API; threads share one copy of the app.
+- ``sync``: one request per process, ``2 * cores + 1`` processes.
+- ``uvicorn``: the ASGI application on uvicorn workers (needs the
+  ``uvicorn-worker`` package). Only pays off once views go async.
+
+The app is preloaded in the master so workers share its memory
+copy-on-write, and workers are recycled after a jittered number of
+requests so they do not all restart at once. ``bench_server`` compares
+the profiles against seeded data.
+"""
+
+import os
+
+from django.db import connections
+
+from core.metrics import REGISTRY
+
+PROFILE = os.environ.get("GUNICORN_PROFILE", "gthread")
+CORES = os.cpu_count() or 1
+
+_PROFILES = {
+    "gthread": {
+        "worker_class": "gthread",
+        "workers": CORES,
+        "threads": 4,
+    },
+    "sync": {
+        "worker_class": "sync",
+        "workers": 2 * CORES + 1,
+        "threads": 1,
+    },
+    "uvicorn": {
+        "worker_class": "uvicorn_worker.UvicornWorker",
+        "workers": CORES,
+        "threads": 1,
+    },
+}
+_profile = _PROFILES[PROFILE]
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = _profile["worker_class"]
+workers = int(os.environ.get("GUNICORN_WORKERS", _profile["workers"]))
+threads = int(os.environ.get("GUNICORN_THREADS", _profile["threads"]))
+# Split the cores between the workers for password hashing, so all
+# workers together run about one hash per core rather than one per core
+# each. Read by the settings, which the preloaded app imports after this
+# file.
+os.environ.setdefault("LOGIN_HASH_WORKERS", str(max(1, CORES // workers)))
+wsgi_app = (
+    "core.asgi:application" if PROFILE == "uvicorn"
+    else "core.wsgi:application"
+)
+
+preload_app = True
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+# Heartbeat files on tmpfs, so a slow disk cannot get workers killed.
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG") or None
+
+
+def on_starting(server):
+    """Drop metric files of the previous deployment's workers."""
+    directory = os.environ.get("METRICS_DIR")
+    if directory and os.path.isdir(directory):
+        for entry in os.scandir(directory):
+            if entry.name.endswith(".json"):
+                os.remove(entry.path)
+
+
+def child_exit(server, worker):
+    """Fold an exited worker's metric file into the totals, so recycled
+    workers do not pile up files between deploys."""
+    directory = os.environ.get("METRICS_DIR")
+    if directory and os.path.isdir(directory):
+        REGISTRY.absorb(directory, worker.pid)
+
+
+def pre_fork(server, worker):
+    """Never hand a database connection opened while preloading to a
+    worker: forked processes sharing one socket corrupt each other's
+    sessions. Workers open their own on first use."""
+    connections.close_all()
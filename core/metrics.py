@@ -0,0 +1,295 @@
+"""In-process metrics exported in the Prometheus text format.
+
+Counters and histograms are plain dicts guarded by a lock, so recording
+a value costs a dict update. With ``METRICS_DIR`` set, every process
+dumps its values to its own JSON file in that directory at most every
+``METRICS_FLUSH_INTERVAL`` seconds (and on exit); the ``/metrics`` view
+adds up all files, so the totals cover every gunicorn worker. When a
+worker exits, the gunicorn master folds its file into ``exited.json``,
+so recycled workers keep counting without leaving a file each behind.
+Clear the directory on deploy.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+# Totals of exited processes, plus the names of the files folded in.
+EXITED_FILE = "exited.json"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+_lock = threading.Lock()
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+        self.pid = None
+        self.file_name = None
+        self.last_flush = 0.0
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def collector(self, func):
+        """Register ``func() -> [(name, help, type, samples)]``.
+
+        ``samples`` is a list of ``(labels, value)``. Collectors compute
+        gauges when ``/metrics`` is scraped.
+        """
+        self.collectors.append(func)
+        return func
+
+    def snapshot(self):
+        with _lock:
+            return {
+                name: metric.dump() for name, metric in self.metrics.items()
+            }
+
+    def maybe_flush(self):
+        """Write this process's values if the flush interval has passed."""
+        now = time.monotonic()
+        interval = settings.METRICS_FLUSH_INTERVAL
+        if not settings.METRICS_DIR or now - self.last_flush < interval:
+            return
+        self.last_flush = now
+        self.flush()
+
+    def flush(self):
+        directory = settings.METRICS_DIR
+        if not directory:
+            return
+        if self.pid != os.getpid():
+            # First flush in this (possibly forked) process.
+            self.pid = os.getpid()
+            self.file_name = f"{self.pid}-{time.time_ns()}.json"
+        os.makedirs(directory, exist_ok=True)
+        _write_json(os.path.join(directory, self.file_name), self.snapshot())
+
+    def merge(self, totals, dump):
+        for name, values in dump.items():
+            metric = self.metrics.get(name)
+            if metric is not None:
+                totals[name] = metric.merge(totals.get(name, []), values)
+        return totals
+
+    def aggregate(self):
+        """Values summed over every process that has written a file."""
+        if not settings.METRICS_DIR:
+            return self.snapshot()
+        self.flush()
+        dumps = {}
+        for entry in os.scandir(settings.METRICS_DIR):
+            if entry.name.endswith(".json") and entry.name != EXITED_FILE:
+                dump = _read_json(entry.path)
+                if dump is not None:
+                    dumps[entry.name] = dump
+        # Read last: a file folded in meanwhile is counted from here only.
+        exited = _read_json(
+            os.path.join(settings.METRICS_DIR, EXITED_FILE)
+        ) or {}
+        for name in exited.get("absorbed", []):
+            dumps.pop(name, None)
+        totals = self.merge({}, exited.get("metrics", {}))
+        for dump in dumps.values():
+            self.merge(totals, dump)
+        return totals
+
+    def absorb(self, directory, pid):
+        """Fold the files of the exited process ``pid`` into the totals
+        in ``EXITED_FILE`` and remove them. Run by the gunicorn master.
+        """
+        prefix = f"{pid}-"
+        names = [
+            entry.name for entry in os.scandir(directory)
+            if entry.name.startswith(prefix) and entry.name.endswith(".json")
+        ]
+        if not names:
+            return
+        path = os.path.join(directory, EXITED_FILE)
+        exited = _read_json(path) or {}
+        totals = exited.get("metrics", {})
+        for name in names:
+            self.merge(totals, _read_json(os.path.join(directory, name)) or {})
+        absorbed = [
+            name for name in exited.get("absorbed", [])
+            if os.path.exists(os.path.join(directory, name))
+        ]
+        _write_json(path, {"absorbed": absorbed + names, "metrics": totals})
+        for name in names:
+            os.remove(os.path.join(directory, name))
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        totals = self.aggregate()
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            lines.extend(metric.render(totals.get(name, [])))
+        for collect in self.collectors:
+            for name, help, kind, samples in collect():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _read_json(path):
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as handle:
+        json.dump(data, handle)
+    os.replace(temporary, path)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            key, str(value).replace("\\", "\\\\").replace('"', '\\"')
+        )
+        for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.values = defaultdict(float)
+        REGISTRY.register(self)
+
+    def inc(self, *label_values, amount=1):
+        with _lock:
+            self.values[label_values] += amount
+
+    def dump(self):
+        return [[list(key), value] for key, value in self.values.items()]
+
+    def merge(self, total, values):
+        merged = {tuple(key): value for key, value in total}
+        for key, value in values:
+            merged[tuple(key)] = merged.get(tuple(key), 0) + value
+        return [[list(key), value] for key, value in merged.items()]
+
+    def render(self, values):
+        for key, value in sorted(values):
+            labels = dict(zip(self.labels, key))
+            yield f"{self.name}{_labels(labels)} {_number(value)}"
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # Per label set: [count per bucket..., overflow count, sum].
+        self.values = {}
+        REGISTRY.register(self)
+
+    def observe(self, value, *label_values):
+        index = 0
+        for bound in self.buckets:
+            if value <= bound:
+                break
+            index += 1
+        with _lock:
+            row = self.values.get(label_values)
+            if row is None:
+                row = [0] * (len(self.buckets) + 2)
+                self.values[label_values] = row
+            row[index] += 1
+            row[-1] += value
+
+    def dump(self):
+        return [[list(key), list(row)] for key, row in self.values.items()]
+
+    def merge(self, total, values):
+        merged = {tuple(key): row for key, row in total}
+        for key, row in values:
+            current = merged.get(tuple(key))
+            merged[tuple(key)] = (
+                row if current is None
+                else [a + b for a, b in zip(current, row)]
+            )
+        return [[list(key), row] for key, row in merged.items()]
+
+    def render(self, values):
+        for key, row in sorted(values):
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), row):
+                cumulative += count
+                bucket = _labels({**labels, "le": _number(bound)})
+                yield f"{self.name}_bucket{bucket} {cumulative}"
+            yield f"{self.name}_sum{_labels(labels)} {_number(row[-1])}"
+            yield f"{self.name}_count{_labels(labels)} {cumulative}"
+
+
+REGISTRY = Registry()
+atexit.register(REGISTRY.flush)
+
+
+REQUESTS = Counter(
+    "kanmind_http_requests_total",
+    "HTTP requests by URL name, method and status.",
+    ("view", "method", "status"),
+)
+REQUEST_LATENCY = Histogram(
+    "kanmind_http_request_duration_seconds",
+    "Request latency by URL name.",
+    ("view", "method"),
+)
+DB_QUERIES = Histogram(
+    "kanmind_db_queries_per_request",
+    "Database queries run while handling a request, by URL name.",
+    ("view",),
+    QUERY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "kanmind_cache_requests_total",
+    "Lookups of cached results by cache and hit/miss.",
+    ("cache", "result"),
+)
+AUTH_FAILURES = Counter(
+    "kanmind_auth_failures_total",
+    "Rejected logins and unauthenticated requests by reason.",
+    ("reason",),
+)
+
+
+def record_cache(name, hit):
+    CACHE_REQUESTS.inc(name, "hit" if hit else "miss")
@@ -0,0 +1,133 @@
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils.cache import patch_vary_headers
+
+from auth_app.users import user_summary_memo
+from core.compression import accepted_encoding, compress
+from core.metrics import (
+    AUTH_FAILURES,
+    DB_QUERIES,
+    REGISTRY,
+    REQUEST_LATENCY,
+    REQUESTS,
+)
+from core.querylog import QueryRecorder
+
+LOGIN_VIEWS = {"login", "token-refresh"}
+
+
+def _url_name(request):
+    match = request.resolver_match
+    return (match.url_name or match.view_name) if match else "unmatched"
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """Record latency, query count and status of every request.
+
+    Requests are labelled with their URL name from ``core/urls.py`` so
+    label cardinality stays bounded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = _QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+        view = _url_name(request)
+        status = response.status_code
+        REQUESTS.inc(view, request.method, str(status))
+        REQUEST_LATENCY.observe(elapsed, view, request.method)
+        DB_QUERIES.observe(queries.count, view)
+        if status == 401:
+            AUTH_FAILURES.inc("unauthenticated")
+        elif view in LOGIN_VIEWS and status == 429:
+            AUTH_FAILURES.inc("throttled")
+        elif view in LOGIN_VIEWS and 400 <= status < 500:
+            AUTH_FAILURES.inc("invalid_credentials")
+        REGISTRY.maybe_flush()
+        return response
+
+
+class QueryLogMiddleware:
+    """Feed each request's queries to the slow/duplicate query log.
+
+    Does nothing unless ``QUERY_LOG_ENABLED`` is set.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_LOG_ENABLED:
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        recorder.report(_url_name(request))
+        return response
+
+
+class CompressionMiddleware:
+    """Compress JSON bodies of at least ``COMPRESS_MIN_SIZE`` bytes.
+
+    Uses ``response.compressed_variants`` when the view supplies them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or not response.get("Content-Type", "").startswith(
+                "application/json"
+            )
+            or len(response.content) < settings.COMPRESS_MIN_SIZE
+        ):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = accepted_encoding(request)
+        if encoding is None:
+            return response
+        variants = getattr(response, "compressed_variants", None) or {}
+        body = variants.get(encoding)
+        if body is None:
+            body = compress(response.content, encoding)
+        if len(body) >= len(response.content):
+            return response
+        response.content = body
+        response["Content-Length"] = str(len(body))
+        response["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            # The compressed bytes differ, so the tag can only be weak.
+            response["ETag"] = f"W/{etag}"
+        return response
+
+
+class UserSummaryMemoMiddleware:
+    """Look up each user summary at most once per request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with user_summary_memo():
+            return self.get_response(request)
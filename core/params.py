@@ -0,0 +1,20 @@
+from rest_framework.exceptions import ValidationError
+
+
+def positive_int(params, name, default=None):
+    """Read a positive integer query parameter or raise a 400."""
+    value = params.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise ValidationError({name: "Must be a positive integer."})
+    return number
+
+
+def page_limit(params, default, maximum):
+    """``limit`` query parameter, capped at ``maximum``."""
+    return min(positive_int(params, "limit", default), maximum)
@@ -0,0 +1,134 @@
+"""Opt-in slow-query log and duplicate-query detector.
+
+With ``QUERY_LOG_ENABLED`` set, every query of a request goes through
+``connection.execute_wrapper``: it is timed, reduced to a fingerprint
+(the SQL with its placeholders, ``IN`` lists collapsed) and attributed
+to the innermost project function that ran it, such as
+``BoardListSerializer.get_ticket_count``. At the end of the request,
+slow queries (sampled) and fingerprints repeated from the same origin
+are appended as JSON lines to a rotating log that the ``query_report``
+command summarizes.
+"""
+
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_SPACES = re.compile(r"\s+")
+_SKIPPED_DIRS = (
+    os.sep + "site-packages" + os.sep,
+    os.sep + "migrations" + os.sep,
+)
+# Instrumentation frames are never the origin of a query.
+_SKIPPED_FILES = {
+    __file__,
+    os.path.join(os.path.dirname(__file__), "middleware.py"),
+}
+_handlers = {}
+
+
+def fingerprint(sql):
+    """SQL text without values and with ``IN`` lists of any length merged."""
+    return _IN_LIST.sub("IN (...)", _SPACES.sub(" ", sql)).strip()
+
+
+def _origin():
+    """``Class.method`` or ``module.function`` of the innermost app frame."""
+    base = str(settings.BASE_DIR)
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(base)
+            and filename not in _SKIPPED_FILES
+            and not any(part in filename for part in _SKIPPED_DIRS)
+        ):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            if owner is not None:
+                return f"{type(owner).__name__}.{name}"
+            module = frame.f_globals.get("__name__", "?")
+            return f"{module}.{name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+def get_logger():
+    """Logger writing to ``QUERY_LOG_PATH`` with size-based rotation."""
+    path = str(settings.QUERY_LOG_PATH)
+    logger = logging.getLogger("kanmind.queries")
+    if path not in _handlers:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        for handler in _handlers.values():
+            logger.removeHandler(handler)
+            handler.close()
+        _handlers.clear()
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=settings.QUERY_LOG_MAX_BYTES,
+            backupCount=settings.QUERY_LOG_BACKUPS,
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        _handlers[path] = handler
+    return logger
+
+
+class QueryRecorder:
+    """``execute_wrapper`` collecting the queries of one request."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.queries.append((fingerprint(sql), _origin(), elapsed))
+
+    def report(self, view):
+        """Log slow and duplicated queries of the finished request."""
+        slow_ms = settings.QUERY_LOG_SLOW_MS
+        threshold = settings.QUERY_LOG_DUPLICATE_THRESHOLD
+        groups = defaultdict(list)
+        records = []
+        for sql, origin, elapsed in self.queries:
+            groups[sql, origin].append(elapsed)
+            if elapsed >= slow_ms and (
+                random.random() < settings.QUERY_LOG_SAMPLE_RATE
+            ):
+                records.append({
+                    "kind": "slow",
+                    "view": view,
+                    "origin": origin,
+                    "sql": sql,
+                    "ms": round(elapsed, 2),
+                })
+        for (sql, origin), durations in groups.items():
+            if len(durations) >= threshold:
+                records.append({
+                    "kind": "duplicate",
+                    "view": view,
+                    "origin": origin,
+                    "sql": sql,
+                    "count": len(durations),
+                    "ms": round(sum(durations), 2),
+                })
+        if records:
+            logger = get_logger()
+            for record in records:
+                logger.info(json.dumps(record))
+        return records
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
 import os
+from datetime import timedelta
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -37,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'rest_framework.authtoken',
+    'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
     'auth_app',
     'board_app',
@@ -44,6 +46,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.QueryLogMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.UserSummaryMemoMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -55,6 +61,34 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# API-only profile for the gunicorn workers: without the admin, session,
+# message, template and static file stacks (and with JSON-only responses)
+# a worker imports less and boots faster. Run the admin, if needed, from
+# a separate process on the full profile. Compare with bench_startup.
+API_ONLY = os.environ.get("API_ONLY", "False") == "True"
+
+if API_ONLY:
+    _BROWSER_APPS = {
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+    }
+    _BROWSER_MIDDLEWARE = {
+        'whitenoise.middleware.WhiteNoiseMiddleware',
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    }
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS if app not in _BROWSER_APPS
+    ]
+    MIDDLEWARE = [
+        middleware for middleware in MIDDLEWARE
+        if middleware not in _BROWSER_MIDDLEWARE
+    ]
+
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
@@ -72,6 +106,9 @@ TEMPLATES = [
     },
 ]
 
+if API_ONLY:
+    TEMPLATES = []
+
 WSGI_APPLICATION = 'core.wsgi.application'
 
 
@@ -82,6 +119,10 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 0 closes the connection at the end of each request; set
+        # DB_CONN_MAX_AGE to keep one open per worker thread instead.
+        'CONN_MAX_AGE': int(os.environ.get("DB_CONN_MAX_AGE", "0")),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -104,6 +145,123 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing profile: "bcrypt" (default), "argon2" (needs argon2-cffi)
+# or "pbkdf2". The first hasher hashes new passwords; the others still
+# verify existing hashes, which are upgraded transparently on login.
+PASSWORD_HASH_PROFILE = os.environ.get("PASSWORD_HASH_PROFILE", "bcrypt")
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+ARGON2_TIME_COST = int(os.environ.get("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.environ.get("ARGON2_MEMORY_COST", "65536"))
+ARGON2_PARALLELISM = int(os.environ.get("ARGON2_PARALLELISM", "1"))
+
+_PASSWORD_HASHERS = {
+    'bcrypt': 'auth_app.hashers.ConfigurableBCryptSHA256PasswordHasher',
+    'argon2': 'auth_app.hashers.ConfigurableArgon2PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASH_PROFILE]] + [
+    hasher for profile, hasher in _PASSWORD_HASHERS.items()
+    if profile != PASSWORD_HASH_PROFILE
+]
+
+# At most this many password hashes run at once per process; the rest
+# wait LOGIN_QUEUE_TIMEOUT seconds and then get 429. core.gunicorn_config
+# defaults it to cores // workers (at least 1), so the gthread workers
+# together run at most one hash per core; sync workers serve one request
+# each, so up to one hash per worker runs there. Single-process servers
+# default to the core count.
+LOGIN_HASH_WORKERS = int(
+    os.environ.get("LOGIN_HASH_WORKERS", str(os.cpu_count() or 1))
+)
+LOGIN_QUEUE_TIMEOUT = float(os.environ.get("LOGIN_QUEUE_TIMEOUT", "2"))
+
+# Board versions, rendered board detail, user summaries and email checks
+# live in the Django cache. Without CACHE_REDIS_URL (e.g.
+# redis://localhost:6379/0) every process keeps its own in-memory cache and
+# an invalidation only reaches the worker that made it, so set it for any
+# deployment with more than one worker process.
+CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL", "")
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+# Rendered board detail bodies are cached per board version. Only on by
+# default with the shared cache: per-process copies go stale on every
+# worker but the one that handled the write.
+BOARD_DETAIL_CACHE = os.environ.get(
+    "BOARD_DETAIL_CACHE", str(bool(CACHE_REDIS_URL))
+) == "True"
+
+EMAIL_CHECK_CACHE_TTL = int(os.environ.get("EMAIL_CHECK_CACHE_TTL", "60"))
+EMAIL_SEARCH_LIMIT = 10
+# Nested user representations (id, email, fullname) are cached by user id;
+# saving a user drops its entry. That only reaches other workers through
+# the shared cache, so per-process entries expire after 30 seconds.
+USER_SUMMARY_CACHE_TTL = int(
+    os.environ.get(
+        "USER_SUMMARY_CACHE_TTL", "3600" if CACHE_REDIS_URL else "30"
+    )
+)
+
+# Default and maximum page size for keyset-paged comment threads.
+COMMENT_PAGE_SIZE = 50
+COMMENT_PAGE_MAX = 200
+
+# JSON responses at least this large are gzip/brotli compressed.
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", "1024"))
+
+# Metrics are kept per process; with METRICS_DIR set, each process also
+# writes them there so /metrics can sum all gunicorn workers.
+METRICS_DIR = os.environ.get("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "5"))
+# /metrics requires this bearer token; without one it is closed unless
+# METRICS_PUBLIC=True (or DEBUG).
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_PUBLIC = os.environ.get("METRICS_PUBLIC", "False") == "True"
+
+# Opt-in query instrumentation: slow queries (sampled) and queries
+# repeated within a request are logged for the query_report command.
+QUERY_LOG_ENABLED = os.environ.get("QUERY_LOG_ENABLED", "False") == "True"
+QUERY_LOG_PATH = os.environ.get(
+    "QUERY_LOG_PATH", str(BASE_DIR / "logs" / "queries.log")
+)
+QUERY_LOG_SLOW_MS = float(os.environ.get("QUERY_LOG_SLOW_MS", "100"))
+QUERY_LOG_SAMPLE_RATE = float(os.environ.get("QUERY_LOG_SAMPLE_RATE", "1"))
+QUERY_LOG_DUPLICATE_THRESHOLD = 5
+QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+QUERY_LOG_BACKUPS = 5
+
+# Board detail shows this many members; all of them are paged at
+# /api/boards/{id}/members/.
+BOARD_MEMBER_SAMPLE = 20
+MEMBER_PAGE_SIZE = 100
+MEMBER_PAGE_MAX = 500
+
+# Board activity feed paging, and how long entries are kept before the
+# prune_activity command drops their monthly buckets.
+ACTIVITY_PAGE_SIZE = 50
+ACTIVITY_PAGE_MAX = 200
+ACTIVITY_RETENTION_DAYS = int(
+    os.environ.get("ACTIVITY_RETENTION_DAYS", "90")
+)
+
+# Deleted boards and tasks stay restorable for this long before the
+# purge_deleted command removes them for good.
+SOFT_DELETE_RESTORE_WINDOW = timedelta(
+    days=int(os.environ.get("SOFT_DELETE_RESTORE_DAYS", "7"))
+)
+
+# Tasks done and unchanged for this long are moved to the archive tables
+# by the archive_tasks command; the archive endpoint pages them.
+TASK_ARCHIVE_AFTER = timedelta(
+    days=int(os.environ.get("TASK_ARCHIVE_AFTER_DAYS", "30"))
+)
+ARCHIVE_PAGE_SIZE = 50
+ARCHIVE_PAGE_MAX = 200
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
@@ -128,10 +286,49 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',
+        'auth_app.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'auth_app.throttling.GroupRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'login-ip': os.environ.get("LOGIN_IP_RATE", "30/min"),
+        'login-email': os.environ.get("LOGIN_EMAIL_RATE", "10/min"),
+        # Endpoint groups of GroupRateThrottle, per user (or IP).
+        'auth': os.environ.get("AUTH_RATE", "60/min"),
+        'board-read': os.environ.get("BOARD_READ_RATE", "120/min"),
+        'task-write': os.environ.get("TASK_WRITE_RATE", "120/min"),
+    },
+}
+
+# Sliding-window throttle counters go to Redis when set (e.g.
+# redis://localhost:6379/1), else to the Django cache. Without
+# CACHE_REDIS_URL that cache is per process, so every gunicorn worker
+# counts on its own and the limits are multiplied by the worker count.
+THROTTLE_REDIS_URL = os.environ.get("THROTTLE_REDIS_URL", "")
+if API_ONLY:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'rest_framework.renderers.JSONRenderer',
+    ]
+
+# Token issued by login/registration: "token" (DB-backed DRF token) or
+# "jwt" (stateless access + refresh pair). Both are always accepted.
+AUTH_TOKEN_MODE = os.environ.get("AUTH_TOKEN_MODE", "token")
+
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(
+        minutes=int(os.environ.get("JWT_ACCESS_MINUTES", "15"))
+    ),
+    'REFRESH_TOKEN_LIFETIME': timedelta(
+        days=int(os.environ.get("JWT_REFRESH_DAYS", "7"))
+    ),
+    'ROTATE_REFRESH_TOKENS': True,
+    'BLACKLIST_AFTER_ROTATION': True,
+    'UPDATE_LAST_LOGIN': False,
+    'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
 CORS_ALLOWED_ORIGINS = [
@@ -0,0 +1,282 @@
+import gzip
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from board_app.models import Board
+from core.metrics import (
+    AUTH_FAILURES,
+    CACHE_REQUESTS,
+    DB_QUERIES,
+    EXITED_FILE,
+    REGISTRY,
+    REQUESTS,
+)
+from core.compression import accepted_encoding
+from core.querylog import fingerprint
+from tasks_app.models import Task
+
+
+class MetricsTestCase(APITestCase):
+    """Tests for request instrumentation and GET /metrics"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user@test.com",
+            email="user@test.com",
+            password="testpass123",
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + self.token.key
+        )
+
+    def test_requests_labelled_by_url_name(self):
+        """Requests count per URL name and record their queries."""
+        key = ("board-list", "GET", "200")
+        before = REQUESTS.values[key]
+        self.client.get("/api/boards/")
+        self.assertEqual(REQUESTS.values[key], before + 1)
+        self.assertIn(("board-list",), DB_QUERIES.values)
+
+    def test_cache_hits_and_misses(self):
+        """Summary lookups report a miss, then a hit."""
+        miss = CACHE_REQUESTS.values[("dashboard-summary", "miss")]
+        hit = CACHE_REQUESTS.values[("dashboard-summary", "hit")]
+        self.client.get("/api/summary/")
+        self.client.get("/api/summary/")
+        self.assertEqual(
+            CACHE_REQUESTS.values[("dashboard-summary", "miss")], miss + 1
+        )
+        self.assertEqual(
+            CACHE_REQUESTS.values[("dashboard-summary", "hit")], hit + 1
+        )
+
+    def test_auth_failures(self):
+        """Bad logins and missing credentials are counted."""
+        invalid = AUTH_FAILURES.values[("invalid_credentials",)]
+        unauthenticated = AUTH_FAILURES.values[("unauthenticated",)]
+        self.client.credentials()
+        self.client.post(
+            "/api/login/",
+            {"email": "user@test.com", "password": "wrong"},
+            format="json",
+        )
+        self.client.get("/api/boards/")
+        self.assertEqual(
+            AUTH_FAILURES.values[("invalid_credentials",)], invalid + 1
+        )
+        self.assertEqual(
+            AUTH_FAILURES.values[("unauthenticated",)], unauthenticated + 1
+        )
+
+    @override_settings(METRICS_PUBLIC=True)
+    def test_metrics_endpoint(self):
+        """The endpoint renders the Prometheus text format."""
+        self.client.get("/api/boards/")
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn("# TYPE kanmind_http_requests_total counter", body)
+        self.assertIn(
+            'kanmind_http_request_duration_seconds_bucket'
+            '{view="board-list",method="GET",le="+Inf"}',
+            body,
+        )
+        self.assertIn('kanmind_job_lag_seconds{job="purge_deleted"} 0', body)
+
+    def test_metrics_closed_without_token(self):
+        """Without METRICS_TOKEN the endpoint needs an explicit opt-in."""
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_token(self):
+        """With METRICS_TOKEN set, scrapes need the bearer token."""
+        self.client.credentials()
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        response = self.client.get(
+            "/metrics", HTTP_AUTHORIZATION="Bearer secret"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_values_summed_across_processes(self):
+        """Files written by other workers are added to this process."""
+        key = ["email-check", "hit"]
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "1-1.json"), "w") as handle:
+                json.dump(
+                    {"kanmind_cache_requests_total": [[key, 1000]]}, handle
+                )
+            with override_settings(METRICS_DIR=directory):
+                own = CACHE_REQUESTS.values[tuple(key)]
+                body = REGISTRY.render()
+                self.assertEqual(len(os.listdir(directory)), 2)
+        self.assertIn(
+            'kanmind_cache_requests_total{cache="email-check",result="hit"} '
+            f"{int(own + 1000)}",
+            body,
+        )
+
+    def test_exited_workers_folded_into_one_file(self):
+        """A worker's files are merged into the totals when it exits."""
+        key = ["email-check", "hit"]
+        with tempfile.TemporaryDirectory() as directory:
+            for name, count in (("7-1.json", 10), ("7-2.json", 20),
+                                ("8-1.json", 300)):
+                with open(os.path.join(directory, name), "w") as handle:
+                    json.dump(
+                        {"kanmind_cache_requests_total": [[key, count]]},
+                        handle,
+                    )
+            REGISTRY.absorb(directory, 7)
+            REGISTRY.absorb(directory, 8)
+            self.assertEqual(os.listdir(directory), [EXITED_FILE])
+            with open(os.path.join(directory, "9-1.json"), "w") as handle:
+                json.dump(
+                    {"kanmind_cache_requests_total": [[key, 4000]]}, handle
+                )
+            REGISTRY.absorb(directory, 9)
+            # Folded in but not yet removed: counted once.
+            with open(os.path.join(directory, "9-1.json"), "w") as handle:
+                json.dump(
+                    {"kanmind_cache_requests_total": [[key, 4000]]}, handle
+                )
+            with override_settings(METRICS_DIR=directory):
+                own = CACHE_REQUESTS.values[tuple(key)]
+                body = REGISTRY.render()
+        self.assertIn(
+            'kanmind_cache_requests_total{cache="email-check",result="hit"} '
+            f"{int(own + 4330)}",
+            body,
+        )
+
+    def test_purge_lag(self):
+        """Deleted rows past the restore window show up as job lag."""
+        board = Board.objects.create(title="Old", created_by=self.user)
+        task = Task.objects.create(
+            title="Gone", board=board, created_by=self.user
+        )
+        Task.all_objects.filter(pk=task.pk).update(
+            deleted_at=timezone.now() - timedelta(days=10)
+        )
+        body = REGISTRY.render()
+        line = next(
+            line for line in body.splitlines()
+            if line.startswith('kanmind_job_lag_seconds{job="purge_deleted"}')
+        )
+        lag = float(line.split()[-1])
+        self.assertAlmostEqual(lag, 3 * 24 * 3600, delta=60)
+
+
+class QueryLogTestCase(APITestCase):
+    """Tests for the slow/duplicate query log and query_report"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="user@test.com",
+            email="user@test.com",
+            password="testpass123",
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + self.token.key
+        )
+        for number in range(6):
+            Board.objects.create(title=f"Board {number}", created_by=self.user)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "queries.log")
+
+    def read_log(self):
+        with open(self.path) as handle:
+            return [json.loads(line) for line in handle]
+
+    def test_fingerprint_merges_in_lists(self):
+        """Placeholders stay and IN lists of any length look the same."""
+        self.assertEqual(
+            fingerprint('SELECT  * FROM "t"\n WHERE id IN (%s, %s, %s)'),
+            'SELECT * FROM "t" WHERE id IN (...)',
+        )
+
+    def test_disabled_by_default(self):
+        """Nothing is written unless the log is switched on."""
+        with override_settings(QUERY_LOG_PATH=self.path):
+            self.client.get("/api/boards/")
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_duplicates_attributed_to_origin(self):
+        """Per-board count queries are reported with their serializer."""
+        with override_settings(
+            QUERY_LOG_ENABLED=True,
+            QUERY_LOG_PATH=self.path,
+            QUERY_LOG_SLOW_MS=10_000,
+        ):
+            self.client.get("/api/boards/")
+        records = self.read_log()
+        origins = {
+            record["origin"] for record in records
+            if record["kind"] == "duplicate"
+        }
+        self.assertIn("BoardListSerializer.get_ticket_count", origins)
+        self.assertTrue(all(r["view"] == "board-list" for r in records))
+        self.assertNotIn("slow", {record["kind"] for record in records})
+
+    def test_slow_queries_and_report(self):
+        """Queries over the threshold are logged and summarized."""
+        with override_settings(
+            QUERY_LOG_ENABLED=True,
+            QUERY_LOG_PATH=self.path,
+            QUERY_LOG_SLOW_MS=0,
+        ):
+            self.client.get("/api/boards/")
+        self.assertIn("slow", {record["kind"] for record in self.read_log()})
+        output = StringIO()
+        call_command("query_report", path=self.path, top=3, stdout=output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertIn("BoardListSerializer.get_", output.getvalue())
+
+
+class CompressionTestCase(APITestCase):
+    """Tests for JSON response compression"""
+
+    def test_accepted_encoding(self):
+        """q=0 excludes an encoding and * accepts any."""
+        factory = APIRequestFactory()
+        cases = {
+            "": None,
+            "identity": None,
+            "gzip, deflate": "gzip",
+            "gzip;q=0, deflate": None,
+            "*": "gzip",
+            "GZIP;q=0.5": "gzip",
+        }
+        for header, expected in cases.items():
+            request = factory.get("/", HTTP_ACCEPT_ENCODING=header)
+            self.assertEqual(accepted_encoding(request), expected, header)
+
+    @override_settings(COMPRESS_MIN_SIZE=200)
+    def test_large_json_compressed(self):
+        """JSON over the threshold is gzipped for clients that accept it."""
+        user = User.objects.create_user(username="u@test.com")
+        for number in range(10):
+            Board.objects.create(title=f"Board {number}", created_by=user)
+        self.client.force_authenticate(user)
+        plain = self.client.get("/api/boards/")
+        response = self.client.get(
+            "/api/boards/", HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
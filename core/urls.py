@@ -14,12 +14,19 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.apps import apps
 from django.urls import include, path
 
+from core.views import metrics
+
 urlpatterns = [
-    path('admin/', admin.site.urls),
+    path('metrics', metrics, name='metrics'),
     path('api/', include('auth_app.api.urls')),
     path('api/', include('board_app.api.urls')),
     path('api/', include('tasks_app.api.urls')),
 ]
+
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+from core.metrics import REGISTRY
+
+
+def metrics(request):
+    """GET /metrics - Prometheus text exposition of all workers' metrics.
+
+    The scraper must send ``METRICS_TOKEN`` as a bearer token. Without a
+    token the endpoint is closed unless ``METRICS_PUBLIC`` or ``DEBUG``
+    is on.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not (settings.METRICS_PUBLIC or settings.DEBUG):
+            return HttpResponseForbidden()
+    elif not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        REGISTRY.render(), content_type="text/plain; version=0.0.4"
+    )
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from tasks_app.models import Comment, Task
+from tasks_app.models import ArchivedTask, Comment, Task
 
 
 @admin.register(Task)
@@ -14,3 +14,9 @@ class TaskAdmin(admin.ModelAdmin):
 class CommentAdmin(admin.ModelAdmin):
     list_display = ["id", "author", "task", "created_at"]
     list_filter = ["created_at"]
+
+
+@admin.register(ArchivedTask)
+class ArchivedTaskAdmin(admin.ModelAdmin):
+    list_display = ["id", "title", "board", "archived_at"]
+    search_fields = ["title"]
@@ -1,33 +1,106 @@
-from django.contrib.auth.models import User
 from rest_framework import serializers
 
-from auth_app.api.serializers import UserDetailsSerializer
-from tasks_app.models import Comment, Task
+from auth_app.api.fields import (
+    DOES_NOT_EXIST,
+    UserIdField,
+    UserSummaryField,
+    UserSummaryListSerializer,
+    users_by_id,
+)
+from tasks_app.models import ArchivedComment, ArchivedTask, Comment, Task
+from tasks_app.prefetch import COMMENT_PREVIEW_COUNT
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class CommentSerializer(serializers.ModelSerializer):
+    """Serializer for task comments."""
+
+    author = serializers.CharField(
+        source="author.first_name", read_only=True
+    )
+
+    class Meta:
+        model = Comment
+        fields = ["id", "created_at", "author", "content"]
+        read_only_fields = ["id", "created_at", "author"]
+
+
+class ArchivedCommentSerializer(serializers.ModelSerializer):
+    """Read-only comment of an archived task."""
+
+    author = serializers.CharField(source="author.first_name")
+
+    class Meta:
+        model = ArchivedComment
+        fields = ["id", "created_at", "author", "content"]
+        read_only_fields = fields
+
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    """Read-only archived task with all of its comments."""
+
+    assignee = UserSummaryField(source="assignee_id")
+    reviewer = UserSummaryField(source="reviewer_id")
+    comments = ArchivedCommentSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ArchivedTask
+        list_serializer_class = UserSummaryListSerializer
+        fields = [
+            "id",
+            "title",
+            "description",
+            "priority",
+            "assignee",
+            "reviewer",
+            "due_date",
+            "created_at",
+            "archived_at",
+            "comments",
+        ]
+        read_only_fields = fields
+
+
+class CommentPreviewMixin(serializers.Serializer):
+    """Comment count and latest comments for task representations.
+
+    Uses the values attached by ``with_comment_previews`` and falls back
+    to per-task queries for tasks loaded without it.
+    """
+
+    comments_count = serializers.SerializerMethodField()
+    latest_comments = serializers.SerializerMethodField()
+
+    def get_comments_count(self, obj):
+        count = getattr(obj, "comments_count", None)
+        if count is None:
+            count = obj.comments.count()
+        return count
+
+    def get_latest_comments(self, obj):
+        comments = getattr(obj, "latest_comments", None)
+        if comments is None:
+            comments = list(
+                obj.comments.select_related("author")
+                .order_by("-created_at", "-id")[:COMMENT_PREVIEW_COUNT]
+            )[::-1]
+        return CommentSerializer(comments, many=True).data
+
+
+class TaskSerializer(CommentPreviewMixin, serializers.ModelSerializer):
     """Serializer for task list, create and update."""
 
-    assignee = UserDetailsSerializer(read_only=True)
-    reviewer = UserDetailsSerializer(read_only=True)
-    assignee_id = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.all(),
-        source="assignee",
-        write_only=True,
-        required=False,
-        allow_null=True,
+    assignee = UserSummaryField(source="assignee_id")
+    reviewer = UserSummaryField(source="reviewer_id")
+    assignee_id = UserIdField(
+        source="assignee", required=False, allow_null=True
     )
-    reviewer_id = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.all(),
-        source="reviewer",
-        write_only=True,
-        required=False,
-        allow_null=True,
+    reviewer_id = UserIdField(
+        source="reviewer", required=False, allow_null=True
     )
-    comments_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Task
+        list_serializer_class = UserSummaryListSerializer
         fields = [
             "id",
             "board",
@@ -40,39 +113,73 @@ class TaskSerializer(serializers.ModelSerializer):
             "assignee_id",
             "reviewer_id",
             "due_date",
+            "position",
+            "version",
             "comments_count",
+            "latest_comments",
         ]
-
-    def get_comments_count(self, obj):
-        return obj.comments.count()
-
-    def _validate_board_member(self, user, board):
-        """Check that user is a member or creator of the board."""
-        if not board:
-            return
-        is_member = board.created_by == user or board.members.filter(id=user.id).exists()
-        if not is_member:
-            raise serializers.ValidationError(
-                "User is not a member of this board."
-            )
+        read_only_fields = ["position", "version"]
 
     def validate(self, attrs):
+        """Resolve assignee and reviewer in one query, members only."""
         board = attrs.get("board") or getattr(self.instance, "board", None)
-        if attrs.get("assignee"):
-            self._validate_board_member(attrs["assignee"], board)
-        if attrs.get("reviewer"):
-            self._validate_board_member(attrs["reviewer"], board)
+        names = [
+            name for name in ("assignee", "reviewer")
+            if attrs.get(name) is not None
+        ]
+        if not names:
+            return attrs
+        users = users_by_id({attrs[name] for name in names}, board)
+        for name in names:
+            user = users.get(attrs[name])
+            if user is None:
+                raise serializers.ValidationError({
+                    f"{name}_id": [DOES_NOT_EXIST.format(pk_value=attrs[name])]
+                })
+            if board is not None and not user.is_board_member:
+                raise serializers.ValidationError(
+                    "User is not a member of this board."
+                )
+            attrs[name] = user
         return attrs
 
+    def update(self, instance, validated_data):
+        """Write only the fields that change; skip no-op updates.
 
-class CommentSerializer(serializers.ModelSerializer):
-    """Serializer for task comments."""
+        A status change appends the task to the end of its new column.
+        ``expected_version`` in the serializer context makes the write
+        conditional on the task still being at that version.
+        """
+        changed = [
+            name for name, value in validated_data.items()
+            if self._differs(instance, name, value)
+        ]
+        if not changed:
+            return instance
+        for name in changed:
+            setattr(instance, name, validated_data[name])
+        if "status" in changed:
+            instance.position = Task.next_position(
+                instance.board_id, instance.status
+            )
+            changed.append("position")
+        instance.save(
+            update_fields=[*changed, "updated_at"],
+            expected_version=self.context.get("expected_version"),
+        )
+        return instance
 
-    author = serializers.CharField(
-        source="author.first_name", read_only=True
-    )
+    def _differs(self, instance, name, value):
+        field = instance._meta.get_field(name)
+        if field.is_relation:
+            return getattr(instance, field.attname) != (
+                value.pk if value is not None else None
+            )
+        return getattr(instance, name) != value
 
-    class Meta:
-        model = Comment
-        fields = ["id", "created_at", "author", "content"]
-        read_only_fields = ["id", "created_at", "author"]
+
+class TaskMoveSerializer(serializers.Serializer):
+    """Target column and zero-based index for a drag-and-drop move."""
+
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES)
+    index = serializers.IntegerField(min_value=0)
@@ -5,11 +5,19 @@ from tasks_app.api.views import (
     CommentDeleteView,
     CommentListCreateView,
     ReviewingListView,
+    SummaryView,
     TaskCreateView,
     TaskDetailView,
+    TaskMoveView,
+    TaskRestoreView,
 )
 
 urlpatterns = [
+    path(
+        "summary/",
+        SummaryView.as_view(),
+        name="summary",
+    ),
     path(
         "tasks/assigned-to-me/",
         AssignedToMeListView.as_view(),
@@ -30,6 +38,16 @@ urlpatterns = [
         TaskDetailView.as_view(),
         name="task-detail",
     ),
+    path(
+        "tasks/<int:task_id>/move/",
+        TaskMoveView.as_view(),
+        name="task-move",
+    ),
+    path(
+        "tasks/<int:task_id>/restore/",
+        TaskRestoreView.as_view(),
+        name="task-restore",
+    ),
     path(
         "tasks/<int:task_id>/comments/",
         CommentListCreateView.as_view(),
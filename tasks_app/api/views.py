@@ -1,16 +1,40 @@
+from django.conf import settings
+from django.db.models import Q, Subquery
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from board_app.models import Board
+from board_app.activity import ActivityBatchMixin, record_activity
+from board_app.cache import bump_board_cache_version
+from board_app.models import Board, BoardActivity
+from core.concurrency import (
+    PreconditionFailed,
+    VersionConflict,
+    check_version,
+    requested_version,
+    version_etag,
+)
+from core.params import page_limit, positive_int
 from tasks_app.api.permissions import (
     IsBoardMemberForTask,
     IsCommentAuthor,
     IsTaskCreatorOrBoardOwner,
 )
-from tasks_app.api.serializers import CommentSerializer, TaskSerializer
+from tasks_app.api.serializers import (
+    CommentSerializer,
+    TaskMoveSerializer,
+    TaskSerializer,
+)
 from tasks_app.models import Comment, Task
+from tasks_app.prefetch import with_comment_previews
+from tasks_app.summary import (
+    get_summary,
+    invalidate_summaries,
+    task_summary_users,
+)
 
 
 class AssignedToMeListView(generics.ListAPIView):
@@ -20,7 +44,9 @@ class AssignedToMeListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Task.objects.filter(assignee=self.request.user)
+        return with_comment_previews(
+            Task.objects.filter(assignee=self.request.user)
+        )
 
 
 class ReviewingListView(generics.ListAPIView):
@@ -30,14 +56,26 @@ class ReviewingListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Task.objects.filter(reviewer=self.request.user)
+        return with_comment_previews(
+            Task.objects.filter(reviewer=self.request.user)
+        )
+
 
+class SummaryView(generics.GenericAPIView):
+    """GET /api/summary/ - Dashboard counts for the current user."""
 
-class TaskCreateView(generics.CreateAPIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_summary(request.user))
+
+
+class TaskCreateView(ActivityBatchMixin, generics.CreateAPIView):
     """POST /api/tasks/"""
 
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    throttle_group = {"write": "task-write"}
 
     def create(self, request, *args, **kwargs):
         board_id = request.data.get("board")
@@ -53,14 +91,23 @@ class TaskCreateView(generics.CreateAPIView):
         return super().create(request, *args, **kwargs)
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        task = serializer.save(created_by=self.request.user)
+        record_activity(
+            task.board_id,
+            BoardActivity.TASK_CREATED,
+            actor=self.request.user,
+            task_id=task.pk,
+            title=task.title,
+            status=task.status,
+        )
 
 
-class TaskDetailView(generics.GenericAPIView):
+class TaskDetailView(ActivityBatchMixin, generics.GenericAPIView):
     """PATCH and DELETE /api/tasks/{task_id}/"""
 
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    throttle_group = {"write": "task-write"}
     lookup_url_kwarg = "task_id"
 
     def get_queryset(self):
@@ -75,9 +122,18 @@ class TaskDetailView(generics.GenericAPIView):
         return permissions
 
     def patch(self, request, *args, **kwargs):
+        """Partial update; a stale ``If-Match``/``version`` gets 412."""
         task = self.get_object()
+        expected = requested_version(request)
+        check_version(task, expected)
         serializer = self.get_serializer(
-            task, data=request.data, partial=True
+            task,
+            data=request.data,
+            partial=True,
+            context={
+                **self.get_serializer_context(),
+                "expected_version": expected,
+            },
         )
         serializer.is_valid(raise_exception=True)
         if "board" in serializer.validated_data:
@@ -85,20 +141,108 @@ class TaskDetailView(generics.GenericAPIView):
                 {"board": "Changing the board is not allowed."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        serializer.save()
-        return Response(serializer.data)
+        previous_status, previous_assignee = task.status, task.assignee_id
+        try:
+            serializer.save()
+        except VersionConflict:
+            raise PreconditionFailed()
+        if task.status != previous_status:
+            record_activity(
+                task.board_id,
+                BoardActivity.TASK_MOVED,
+                actor=request.user,
+                task_id=task.pk,
+                **{"from": previous_status, "to": task.status},
+            )
+        if task.assignee_id != previous_assignee:
+            record_activity(
+                task.board_id,
+                BoardActivity.TASK_ASSIGNED,
+                actor=request.user,
+                task_id=task.pk,
+                assignee_id=task.assignee_id,
+            )
+        return Response(
+            serializer.data, headers={"ETag": version_etag(task)}
+        )
 
     def delete(self, request, *args, **kwargs):
         task = self.get_object()
-        task.delete()
+        Task.objects.filter(pk=task.pk).soft_delete()
+        bump_board_cache_version(task.board_id)
+        invalidate_summaries(task_summary_users(task))
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class CommentListCreateView(generics.ListCreateAPIView):
+class TaskRestoreView(generics.GenericAPIView):
+    """POST /api/tasks/{task_id}/restore/ - Undo a delete within the window."""
+
+    serializer_class = TaskSerializer
+    permission_classes = [IsAuthenticated, IsTaskCreatorOrBoardOwner]
+    throttle_group = {"write": "task-write"}
+    lookup_url_kwarg = "task_id"
+
+    def get_queryset(self):
+        return Task.all_objects.filter(
+            board__deleted_at__isnull=True,
+            deleted_at__gte=timezone.now() - settings.SOFT_DELETE_RESTORE_WINDOW,
+        )
+
+    def post(self, request, *args, **kwargs):
+        task = self.get_object()
+        Task.all_objects.filter(pk=task.pk).restore()
+        task.deleted_at = None
+        bump_board_cache_version(task.board_id)
+        invalidate_summaries(task_summary_users(task))
+        return Response(TaskSerializer(task).data)
+
+
+class TaskMoveView(ActivityBatchMixin, generics.GenericAPIView):
+    """POST /api/tasks/{task_id}/move/ - Move a task to a column index.
+
+    Only the moved task's row is written: it gets a fractional position
+    key between its new neighbours.
+    """
+
+    serializer_class = TaskMoveSerializer
+    permission_classes = [IsAuthenticated, IsBoardMemberForTask]
+    throttle_group = {"write": "task-write"}
+    lookup_url_kwarg = "task_id"
+
+    def get_queryset(self):
+        return Task.objects.all()
+
+    def post(self, request, *args, **kwargs):
+        task = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        previous_status = task.status
+        task.status = serializer.validated_data["status"]
+        task.position = Task.position_at(
+            task.board_id,
+            task.status,
+            serializer.validated_data["index"],
+            exclude=task.pk,
+        )
+        task.save(update_fields=["status", "position", "updated_at"])
+        record_activity(
+            task.board_id,
+            BoardActivity.TASK_MOVED,
+            actor=request.user,
+            task_id=task.pk,
+            **{"from": previous_status, "to": task.status},
+        )
+        return Response(TaskSerializer(task).data)
+
+
+class CommentListCreateView(
+    ActivityBatchMixin, generics.ListCreateAPIView
+):
     """GET and POST /api/tasks/{task_id}/comments/"""
 
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
+    throttle_group = {"write": "task-write"}
 
     def get_task(self):
         task = get_object_or_404(Task, id=self.kwargs["task_id"])
@@ -115,11 +259,64 @@ class CommentListCreateView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         task = self.get_task()
-        return Comment.objects.filter(task=task)
+        return (
+            Comment.objects.filter(task=task)
+            .select_related("author")
+            .order_by("created_at", "id")
+        )
 
     def perform_create(self, serializer):
         task = self.get_task()
-        serializer.save(author=self.request.user, task=task)
+        comment = serializer.save(author=self.request.user, task=task)
+        record_activity(
+            task.board_id,
+            BoardActivity.COMMENT_ADDED,
+            actor=self.request.user,
+            task_id=task.pk,
+            comment_id=comment.pk,
+        )
+
+    def list(self, request, *args, **kwargs):
+        """Whole thread, or one keyset page if a cursor or limit is given."""
+        queryset = self.get_queryset()
+        if {"before", "after", "limit"} & set(request.query_params):
+            queryset = self.get_page(queryset, request.query_params)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    def get_page(self, queryset, params):
+        """Comments right after or before the cursor comment id.
+
+        Pages are slices of the ``(created_at, id)`` order, so each page
+        is one index range scan however deep into the thread it is.
+        """
+        limit = page_limit(
+            params, settings.COMMENT_PAGE_SIZE, settings.COMMENT_PAGE_MAX
+        )
+        after = positive_int(params, "after")
+        before = positive_int(params, "before")
+        if after and before:
+            raise ValidationError(
+                {"detail": "Use either before or after, not both."}
+            )
+        if after:
+            cursor = Subquery(
+                Comment.objects.filter(pk=after).values("created_at")[:1]
+            )
+            queryset = queryset.filter(
+                Q(created_at__gt=cursor)
+                | Q(created_at=cursor, id__gt=after)
+            )
+        if before:
+            cursor = Subquery(
+                Comment.objects.filter(pk=before).values("created_at")[:1]
+            )
+            page = queryset.filter(
+                Q(created_at__lt=cursor)
+                | Q(created_at=cursor, id__lt=before)
+            ).order_by("-created_at", "-id")[:limit]
+            return list(page)[::-1]
+        return queryset[:limit]
 
 
 class CommentDeleteView(generics.DestroyAPIView):
@@ -127,9 +324,17 @@ class CommentDeleteView(generics.DestroyAPIView):
 
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated, IsCommentAuthor]
+    throttle_group = {"write": "task-write"}
     lookup_url_kwarg = "comment_id"
 
     def get_queryset(self):
         return Comment.objects.filter(
-            task_id=self.kwargs["task_id"]
+            task_id=self.kwargs["task_id"],
+            task__deleted_at__isnull=True,
+            task__board__deleted_at__isnull=True,
         )
+
+    def perform_destroy(self, instance):
+        board_id = instance.task.board_id
+        instance.delete()
+        bump_board_cache_version(board_id)
@@ -5,3 +5,6 @@ class TasksAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks_app'
     verbose_name = 'Tasks'
+
+    def ready(self):
+        from tasks_app import signals  # noqa: F401
@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from board_app.cache import bump_board_cache_version
+from tasks_app.models import ArchivedComment, ArchivedTask, Comment, Task
+from tasks_app.summary import invalidate_summaries
+
+TASK_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "priority",
+    "board_id",
+    "created_by_id",
+    "assignee_id",
+    "reviewer_id",
+    "due_date",
+    "created_at",
+    "updated_at",
+)
+COMMENT_FIELDS = ("id", "task_id", "author_id", "content", "created_at")
+
+
+def archivable_tasks(now=None):
+    """Tasks done and unchanged for at least ``TASK_ARCHIVE_AFTER``.
+
+    Any write bumps ``updated_at``, so it is never earlier than the move
+    to done.
+    """
+    cutoff = (now or timezone.now()) - settings.TASK_ARCHIVE_AFTER
+    return Task.objects.filter(status="done", updated_at__lte=cutoff)
+
+
+def _archive_batch(ids, archived_at):
+    """Copy one batch of tasks and their comments, then delete them.
+
+    The rows are locked and checked against the archive rule again, so a
+    task reopened, edited or deleted since its id was picked stays put.
+    """
+    with transaction.atomic():
+        ids = list(
+            archivable_tasks(archived_at)
+            .filter(id__in=ids)
+            .select_for_update(of=("self",))
+            .values_list("id", flat=True)
+        )
+        rows = list(
+            Task._base_manager.filter(id__in=ids).values(*TASK_FIELDS)
+        )
+        ArchivedTask.objects.bulk_create(
+            ArchivedTask(**row, archived_at=archived_at) for row in rows
+        )
+        comments = list(
+            Comment.objects.filter(task_id__in=ids)
+            .select_for_update()
+            .values(*COMMENT_FIELDS)
+        )
+        ArchivedComment.objects.bulk_create(
+            (ArchivedComment(**row) for row in comments), batch_size=1000
+        )
+        Comment.objects.filter(
+            id__in=[row["id"] for row in comments]
+        ).delete()
+        Task._base_manager.filter(id__in=ids).delete()
+    return rows, len(comments)
+
+
+def archive_done_tasks(batch_size=1000, now=None):
+    """Move long-done tasks and their comments to the archive tables.
+
+    Each batch of ``batch_size`` tasks is copied and deleted in its own
+    transaction, so the pass can be stopped at any point and no single
+    statement holds locks for long. Status transitions stay where they
+    are. Returns the number of archived tasks and comments.
+    """
+    now = now or timezone.now()
+    candidates = archivable_tasks(now).order_by("id")
+    counts = {"tasks": 0, "comments": 0}
+    while True:
+        ids = list(candidates.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return counts
+        rows, comment_count = _archive_batch(ids, now)
+        counts["tasks"] += len(rows)
+        counts["comments"] += comment_count
+        for board_id in {row["board_id"] for row in rows}:
+            bump_board_cache_version(board_id)
+        invalidate_summaries(
+            user_id
+            for row in rows
+            for user_id in (row["assignee_id"], row["reviewer_id"])
+        )
@@ -0,0 +1,129 @@
+"""Flow metrics computed from the status transition log.
+
+Everything here reads ``TaskStatusTransition``; the ``Task`` table is
+only probed through its ``deleted_at`` index to leave out deleted tasks,
+so these queries stay cheap on busy boards.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+from django.utils import timezone
+
+from tasks_app.models import Task, TaskStatusTransition
+
+DAY = 24 * 60 * 60
+STATUSES = [status for status, _ in Task.STATUS_CHOICES]
+
+
+def load_transitions(board_id, since=None):
+    """Columnar arrays ``(task_id, from_status, to_status, changed_at)``.
+
+    Rows are ordered by task and time; ``changed_at`` is epoch seconds.
+    Soft-deleted tasks are left out, or their last interval would stay
+    open forever.
+    """
+    deleted = Task.all_objects.filter(
+        board_id=board_id, deleted_at__isnull=False
+    )
+    queryset = TaskStatusTransition.objects.filter(
+        board_id=board_id
+    ).exclude(task_id__in=deleted.values("id"))
+    if since is not None:
+        queryset = queryset.filter(changed_at__gte=since)
+    rows = list(
+        queryset.order_by("task_id", "changed_at", "id").values_list(
+            "task_id", "from_status", "to_status", "changed_at"
+        )
+    )
+    if not rows:
+        return (
+            np.array([], dtype=np.int64),
+            np.array([], dtype=object),
+            np.array([], dtype=object),
+            np.array([], dtype=np.float64),
+        )
+    task_ids, from_status, to_status, changed_at = zip(*rows)
+    count = len(rows)
+    return (
+        np.fromiter(task_ids, dtype=np.int64, count=count),
+        np.array(from_status, dtype=object),
+        np.array(to_status, dtype=object),
+        np.fromiter(
+            (value.timestamp() for value in changed_at),
+            dtype=np.float64,
+            count=count,
+        ),
+    )
+
+
+def last_per_task(task_ids):
+    """Boolean mask selecting each task's latest row (rows sorted by task)."""
+    mask = np.ones(task_ids.size, dtype=bool)
+    mask[:-1] = task_ids[:-1] != task_ids[1:]
+    return mask
+
+
+def first_per_task(task_ids):
+    mask = np.ones(task_ids.size, dtype=bool)
+    mask[1:] = task_ids[1:] != task_ids[:-1]
+    return mask
+
+
+def time_in_status(board_id, now=None, transitions=None):
+    """Total and average seconds tasks spent in each status.
+
+    The latest interval of every task is open-ended and counted up to
+    ``now``. ``transitions`` may pass arrays already loaded with
+    ``load_transitions``.
+    """
+    now_ts = (now or timezone.now()).timestamp()
+    if transitions is None:
+        transitions = load_transitions(board_id)
+    task_ids, _, to_status, changed_at = transitions
+    ends = np.empty_like(changed_at)
+    ends[:-1] = changed_at[1:]
+    last = last_per_task(task_ids)
+    ends[last] = now_ts
+    durations = ends - changed_at
+    result = {}
+    for status in STATUSES:
+        in_status = durations[to_status == status]
+        result[status] = {
+            "intervals": int(in_status.size),
+            "total_seconds": float(in_status.sum()),
+            "average_seconds": (
+                float(in_status.mean()) if in_status.size else None
+            ),
+        }
+    return result
+
+
+def cumulative_flow(board_id, days=30, now=None, transitions=None):
+    """Number of tasks in each status at the end of each of the last days.
+
+    A status count at time ``t`` is the number of transitions into it
+    minus the transitions out of it up to ``t``.
+    """
+    now = now or timezone.now()
+    if transitions is None:
+        transitions = load_transitions(board_id)
+    _, from_status, to_status, changed_at = transitions
+    day_ends = np.array([
+        (now - timedelta(days=offset)).timestamp()
+        for offset in range(days - 1, -1, -1)
+    ])
+    series = {}
+    for status in STATUSES:
+        entered = np.sort(changed_at[to_status == status])
+        left = np.sort(changed_at[from_status == status])
+        counts = (
+            np.searchsorted(entered, day_ends, side="right")
+            - np.searchsorted(left, day_ends, side="right")
+        )
+        series[status] = counts.astype(int).tolist()
+    dates = [
+        (now - timedelta(days=offset)).date().isoformat()
+        for offset in range(days - 1, -1, -1)
+    ]
+    return {"dates": dates, "series": series}
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from tasks_app.archive import archive_done_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "Move tasks done for longer than TASK_ARCHIVE_AFTER_DAYS, with "
+        "their comments, to the archive tables in batches. Meant to run "
+        "periodically (e.g. nightly cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        counts = archive_done_tasks(batch_size=options["batch_size"])
+        self.stdout.write(
+            "Archived {tasks} tasks, {comments} comments.".format(**counts)
+        )
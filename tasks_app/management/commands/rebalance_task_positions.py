@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.db.models.functions import Length
+
+from tasks_app.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Respace task position keys in columns whose longest key exceeds "
+        "--max-length. Meant to run periodically (e.g. nightly cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-length", type=int, default=12)
+
+    def handle(self, *args, **options):
+        columns = (
+            Task.objects.order_by()
+            .values("board_id", "status")
+            .annotate(longest=Max(Length("position")))
+            .filter(longest__gt=options["max_length"])
+        )
+        total = 0
+        for column in columns:
+            total += Task.rebalance_column(
+                column["board_id"], column["status"]
+            )
+        self.stdout.write(f"Rebalanced {len(columns)} columns ({total} tasks).")
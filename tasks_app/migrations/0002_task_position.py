@@ -0,0 +1,64 @@
+# Generated by Django 6.0 on 2026-10-19 08:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copy of tasks_app.ranking.spaced_keys as of this migration.
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+
+def spaced_keys(count):
+    """Return ``count`` short, evenly spaced, ascending keys."""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    span = BASE ** width
+    keys = []
+    for i in range(1, count + 1):
+        value = i * span // (count + 1)
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        keys.append(''.join(reversed(digits)).rstrip('0'))
+    return keys
+
+
+def backfill_positions(apps, schema_editor):
+    """Rank existing tasks per column in their current display order."""
+    Task = apps.get_model('tasks_app', 'Task')
+    columns = (
+        Task.objects.order_by().values_list('board_id', 'status').distinct()
+    )
+    for board_id, status in columns:
+        tasks = list(
+            Task.objects.filter(board_id=board_id, status=status)
+            .order_by('-created_at', '-id')
+            .only('id')
+        )
+        for task, key in zip(tasks, spaced_keys(len(tasks))):
+            task.position = key
+        Task.objects.bulk_update(tasks, ['position'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board_app', '0001_initial'),
+        ('tasks_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='position',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(backfill_positions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'status', 'position'], name='task_column_position_idx'),
+        ),
+    ]
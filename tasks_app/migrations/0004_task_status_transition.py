@@ -0,0 +1,56 @@
+# Generated by Django 6.0 on 2026-10-19 08:25
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_transitions(apps, schema_editor):
+    """Approximate history: created as to-do, moved on the last update."""
+    Task = apps.get_model('tasks_app', 'Task')
+    Transition = apps.get_model('tasks_app', 'TaskStatusTransition')
+    rows = []
+    tasks = Task.objects.values_list(
+        'id', 'board_id', 'status', 'created_at', 'updated_at'
+    )
+    for task_id, board_id, status, created_at, updated_at in tasks.iterator():
+        rows.append(Transition(
+            task_id=task_id, board_id=board_id,
+            to_status='to-do', changed_at=created_at,
+        ))
+        if status != 'to-do':
+            rows.append(Transition(
+                task_id=task_id, board_id=board_id, from_status='to-do',
+                to_status=status, changed_at=updated_at,
+            ))
+        if len(rows) >= 1000:
+            Transition.objects.bulk_create(rows)
+            rows = []
+    Transition.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board_app', '0002_board_deleted_at'),
+        ('tasks_app', '0003_task_deleted_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, default='', max_length=20)),
+                ('to_status', models.CharField(max_length=20)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_transitions', to='board_app.board')),
+                ('task', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='status_transitions', to='tasks_app.task')),
+            ],
+            options={
+                'ordering': ['changed_at', 'id'],
+                'indexes': [models.Index(fields=['board', 'changed_at'], name='transition_board_time_idx'), models.Index(fields=['task', 'changed_at'], name='transition_task_time_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_transitions, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,21 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
+from board_app.cache import bump_board_cache_version
+from core.concurrency import VersionedModel
+from core.managers import AllObjectsManager, SoftDeleteManager
+from tasks_app.ranking import key_between, spaced_keys
 
-class Task(models.Model):
+
+class TaskManager(SoftDeleteManager):
+    """Hides deleted tasks and every task on a deleted board."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(board__deleted_at__isnull=True)
+
+
+class Task(VersionedModel):
     """A task on a Kanban board."""
 
     STATUS_CHOICES = [
@@ -56,15 +69,207 @@ class Task(models.Model):
         blank=True,
     )
     due_date = models.DateField(null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    position = models.CharField(max_length=64, blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = TaskManager()
+    all_objects = AllObjectsManager()
+
+    # Field values as loaded from the database, to detect changes on save.
+    TRACKED_FIELDS = ("status", "assignee_id", "reviewer_id")
+    _loaded_values = {}
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["board", "status", "position"],
+                name="task_column_position_idx",
+            ),
+            models.Index(
+                fields=["status", "updated_at"],
+                name="task_status_updated_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded_values()
+        return instance
+
+    def _remember_loaded_values(self, written=None):
+        """Remember the tracked fields that are loaded (not deferred);
+        after a save, only those in ``written`` if given."""
+        values = {
+            field: self.__dict__[field]
+            for field in self.TRACKED_FIELDS
+            if field in self.__dict__ and (written is None or field in written)
+        }
+        if written is not None:
+            values = {**self._loaded_values, **values}
+        self._loaded_values = values
+
+    def save(self, *args, **kwargs):
+        """Save and log a status transition in the same transaction.
+
+        Creating a task logs one, and so does a save that writes a status
+        other than the loaded one. A deferred ``status`` or one left out
+        of ``update_fields`` logs nothing.
+        """
+        if not self.position:
+            self.position = Task.next_position(self.board_id, self.status)
+        update_fields = kwargs.get("update_fields")
+        written = None if update_fields is None else {
+            self._meta.get_field(name).attname for name in update_fields
+        }
+        if self._state.adding:
+            previous = ""
+        elif "status" in self._loaded_values and (
+            written is None or "status" in written
+        ):
+            previous = self._loaded_values["status"]
+        else:
+            previous = self.status
+        if previous == self.status:
+            super().save(*args, **kwargs)
+            self._remember_loaded_values(written)
+            return
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            TaskStatusTransition.objects.create(
+                task_id=self.pk,
+                board_id=self.board_id,
+                from_status=previous,
+                to_status=self.status,
+            )
+        self._remember_loaded_values(written)
+
+    @classmethod
+    def column(cls, board_id, status):
+        return cls.objects.filter(board_id=board_id, status=status)
+
+    @classmethod
+    def next_position(cls, board_id, status):
+        """Key that places a task at the end of its column."""
+        last = (
+            cls.column(board_id, status)
+            .order_by("-position")
+            .values_list("position", flat=True)
+            .first()
+        )
+        key = key_between(last or "", None)
+        if not cls._fits(key):
+            cls.rebalance_column(board_id, status)
+            return cls.next_position(board_id, status)
+        return key
+
+    @classmethod
+    def position_at(cls, board_id, status, index, exclude=None):
+        """Key that places a task at ``index`` within its column."""
+        siblings = (
+            cls.column(board_id, status)
+            .exclude(pk=exclude)
+            .order_by("position", "id")
+            .values_list("position", flat=True)
+        )
+        if index > 0:
+            neighbours = list(siblings[index - 1:index + 1])
+            if not neighbours:
+                neighbours = list(siblings.reverse()[:1])
+        else:
+            neighbours = [""] + list(siblings[:1])
+        before = neighbours[0] if neighbours else ""
+        after = neighbours[1] if len(neighbours) > 1 else None
+        if after is not None and before >= after:
+            # Duplicate keys from concurrent moves: respace and retry.
+            cls.rebalance_column(board_id, status)
+            return cls.position_at(board_id, status, index, exclude)
+        key = key_between(before, after)
+        if not cls._fits(key):
+            # Repeated inserts at one spot lengthen keys: respace first.
+            cls.rebalance_column(board_id, status)
+            return cls.position_at(board_id, status, index, exclude)
+        return key
+
+    @classmethod
+    def _fits(cls, key):
+        return len(key) <= cls._meta.get_field("position").max_length
+
+    @classmethod
+    def rebalance_column(cls, board_id, status):
+        """Rewrite a column's keys as short, evenly spaced keys."""
+        with transaction.atomic():
+            tasks = list(
+                cls.column(board_id, status)
+                .select_for_update(of=("self",))
+                .order_by("position", "id")
+                .only("id", "position")
+            )
+            for task, key in zip(tasks, spaced_keys(len(tasks))):
+                task.position = key
+            cls.objects.bulk_update(tasks, ["position"], batch_size=500)
+        bump_board_cache_version(board_id)
+        return len(tasks)
+
+
+class TaskStatusTransition(models.Model):
+    """Append-only log of task status changes.
+
+    Rows reference the task without a database constraint so the history
+    survives archiving; flow metrics are computed from this table alone.
+    """
+
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="status_transitions",
+    )
+    board = models.ForeignKey(
+        "board_app.Board",
+        on_delete=models.CASCADE,
+        related_name="task_transitions",
+    )
+    from_status = models.CharField(max_length=20, blank=True, default="")
+    to_status = models.CharField(max_length=20)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["changed_at", "id"]
+        indexes = [
+            models.Index(
+                fields=["board", "changed_at"],
+                name="transition_board_time_idx",
+            ),
+            models.Index(
+                fields=["task", "changed_at"],
+                name="transition_task_time_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id}: {self.from_status} -> {self.to_status}"
+
+    @classmethod
+    def initial_for(cls, tasks, changed_at=None):
+        """Unsaved creation rows for tasks inserted with bulk_create."""
+        changed_at = changed_at or timezone.now()
+        return [
+            cls(
+                task_id=task.pk,
+                board_id=task.board_id,
+                to_status=task.status,
+                changed_at=changed_at,
+            )
+            for task in tasks
+        ]
+
 
 class Comment(models.Model):
     """A comment on a task."""
@@ -80,10 +285,97 @@ class Comment(models.Model):
         related_name="comments",
     )
     content = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(
+                fields=["task", "created_at", "id"],
+                name="comment_task_time_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Comment by {self.author} on {self.task}"
+
+
+class ArchivedTask(models.Model):
+    """A done task moved out of ``Task`` by the archive_tasks command.
+
+    Keeps the original id, so status transitions still refer to it.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True, default="")
+    priority = models.CharField(max_length=20)
+    board = models.ForeignKey(
+        "board_app.Board",
+        on_delete=models.CASCADE,
+        related_name="archived_tasks",
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    assignee = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    reviewer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    due_date = models.DateField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["board", "id"],
+                name="archived_task_board_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedComment(models.Model):
+    """A comment of an archived task, with its original id."""
+
+    id = models.BigIntegerField(primary_key=True)
+    task = models.ForeignKey(
+        ArchivedTask,
+        on_delete=models.CASCADE,
+        related_name="comments",
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    content = models.TextField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["created_at", "id"]
+        indexes = [
+            models.Index(
+                fields=["task", "created_at", "id"],
+                name="archived_comment_task_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author} on {self.task}"
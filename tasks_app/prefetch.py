@@ -0,0 +1,39 @@
+from django.db.models import Count, F, OuterRef, Prefetch, Subquery, Window
+from django.db.models.functions import Coalesce, RowNumber
+
+from tasks_app.models import Comment
+
+COMMENT_PREVIEW_COUNT = 3
+
+
+def with_comment_previews(queryset, latest=COMMENT_PREVIEW_COUNT):
+    """Attach ``comments_count`` and ``latest_comments`` to each task.
+
+    The count is a correlated subquery on the task query itself and the
+    previews are one prefetch query ranking comments per task with a
+    window function, so any task queryset costs two queries in total.
+    """
+    counts = (
+        Comment.objects.filter(task=OuterRef("pk"))
+        .order_by()
+        .values("task")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    previews = (
+        Comment.objects.select_related("author")
+        .annotate(
+            rank=Window(
+                RowNumber(),
+                partition_by=F("task_id"),
+                order_by=[F("created_at").desc(), F("id").desc()],
+            )
+        )
+        .filter(rank__lte=latest)
+        .order_by("created_at", "id")
+    )
+    return queryset.annotate(
+        comments_count=Coalesce(Subquery(counts), 0)
+    ).prefetch_related(
+        Prefetch("comments", queryset=previews, to_attr="latest_comments")
+    )
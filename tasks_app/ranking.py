@@ -0,0 +1,75 @@
+"""Fractional rank keys for ordering tasks inside a status column.
+
+A key is a string of base-36 digits read as a fraction (``"i"`` is
+18/36). Between any two keys another key can be generated, so moving a
+card only rewrites that card's key. Keys never end in ``"0"``, which
+keeps every key strictly between its neighbours. Appending after the
+last key steps up its final digit instead of bisecting towards the end,
+so a column filled by appends keeps keys of O(log n) digits.
+"""
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+
+def key_between(before, after):
+    """Return a key sorting strictly between ``before`` and ``after``.
+
+    ``before`` may be empty (start of column) and ``after`` may be
+    ``None`` (end of column).
+    """
+    if after is not None and before >= after:
+        raise ValueError(f"{before!r} must sort before {after!r}")
+    if after is None and before:
+        return _successor(before)
+    return _midpoint(before or "", after)
+
+
+def _successor(key):
+    # The next key of the same length that does not end in "0". Only a
+    # key of all "z" has none; it is then doubled in length, which leaves
+    # room for about as many appends again as it took to get there.
+    value = int(key, BASE) + 1
+    if value % BASE == 0:
+        value += 1
+    if value >= BASE ** len(key):
+        return key + "0" * (len(key) - 1) + "1"
+    digits = []
+    for _ in key:
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits))
+
+
+def _midpoint(low, high):
+    if high is not None:
+        # Copy the common prefix, treating a missing low digit as "0".
+        n = 0
+        while n < len(high) and (low[n] if n < len(low) else "0") == high[n]:
+            n += 1
+        if n > 0:
+            return high[:n] + _midpoint(low[n:], high[n:])
+    digit_low = DIGITS.index(low[0]) if low else 0
+    digit_high = DIGITS.index(high[0]) if high is not None else BASE
+    if digit_high - digit_low > 1:
+        return DIGITS[(digit_low + digit_high + 1) // 2]
+    if high is not None and len(high) > 1:
+        return high[:1]
+    return DIGITS[digit_low] + _midpoint(low[1:], None)
+
+
+def spaced_keys(count):
+    """Return ``count`` short, evenly spaced, ascending keys."""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    span = BASE ** width
+    keys = []
+    for i in range(1, count + 1):
+        value = i * span // (count + 1)
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        keys.append("".join(reversed(digits)).rstrip("0"))
+    return keys
@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from board_app.cache import bump_board_cache_version
+from tasks_app.models import Comment, Task
+from tasks_app.summary import invalidate_summaries, task_summary_users
+
+# Deletes and queryset updates do not send these signals (no post_delete
+# receivers keep bulk purges on the fast-delete path); the views doing
+# them invalidate the caches explicitly.
+
+
+@receiver(post_save, sender=Task)
+def task_changed(sender, instance, **kwargs):
+    board_id, user_ids = instance.board_id, task_summary_users(instance)
+
+    def invalidate():
+        bump_board_cache_version(board_id)
+        invalidate_summaries(user_ids)
+
+    # Now, and again after the commit in case a concurrent request
+    # rendered the old data in between.
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    board_id = instance.task.board_id
+    bump_board_cache_version(board_id)
+    transaction.on_commit(lambda: bump_board_cache_version(board_id))
@@ -0,0 +1,96 @@
+from django.core.cache import cache
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from board_app.models import Board
+from core.metrics import record_cache
+from tasks_app.models import Task
+
+SUMMARY_KEY = "dashboard-summary:{user_id}"
+SUMMARY_TTL = 5 * 60
+
+
+def _task_aggregates(prefix, role):
+    open_tasks = role & ~Q(status="done")
+    return {
+        f"{prefix}_total": Count("id", filter=role),
+        f"{prefix}_to_do": Count("id", filter=role & Q(status="to-do")),
+        f"{prefix}_in_progress": Count(
+            "id", filter=role & Q(status="in-progress")
+        ),
+        f"{prefix}_review": Count("id", filter=role & Q(status="review")),
+        f"{prefix}_done": Count("id", filter=role & Q(status="done")),
+        f"{prefix}_urgent": Count(
+            "id", filter=open_tasks & Q(priority="urgent")
+        ),
+        f"{prefix}_upcoming_deadline": Min(
+            "due_date",
+            filter=open_tasks & Q(due_date__gte=timezone.localdate()),
+        ),
+    }
+
+
+def compute_summary(user):
+    """Dashboard counts for a user in two aggregate queries."""
+    board_count = (
+        Board.objects.filter(Q(created_by=user) | Q(members=user))
+        .values("id")
+        .distinct()
+        .count()
+    )
+    assigned = Q(assignee=user)
+    reviewing = Q(reviewer=user)
+    totals = Task.objects.filter(assigned | reviewing).aggregate(
+        **_task_aggregates("assigned", assigned),
+        **_task_aggregates("reviewing", reviewing),
+    )
+    return {
+        "board_count": board_count,
+        "assigned_to_me": _section(totals, "assigned"),
+        "reviewing": _section(totals, "reviewing"),
+    }
+
+
+def _section(totals, prefix):
+    return {
+        key.removeprefix(f"{prefix}_"): value
+        for key, value in totals.items()
+        if key.startswith(f"{prefix}_")
+    }
+
+
+def get_summary(user):
+    """Cached dashboard summary; task and board writes invalidate it."""
+    key = SUMMARY_KEY.format(user_id=user.pk)
+    summary = cache.get(key)
+    record_cache("dashboard-summary", summary is not None)
+    if summary is None:
+        summary = compute_summary(user)
+        cache.set(key, summary, SUMMARY_TTL)
+    return summary
+
+
+def invalidate_summaries(user_ids):
+    keys = [
+        SUMMARY_KEY.format(user_id=user_id)
+        for user_id in set(user_ids)
+        if user_id is not None
+    ]
+    if keys:
+        cache.delete_many(keys)
+
+
+def task_summary_users(task):
+    """Users whose summary a write to ``task`` may change."""
+    loaded = task._loaded_values
+    return {
+        task.assignee_id,
+        task.reviewer_id,
+        loaded.get("assignee_id"),
+        loaded.get("reviewer_id"),
+    }
+
+
+def board_summary_users(board):
+    """Owner and members of a board (one query)."""
+    return {board.created_by_id, *board.members.values_list("id", flat=True)}
@@ -1,9 +1,31 @@
+from datetime import timedelta
+from io import StringIO
+
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 
+from auth_app.users import user_summaries
+from board_app.cache import board_cache_version
 from board_app.models import Board
-from tasks_app.models import Comment, Task
+from board_app.purge import purge_deleted
+from core.concurrency import VersionConflict
+from tasks_app.archive import _archive_batch, archive_done_tasks
+from tasks_app.flow import cumulative_flow, time_in_status
+from tasks_app.models import (
+    ArchivedComment,
+    ArchivedTask,
+    Comment,
+    Task,
+    TaskStatusTransition,
+)
+from tasks_app.ranking import key_between, spaced_keys
 
 
 class TaskSetupMixin:
@@ -62,6 +84,41 @@ class AssignedToMeTestCase(TaskSetupMixin, APITestCase):
         self.assertEqual(response.data[0]["title"], "Test Task")
         self.assertIn("comments_count", response.data[0])
 
+    def test_assigned_to_me_comment_previews(self):
+        """Counts and latest comments load without per-task queries."""
+        token = Token.objects.create(user=self.member)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + token.key
+        )
+        for i in range(5):
+            Comment.objects.create(
+                task=self.task, author=self.owner, content=f"Comment {i}"
+            )
+        user_summaries([self.owner.pk, self.member.pk])
+        with CaptureQueriesContext(connection) as single:
+            self.client.get("/api/tasks/assigned-to-me/")
+        for i in range(4):
+            task = Task.objects.create(
+                title=f"Task {i}",
+                board=self.board,
+                created_by=self.owner,
+                assignee=self.member,
+            )
+            Comment.objects.create(
+                task=task, author=self.member, content="Hello"
+            )
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get("/api/tasks/assigned-to-me/")
+        self.assertEqual(len(many), len(single))
+        self.assertEqual(len(response.data), 5)
+        first = next(t for t in response.data if t["id"] == self.task.id)
+        self.assertEqual(first["comments_count"], 5)
+        self.assertEqual(
+            [c["content"] for c in first["latest_comments"]],
+            ["Comment 2", "Comment 3", "Comment 4"],
+        )
+        self.assertEqual(first["latest_comments"][0]["author"], "Owner")
+
     def test_assigned_to_me_empty(self):
         """Returns empty list if no tasks assigned."""
         response = self.client.get("/api/tasks/assigned-to-me/")
@@ -128,6 +185,40 @@ class TaskCreateTestCase(TaskSetupMixin, APITestCase):
             response.data["assignee"]["id"], self.member.id
         )
 
+    def test_assignee_and_reviewer_resolved_together(self):
+        """Both user ids and their membership cost a single query."""
+        data = {
+            "board": self.board.id,
+            "title": "Assigned Task",
+            "status": "to-do",
+            "priority": "low",
+            "assignee_id": self.member.id,
+        }
+        with CaptureQueriesContext(connection) as one:
+            self.client.post("/api/tasks/", data, format="json")
+        data["reviewer_id"] = self.owner.id
+        with CaptureQueriesContext(connection) as both:
+            response = self.client.post("/api/tasks/", data, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["reviewer"]["id"], self.owner.id)
+        self.assertEqual(len(both), len(one))
+
+    def test_create_task_assignee_not_member(self):
+        """Assignees must be board members; unknown ids are rejected."""
+        data = {
+            "board": self.board.id,
+            "title": "Task",
+            "status": "to-do",
+            "priority": "low",
+            "assignee_id": self.outsider.id,
+        }
+        response = self.client.post("/api/tasks/", data, format="json")
+        self.assertEqual(response.status_code, 400)
+        data["assignee_id"] = 99999
+        response = self.client.post("/api/tasks/", data, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("assignee_id", response.data)
+
     def test_create_task_as_outsider(self):
         """Non-member cannot create task."""
         token = Token.objects.create(user=self.outsider)
@@ -181,6 +272,115 @@ class TaskUpdateTestCase(TaskSetupMixin, APITestCase):
         self.assertEqual(response.data["title"], "Updated Title")
         self.assertEqual(response.data["status"], "done")
 
+    def test_update_writes_only_changed_fields(self):
+        """The UPDATE lists the changed columns only."""
+        url = f"/api/tasks/{self.task.id}/"
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                url,
+                {"title": "Renamed", "priority": "high"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        updates = [
+            q["sql"] for q in queries if q["sql"].startswith("UPDATE")
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"title"', updates[0])
+        self.assertNotIn('"priority"', updates[0])
+        self.assertNotIn('"description"', updates[0])
+        self.assertEqual(response.data["version"], 2)
+
+    def test_noop_update_skips_write(self):
+        """Unchanged values do not touch the row or bump the version."""
+        url = f"/api/tasks/{self.task.id}/"
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                url,
+                {"title": "Test Task", "assignee_id": self.member.id},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(
+            [q for q in queries if q["sql"].startswith("UPDATE")]
+        )
+        self.assertEqual(response.data["version"], 1)
+
+    def test_if_match_current_version(self):
+        """A matching If-Match applies the update and returns an ETag."""
+        response = self.client.patch(
+            f"/api/tasks/{self.task.id}/",
+            {"description": "Typing..."},
+            format="json",
+            HTTP_IF_MATCH='"1"',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], '"2"')
+
+    def test_if_match_stale_version(self):
+        """A stale If-Match returns 412 without writing."""
+        self.client.patch(
+            f"/api/tasks/{self.task.id}/",
+            {"description": "First"},
+            format="json",
+        )
+        response = self.client.patch(
+            f"/api/tasks/{self.task.id}/",
+            {"description": "Stale"},
+            format="json",
+            HTTP_IF_MATCH='"1"',
+        )
+        self.assertEqual(response.status_code, 412)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.description, "First")
+
+    def test_version_in_body(self):
+        """A version field in the body works like If-Match."""
+        url = f"/api/tasks/{self.task.id}/"
+        response = self.client.patch(
+            url, {"title": "A", "version": 1}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.patch(
+            url, {"title": "B", "version": 1}, format="json"
+        )
+        self.assertEqual(response.status_code, 412)
+
+    def test_non_object_body(self):
+        """A JSON list body is rejected with 400."""
+        response = self.client.patch(
+            f"/api/tasks/{self.task.id}/", [{"title": "A"}], format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_conditional_save_detects_concurrent_write(self):
+        """A write racing past the header check still fails cleanly."""
+        task = Task.objects.get(pk=self.task.pk)
+        Task.objects.filter(pk=task.pk).update(version=2)
+        task.title = "Loser"
+        with self.assertRaises(VersionConflict):
+            task.save(update_fields=["title"], expected_version=1)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Test Task")
+
+    def test_unconditional_saves_of_stale_copies_count_each_write(self):
+        """Two saves of the same version still end two versions later."""
+        first = Task.objects.get(pk=self.task.pk)
+        second = Task.objects.get(pk=self.task.pk)
+        first.title = "First"
+        first.save(update_fields=["title"])
+        second.priority = "low"
+        second.save(update_fields=["priority"])
+        self.assertEqual((first.version, second.version), (2, 3))
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.version, 3)
+        stale = Task.objects.get(pk=self.task.pk)
+        stale.version = 2
+        stale.title = "Stale"
+        with self.assertRaises(VersionConflict):
+            stale.save(update_fields=["title"], expected_version=2)
+        self.assertEqual(stale.version, 2)
+
     def test_update_task_change_board_forbidden(self):
         """Changing board is not allowed."""
         other_board = Board.objects.create(
@@ -212,6 +412,28 @@ class TaskUpdateTestCase(TaskSetupMixin, APITestCase):
         self.assertEqual(response.status_code, 404)
 
 
+class BoardCacheInvalidationTestCase(TaskSetupMixin, APITestCase):
+    """Task and comment saves invalidate the board's cached payloads."""
+
+    def test_version_bumped_again_after_commit(self):
+        """A read between the save and the commit caches nothing lasting."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.title = "Renamed"
+            self.task.save()
+            rendered_before_commit = board_cache_version(self.board.id)
+        self.assertNotEqual(
+            board_cache_version(self.board.id), rendered_before_commit
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(
+                task=self.task, author=self.owner, content="Hi"
+            )
+            rendered_before_commit = board_cache_version(self.board.id)
+        self.assertNotEqual(
+            board_cache_version(self.board.id), rendered_before_commit
+        )
+
+
 class TaskDeleteTestCase(TaskSetupMixin, APITestCase):
     """Tests for DELETE /api/tasks/{id}/"""
 
@@ -221,6 +443,16 @@ class TaskDeleteTestCase(TaskSetupMixin, APITestCase):
         self.assertEqual(response.status_code, 204)
         self.assertFalse(Task.objects.filter(id=self.task.id).exists())
 
+    def test_delete_is_soft_and_restorable(self):
+        """Deleted tasks are hidden and can be restored."""
+        self.client.delete(f"/api/tasks/{self.task.id}/")
+        self.assertTrue(Task.all_objects.filter(id=self.task.id).exists())
+        response = self.client.get(f"/api/tasks/{self.task.id}/comments/")
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(f"/api/tasks/{self.task.id}/restore/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Task.objects.filter(id=self.task.id).exists())
+
     def test_delete_as_board_owner(self):
         """Board owner can delete any task."""
         task = Task.objects.create(
@@ -307,6 +539,75 @@ class CommentListCreateTestCase(TaskSetupMixin, APITestCase):
         self.assertEqual(response.status_code, 404)
 
 
+class CommentKeysetTestCase(TaskSetupMixin, APITestCase):
+    """Tests for keyset paging of GET /api/tasks/{id}/comments/"""
+
+    def setUp(self):
+        super().setUp()
+        self.url = f"/api/tasks/{self.task.id}/comments/"
+        self.comments = Comment.objects.bulk_create(
+            Comment(task=self.task, author=self.member, content=f"C{i}")
+            for i in range(10)
+        )
+
+    def contents(self, response):
+        return [comment["content"] for comment in response.data]
+
+    def test_limit_returns_first_page(self):
+        """A limit alone returns the oldest comments."""
+        response = self.client.get(self.url, {"limit": 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.contents(response), ["C0", "C1", "C2"])
+
+    def test_after_cursor(self):
+        """after returns the comments following the cursor."""
+        response = self.client.get(
+            self.url, {"after": self.comments[2].id, "limit": 3}
+        )
+        self.assertEqual(self.contents(response), ["C3", "C4", "C5"])
+
+    def test_before_cursor(self):
+        """before returns the preceding page in chronological order."""
+        response = self.client.get(
+            self.url, {"before": self.comments[5].id, "limit": 3}
+        )
+        self.assertEqual(self.contents(response), ["C2", "C3", "C4"])
+
+    def test_invalid_params(self):
+        """Bad limits and conflicting cursors return 400."""
+        response = self.client.get(self.url, {"limit": "abc"})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(
+            self.url,
+            {"before": self.comments[5].id, "after": self.comments[1].id},
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_query_count_constant_for_long_threads(self):
+        """Authors are joined, so a 10k thread costs the same queries."""
+        with CaptureQueriesContext(connection) as short:
+            self.client.get(self.url)
+        with CaptureQueriesContext(connection) as short_page:
+            self.client.get(self.url, {"after": self.comments[0].id})
+        Comment.objects.bulk_create(
+            (
+                Comment(task=self.task, author=self.owner, content="x")
+                for _ in range(10000)
+            ),
+            batch_size=1000,
+        )
+        with CaptureQueriesContext(connection) as long:
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 10010)
+        self.assertEqual(len(long), len(short))
+        with CaptureQueriesContext(connection) as long_page:
+            response = self.client.get(
+                self.url, {"after": self.comments[0].id}
+            )
+        self.assertEqual(len(response.data), 50)
+        self.assertEqual(len(long_page), len(short_page))
+
+
 class CommentDeleteTestCase(TaskSetupMixin, APITestCase):
     """Tests for DELETE /api/tasks/{id}/comments/{id}/"""
 
@@ -342,3 +643,413 @@ class CommentDeleteTestCase(TaskSetupMixin, APITestCase):
             f"/api/tasks/{self.task.id}/comments/9999/"
         )
         self.assertEqual(response.status_code, 404)
+
+
+class RankingTestCase(SimpleTestCase):
+    """Tests for fractional position keys."""
+
+    def test_key_between_orders_strictly(self):
+        """Generated keys sort between their neighbours."""
+        for before, after in [("", None), ("a", "b"), ("a1", "a2"),
+                              ("z", None), ("", "01"), ("i", "i1")]:
+            key = key_between(before, after)
+            self.assertLess(before, key)
+            if after is not None:
+                self.assertLess(key, after)
+
+    def test_appends_keep_keys_short(self):
+        """Appending after the last key grows keys logarithmically."""
+        keys = ["i"]
+        for _ in range(5000):
+            keys.append(key_between(keys[-1], None))
+        self.assertEqual(keys, sorted(set(keys)))
+        self.assertFalse(any(key.endswith("0") for key in keys))
+        self.assertLessEqual(len(keys[-1]), 8)
+
+    def test_repeated_inserts_stay_ordered(self):
+        """Inserting at the same spot many times keeps keys ordered."""
+        low, high = "", "i"
+        for _ in range(50):
+            high = key_between(low, high)
+        self.assertLess(low, high)
+
+    def test_spaced_keys(self):
+        """Spaced keys are ascending, unique and short."""
+        keys = spaced_keys(1000)
+        self.assertEqual(keys, sorted(set(keys)))
+        self.assertTrue(all(len(k) <= 2 for k in keys))
+
+
+class TaskMoveTestCase(TaskSetupMixin, APITestCase):
+    """Tests for POST /api/tasks/{id}/move/"""
+
+    def setUp(self):
+        super().setUp()
+        self.second = Task.objects.create(
+            title="Second", board=self.board, created_by=self.owner
+        )
+        self.third = Task.objects.create(
+            title="Third", board=self.board, created_by=self.owner
+        )
+
+    def column_titles(self, status="to-do"):
+        return list(
+            Task.column(self.board.id, status)
+            .order_by("position", "id")
+            .values_list("title", flat=True)
+        )
+
+    def test_overlong_keys_respace_the_column(self):
+        """A key that would outgrow the position column rebalances it."""
+        long_key = "0" * 63 + "1"
+        Task.objects.filter(pk=self.task.pk).update(position=long_key)
+        Task.objects.filter(pk=self.second.pk).update(position="z" * 64)
+        response = self.client.post(
+            f"/api/tasks/{self.third.id}/move/",
+            {"status": "to-do", "index": 0},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.column_titles(), ["Third", "Test Task", "Second"]
+        )
+        positions = Task.column(self.board.id, "to-do").values_list(
+            "position", flat=True
+        )
+        self.assertTrue(all(len(key) <= 2 for key in positions))
+        Task.objects.filter(pk=self.second.pk).update(position="z" * 64)
+        self.assertLessEqual(
+            len(Task.next_position(self.board.id, "to-do")), 2
+        )
+
+    def test_new_tasks_append_to_column(self):
+        """Created tasks are placed at the end of their column."""
+        self.assertEqual(
+            self.column_titles(), ["Test Task", "Second", "Third"]
+        )
+
+    def test_move_within_column_updates_one_row(self):
+        """Moving a card rewrites only that card."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                f"/api/tasks/{self.third.id}/move/",
+                {"status": "to-do", "index": 0},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        updates = [
+            q for q in ctx.captured_queries
+            if q["sql"].startswith("UPDATE")
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            self.column_titles(), ["Third", "Test Task", "Second"]
+        )
+
+    def test_move_to_other_column(self):
+        """Moving into another column places the task at the index."""
+        Task.objects.create(
+            title="Done A", board=self.board, created_by=self.owner,
+            status="done",
+        )
+        Task.objects.create(
+            title="Done B", board=self.board, created_by=self.owner,
+            status="done",
+        )
+        response = self.client.post(
+            f"/api/tasks/{self.task.id}/move/",
+            {"status": "done", "index": 1},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "done")
+        self.assertEqual(
+            self.column_titles("done"), ["Done A", "Test Task", "Done B"]
+        )
+
+    def test_move_as_outsider(self):
+        """Non-member cannot move tasks."""
+        token = Token.objects.create(user=self.outsider)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+        response = self.client.post(
+            f"/api/tasks/{self.task.id}/move/",
+            {"status": "done", "index": 0},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_rebalance_command(self):
+        """Long keys are respaced without changing the order."""
+        Task.objects.filter(id=self.second.id).update(position="i" * 20)
+        Task.objects.filter(id=self.third.id).update(position="j" * 20)
+        call_command(
+            "rebalance_task_positions", "--max-length", "8", stdout=StringIO()
+        )
+        self.assertEqual(
+            self.column_titles(), ["Test Task", "Second", "Third"]
+        )
+        positions = Task.column(self.board.id, "to-do").values_list(
+            "position", flat=True
+        )
+        self.assertTrue(all(len(p) <= 8 for p in positions))
+
+
+class StatusTransitionTestCase(TaskSetupMixin, APITestCase):
+    """Tests for the task status transition log."""
+
+    def transitions(self):
+        return list(
+            TaskStatusTransition.objects.filter(task=self.task).values_list(
+                "from_status", "to_status"
+            )
+        )
+
+    def test_creation_logged(self):
+        """Creating a task logs its initial status."""
+        self.assertEqual(self.transitions(), [("", "to-do")])
+
+    def test_status_change_logged(self):
+        """Status changes via PATCH and move are logged; others are not."""
+        self.client.patch(
+            f"/api/tasks/{self.task.id}/", {"title": "Renamed"}, format="json"
+        )
+        self.client.patch(
+            f"/api/tasks/{self.task.id}/", {"status": "review"}, format="json"
+        )
+        self.client.post(
+            f"/api/tasks/{self.task.id}/move/",
+            {"status": "done", "index": 0},
+            format="json",
+        )
+        self.assertEqual(self.transitions(), [
+            ("", "to-do"), ("to-do", "review"), ("review", "done"),
+        ])
+
+    def test_saves_without_a_loaded_status_not_logged(self):
+        """Deferred status and update_fields without it log nothing."""
+        task = Task.objects.only("id", "title", "board_id").get(
+            pk=self.task.pk
+        )
+        task.title = "Deferred"
+        task.save()
+        task.save()
+        task = Task.objects.get(pk=self.task.pk)
+        task.status = "review"
+        task.title = "Title only"
+        task.save(update_fields=["title"])
+        task.save(update_fields=["status"])
+        self.assertEqual(
+            self.transitions(), [("", "to-do"), ("to-do", "review")]
+        )
+
+    def test_flow_metrics_from_log(self):
+        """Time in status and cumulative flow come from the log."""
+        TaskStatusTransition.objects.filter(task=self.task).delete()
+        now = timezone.now()
+        TaskStatusTransition.objects.bulk_create([
+            TaskStatusTransition(
+                task=self.task, board=self.board, to_status="to-do",
+                changed_at=now - timedelta(days=3),
+            ),
+            TaskStatusTransition(
+                task=self.task, board=self.board, from_status="to-do",
+                to_status="done", changed_at=now - timedelta(days=1),
+            ),
+        ])
+        with self.assertNumQueries(1):
+            durations = time_in_status(self.board.id, now=now)
+        self.assertEqual(
+            durations["to-do"]["total_seconds"], 2 * 24 * 60 * 60
+        )
+        flow = cumulative_flow(self.board.id, days=3, now=now)
+        self.assertEqual(flow["series"]["to-do"], [1, 0, 0])
+        self.assertEqual(flow["series"]["done"], [0, 1, 1])
+
+    def test_flow_metrics_skip_deleted_tasks(self):
+        """A deleted task's last interval does not keep growing."""
+        Task.objects.filter(pk=self.task.pk).soft_delete()
+        now = timezone.now() + timedelta(days=10)
+        durations = time_in_status(self.board.id, now=now)
+        self.assertEqual(durations["to-do"]["intervals"], 0)
+        flow = cumulative_flow(self.board.id, days=1, now=now)
+        self.assertEqual(flow["series"]["to-do"], [0])
+
+
+class SummaryTestCase(TaskSetupMixin, APITestCase):
+    """Tests for GET /api/summary/"""
+
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+        self.member_token = Token.objects.create(user=self.member)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + self.member_token.key
+        )
+        Task.objects.create(
+            title="Urgent", board=self.board, created_by=self.owner,
+            status="in-progress", priority="urgent", assignee=self.member,
+            due_date=timezone.localdate() + timedelta(days=2),
+        )
+
+    def test_summary_counts(self):
+        """Summary aggregates boards and assigned/reviewing tasks."""
+        response = self.client.get("/api/summary/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["board_count"], 1)
+        assigned = response.data["assigned_to_me"]
+        self.assertEqual(assigned["total"], 2)
+        self.assertEqual(assigned["to_do"], 1)
+        self.assertEqual(assigned["in_progress"], 1)
+        self.assertEqual(assigned["urgent"], 1)
+        self.assertEqual(
+            assigned["upcoming_deadline"],
+            timezone.localdate() + timedelta(days=2),
+        )
+        self.assertEqual(response.data["reviewing"]["total"], 0)
+
+    def test_summary_constant_queries(self):
+        """Summary uses a fixed number of queries and is cached."""
+        for i in range(5):
+            Task.objects.create(
+                title=f"T{i}", board=self.board, created_by=self.owner,
+                assignee=self.member,
+            )
+        # Token lookup, board count, task aggregate.
+        with self.assertNumQueries(3):
+            self.client.get("/api/summary/")
+        with self.assertNumQueries(1):
+            self.client.get("/api/summary/")
+
+    def test_summary_invalidated_on_task_write(self):
+        """Reassigning a task refreshes both users' summaries."""
+        self.client.get("/api/summary/")
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + self.token.key
+        )
+        self.client.get("/api/summary/")
+        self.client.patch(
+            f"/api/tasks/{self.task.id}/",
+            {"assignee_id": self.owner.id},
+            format="json",
+        )
+        response = self.client.get("/api/summary/")
+        self.assertEqual(response.data["assigned_to_me"]["total"], 1)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + self.member_token.key
+        )
+        response = self.client.get("/api/summary/")
+        self.assertEqual(response.data["assigned_to_me"]["total"], 1)
+
+    def test_summary_invalidated_on_task_delete(self):
+        """Soft-deleting a task refreshes the summary."""
+        self.client.get("/api/summary/")
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + self.token.key
+        )
+        self.client.delete(f"/api/tasks/{self.task.id}/")
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + self.member_token.key
+        )
+        response = self.client.get("/api/summary/")
+        self.assertEqual(response.data["assigned_to_me"]["total"], 1)
+
+
+class TaskArchiveTestCase(TaskSetupMixin, APITestCase):
+    """Tests for archiving done tasks and the board archive endpoint."""
+
+    def setUp(self):
+        super().setUp()
+        self.task.status = "done"
+        self.task.save()
+        Comment.objects.create(
+            task=self.task, author=self.member, content="Shipped"
+        )
+        self.later = timezone.now() + timedelta(days=31)
+
+    def test_archive_moves_old_done_tasks_with_comments(self):
+        open_task = Task.objects.create(
+            title="Open", board=self.board, created_by=self.owner
+        )
+        counts = archive_done_tasks(batch_size=1, now=self.later)
+        self.assertEqual(counts, {"tasks": 1, "comments": 1})
+        self.assertFalse(Task.all_objects.filter(pk=self.task.pk).exists())
+        self.assertTrue(Task.objects.filter(pk=open_task.pk).exists())
+        archived = ArchivedTask.objects.get(pk=self.task.pk)
+        self.assertEqual(archived.assignee, self.member)
+        self.assertEqual(archived.archived_at, self.later)
+        self.assertEqual(
+            list(ArchivedComment.objects.values_list("content", flat=True)),
+            ["Shipped"],
+        )
+        self.assertFalse(Comment.objects.exists())
+        self.assertTrue(
+            TaskStatusTransition.objects.filter(task_id=self.task.pk).exists()
+        )
+
+    def test_batch_rechecks_picked_tasks(self):
+        """Tasks reopened or deleted after being picked are not archived."""
+        deleted = Task.objects.create(
+            title="Deleted", board=self.board, created_by=self.owner,
+            status="done",
+        )
+        Task.objects.filter(pk=deleted.pk).soft_delete()
+        self.task.status = "review"
+        self.task.save()
+        rows, comment_count = _archive_batch(
+            [self.task.pk, deleted.pk], self.later
+        )
+        self.assertEqual((rows, comment_count), ([], 0))
+        self.assertFalse(ArchivedTask.objects.exists())
+        self.assertTrue(Task.all_objects.filter(pk=deleted.pk).exists())
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_recently_done_tasks_stay(self):
+        counts = archive_done_tasks()
+        self.assertEqual(counts, {"tasks": 0, "comments": 0})
+        self.assertTrue(Task.objects.filter(pk=self.task.pk).exists())
+
+    def test_archived_tasks_leave_board_detail(self):
+        url = f"/api/boards/{self.board.id}/"
+        self.client.get(url)
+        archive_done_tasks(now=self.later)
+        response = self.client.get(url)
+        self.assertEqual(response.json()["tasks"], [])
+
+    def test_archive_endpoint_pages_newest_first(self):
+        second = Task.objects.create(
+            title="Second", board=self.board, created_by=self.owner,
+            status="done",
+        )
+        archive_done_tasks(now=self.later)
+        url = f"/api/boards/{self.board.id}/archive/"
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"limit": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([task["id"] for task in response.data], [second.pk])
+        self.assertLessEqual(len(queries), 6)
+        response = self.client.get(url, {"limit": 1, "before": second.pk})
+        self.assertEqual(response.data[0]["id"], self.task.pk)
+        self.assertEqual(response.data[0]["assignee"]["id"], self.member.pk)
+        self.assertEqual(
+            response.data[0]["comments"][0]["content"], "Shipped"
+        )
+
+    def test_archive_endpoint_members_only(self):
+        token = Token.objects.create(user=self.outsider)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+        response = self.client.get(f"/api/boards/{self.board.id}/archive/")
+        self.assertEqual(response.status_code, 403)
+
+    def test_purge_removes_archived_tasks_of_deleted_boards(self):
+        archive_done_tasks(now=self.later)
+        Board.objects.filter(pk=self.board.pk).soft_delete()
+        counts = purge_deleted(now=self.later + timedelta(days=8))
+        self.assertEqual(counts["tasks"], 1)
+        self.assertEqual(counts["comments"], 1)
+        self.assertFalse(ArchivedTask.objects.exists())
+        self.assertFalse(ArchivedComment.objects.exists())
+
+    def test_command(self):
+        out = StringIO()
+        call_command("archive_tasks", stdout=out)
+        self.assertIn("Archived 0 tasks, 0 comments.", out.getvalue())